@@ -0,0 +1,472 @@
+"""Benchmark suite for the engine, config, hotkey, logging, resource and tray paths.
+
+Runs on a headless Linux box: input goes to FakeInputBackend and the engine
+runs on a VirtualClock, so waits cost no wall time. Benchmarks whose optional dependencies (Tk display, psutil, PIL)
+are missing are reported as skipped rather than failing the run.
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --compare results.json --threshold 0.25
+
+Results are JSON: per benchmark the min/median/mean seconds per operation
+over several repeats, plus metadata identifying the machine and revision.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from logic import log_config
+from logic.config_manager import get_default_config, load_config_file, merge_configs, save_config_file
+from logic.hotkeys import HotkeyDispatcher
+from logic.log_index import LogIndex
+from simulation.clock import VirtualClock
+from simulation.engine import SimulationEngine
+from simulation.input_backend import FakeInputBackend, InstrumentedBackend
+from simulation.metrics import EngineMetrics
+from simulation.trace import TraceRecorder, TraceReplayer
+
+SEED = 1234
+BENCHMARKS = []
+
+class SkipBenchmark(Exception):
+    pass
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS.append((name, func))
+        return func
+    return register
+
+def measure(func, number, repeat=5):
+    """Time ``number`` calls of func, ``repeat`` times; report seconds per call"""
+    func()  # warm up caches and lazy imports
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - started) / number)
+    return {
+        'number': number,
+        'repeat': repeat,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+    }
+
+class BenchHost:
+    """In-memory config host for the engine"""
+    def __init__(self, config):
+        self.config = config
+
+    def load_config(self):
+        return self.config
+
+    def get_default_config(self):
+        return get_default_config()
+
+def bench_config():
+    config = get_default_config()
+    config['mouse'].update(enabled=True, movements=5)
+    config['keyboard'].update(enabled=True, dart_enabled=False, code_writing_enabled=False, actions=3)
+    return config
+
+def seeded_engine(config, trace_file=''):
+    """Engine on virtual time, so a run measures pure scheduling and dispatch cost"""
+    config['engine'] = {'seed': SEED, 'trace_file': trace_file}
+    config['governor'] = {'enabled': False}  # the host's load must not change what a run measures
+    clock = VirtualClock()
+    engine = SimulationEngine(BenchHost(config), logger=logging.getLogger("benchmark"),
+                              input_backend=FakeInputBackend(record=False, clock=clock), clock=clock)
+    engine._prepare_run()
+    return engine
+
+@benchmark("engine_minute")
+def engine_minute(scale):
+    """One simulated minute of all behaviors interleaving"""
+    engine = seeded_engine(bench_config())
+    return measure(lambda: engine.run_for(60), number=max(1, 20 // scale))
+
+@benchmark("engine_minute_dart")
+def engine_minute_dart(scale):
+    config = bench_config()
+    config['keyboard'].update(dart_enabled=True, dart_lines=700)
+    engine = seeded_engine(config)
+    return measure(lambda: engine.run_for(60), number=max(1, 10 // scale))
+
+@benchmark("soak_virtual_day")
+def soak_virtual_day(scale):
+    """One simulated day of all behaviors (a tenth of it with --quick); reports wall seconds per run"""
+    horizon = 86400 / scale
+    engines = []
+
+    def run_day():
+        engine = seeded_engine(bench_config())
+        engine.run_for(horizon)
+        engines.append(engine)
+
+    result = measure(run_day, number=1, repeat=1)
+    counters = engines[-1].metrics.counters
+    result.update(simulated_seconds=horizon,
+                  rounds={dict(labels)['behavior']: value for (name, labels), value in counters.items()
+                          if name == 'anoid_rounds'})
+    return result
+
+# Pause and stop must take effect within this many seconds of the request
+CONTROL_LATENCY_LIMIT = 0.05
+
+class TimestampBackend(FakeInputBackend):
+    """Fake backend that notes when the last action was injected"""
+    last_call = 0.0
+
+    def _log(self, *call):
+        self.last_call = time.perf_counter()
+
+def control_latency(request, samples):
+    """Start a real-time engine mid-glide, issue ``request`` and time until input stops"""
+    config = bench_config()
+    config['mouse'].update(min_duration=2.0, max_duration=4.0)
+    config['keyboard'].update(phrases=["typed slowly enough to be interrupted " * 3])
+    latencies = []
+    for i in range(samples):
+        backend = TimestampBackend(record=False)
+        engine = SimulationEngine(BenchHost(config), logger=logging.getLogger("benchmark"), input_backend=backend)
+        engine.start()
+        time.sleep(0.3 + 0.017 * i)  # vary the phase within a slice
+        requested = time.perf_counter()
+        request(engine)
+        returned = time.perf_counter()
+        time.sleep(0.2)
+        latencies.append(max(returned, backend.last_call) - requested)
+        engine.stop()
+    return {
+        'number': samples,
+        'min': min(latencies),
+        'median': statistics.median(latencies),
+        'mean': statistics.mean(latencies),
+        'max': max(latencies),
+        'limit': CONTROL_LATENCY_LIMIT,
+    }
+
+@benchmark("pause_latency")
+def pause_latency(scale):
+    return control_latency(lambda engine: engine.pause(), samples=max(3, 20 // scale))
+
+@benchmark("stop_latency")
+def stop_latency(scale):
+    return control_latency(lambda engine: engine.stop(), samples=max(3, 20 // scale))
+
+@benchmark("start_to_first_action")
+def start_to_first_action(scale):
+    """Real-time engine: seconds from start() to the first injected primitive"""
+    config = bench_config()
+    latencies = []
+    for _ in range(max(3, 20 // scale)):
+        engine = SimulationEngine(BenchHost(config), logger=logging.getLogger("benchmark"),
+                                  input_backend=FakeInputBackend(record=False))
+        engine.start()
+        deadline = time.monotonic() + 5
+        while engine.metrics.start_latency is None and time.monotonic() < deadline:
+            time.sleep(0.001)
+        engine.stop()
+        if engine.metrics.start_latency is not None:
+            latencies.append(engine.metrics.start_latency)
+    if not latencies:
+        raise SkipBenchmark("no action within 5 s")
+    return {
+        'number': len(latencies),
+        'min': min(latencies),
+        'median': statistics.median(latencies),
+        'mean': statistics.mean(latencies),
+        'max': max(latencies),
+    }
+
+@benchmark("trace_record")
+def trace_record(scale):
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = TraceRecorder(FakeInputBackend(record=False), os.path.join(tmp, "trace.bin"))
+        try:
+            return measure(lambda: recorder.move_to(100, 200), number=max(100, 20000 // scale))
+        finally:
+            recorder.close()
+
+@benchmark("trace_replay_minute")
+def trace_replay_minute(scale):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.bin")
+        engine = seeded_engine(bench_config(), trace_file=path)
+        engine.run_for(60)
+        engine._close_trace()
+        replayer = TraceReplayer(path, FakeInputBackend(record=False))
+        return measure(lambda: replayer.run(timed=False), number=max(1, 50 // scale))
+
+def _dispatch_benchmarks():
+    primitives = {
+        'move_to': lambda b: b.move_to(100, 200, duration=0.0),
+        'click': lambda b: b.click(),
+        'scroll': lambda b: b.scroll(3),
+        'write': lambda b: b.write("hello world", interval=0.0),
+        'press': lambda b: b.press('enter'),
+        'hotkey': lambda b: b.hotkey('ctrl', 'a'),
+    }
+    for primitive, call in primitives.items():
+        def run(scale, call=call):
+            backend = InstrumentedBackend(FakeInputBackend(record=False), EngineMetrics())
+            return measure(lambda: call(backend), number=max(100, 20000 // scale))
+        benchmark(f"dispatch_{primitive}")(run)
+
+_dispatch_benchmarks()
+
+@benchmark("config_load")
+def config_load(scale):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anoid.json")
+        save_config_file(path, get_default_config())
+        return measure(lambda: load_config_file(path), number=max(10, 2000 // scale))
+
+@benchmark("config_merge")
+def config_merge(scale):
+    user = get_default_config()
+    return measure(lambda: merge_configs(get_default_config(), user), number=max(100, 20000 // scale))
+
+@benchmark("config_save")
+def config_save(scale):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anoid.json")
+        config = get_default_config()
+        return measure(lambda: save_config_file(path, config), number=max(10, 1000 // scale))
+
+class HookBackend:
+    """Stands in for the keyboard module: keeps the hook so events can be fed to it"""
+    def hook(self, callback):
+        self.callback = callback
+        return callback
+
+    def unhook(self, hook):
+        self.callback = None
+
+class KeyEvent:
+    def __init__(self, name, event_type):
+        self.name = name
+        self.event_type = event_type
+
+@benchmark("hotkey_keystroke")
+def hotkey_keystroke(scale):
+    """Hook cost of one unbound key press and release with 500 chords bound"""
+    backend = HookBackend()
+    dispatcher = HotkeyDispatcher(backend=backend)
+    for i in range(500):
+        dispatcher.bind(f"ctrl+alt+f{i}", lambda: None)
+    down, up = KeyEvent('x', 'down'), KeyEvent('x', 'up')
+    def keystroke():
+        backend.callback(down)
+        backend.callback(up)
+    return measure(keystroke, number=max(1000, 100000 // scale))
+
+@benchmark("debug_log_disabled")
+def debug_log_disabled(scale):
+    """A per-round DEBUG call on a subsystem logger left at INFO"""
+    log_config.set_levels({'': 'INFO', 'engine.mouse': None})
+    logger = log_config.get_logger('engine.mouse')
+    return measure(lambda: logger.debug("Pausing %s simulation for %.2f seconds", 'mouse', 12.5),
+                   number=max(1000, 100000 // scale))
+
+def write_log_file(path, lines):
+    """A log file in log_config.FORMAT with every fifth line a WARNING"""
+    with open(path, 'w') as f:
+        for i in range(lines):
+            level = 'WARNING' if i % 5 == 0 else 'INFO'
+            f.write(f"2026-01-01 12:00:00,000 - {level} - android_studio.engine.mouse - Mouse action {i} done.\n")
+
+@benchmark("log_index_filter")
+def log_index_filter(scale):
+    """Index a log file from scratch, then filter it by level and by a rare search term"""
+    lines = max(10000, 1000000 // scale)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anoid.log")
+        write_log_file(path, lines)
+        def index_and_filter():
+            index = LogIndex(path)
+            while index.refresh():
+                pass
+            index.select(30)
+            index.select(0, f"action {lines - 1} ")
+            index.close()
+        result = measure(index_and_filter, number=1, repeat=3)
+    result['lines'] = lines
+    return result
+
+@benchmark("history_hourly_report")
+def history_hourly_report(scale):
+    """Per-hour activity for the last 30 days from a year of history, 4 sessions a day"""
+    from simulation import history
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anoid-history.db")
+        writer = history.HistoryWriter(path)
+        writer.start()
+        now = int(time.time()) // 3600 * 3600
+        for day in range(max(30, 365 // scale)):
+            for hour in range(24):
+                at = now - (day * 24 + hour) * 3600
+                session = at // (6 * 3600)
+                writer.add([(at, behavior, session, 100) for behavior in ('mouse', 'scroll', 'keyboard', 'browser')])
+        writer.close(timeout=60)
+        conn = history.connect(path)
+        try:
+            result = measure(lambda: history.hourly(conn, days=30, now=now), number=max(10, 200 // scale))
+        finally:
+            conn.close()
+    return result
+
+@benchmark("log_handler_to_log_tab")
+def log_handler_to_log_tab(scale):
+    """Log record to file, then the Log tab's incremental refresh of the visible window"""
+    try:
+        import tkinter as tk
+        from ui.ui_components import LogView
+        root = tk.Tk()
+    except Exception as e:
+        raise SkipBenchmark(f"Tk UI unavailable: {e}")
+    root.withdraw()
+
+    tmp = tempfile.TemporaryDirectory()
+    path = os.path.join(tmp.name, "anoid.log")
+    write_log_file(path, 100000 // scale)
+    handler = logging.FileHandler(path)
+    index = LogIndex(path)
+    view = LogView(root, index)
+    view.pack()
+    record = logging.LogRecord("android_studio", logging.INFO, __file__, 0, "Performed a click.", None, None)
+    batch = max(10, 500 // scale)
+
+    def emit_and_render():
+        for _ in range(batch):
+            handler.emit(record)
+        view.refresh()
+        root.update()
+
+    try:
+        result = measure(emit_and_render, number=1)
+    finally:
+        handler.close()
+        index.close()
+        root.destroy()
+        tmp.cleanup()
+    # Report per log record, not per batch
+    for key in ('min', 'median', 'mean'):
+        result[key] /= batch
+    result['number'] = batch
+    return result
+
+@benchmark("get_resource_usage")
+def resource_usage(scale):
+    try:
+        from logic.resources import get_resource_usage, psutil
+    except Exception as e:
+        raise SkipBenchmark(f"resources unavailable: {e}")
+    if psutil is None:
+        raise SkipBenchmark("psutil not installed")
+    return measure(get_resource_usage, number=3, repeat=3)
+
+@benchmark("create_status_icon")
+def create_status_icon(scale):
+    from core.system_tray import SystemTray, Image
+    if Image is None:
+        raise SkipBenchmark("PIL not installed")
+    tray = SystemTray.__new__(SystemTray)
+    statuses = ["running", "paused", "stopped"]
+    return measure(lambda: [tray.create_status_icon(s) for s in statuses], number=max(10, 300 // scale))
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+def run(selected=None, quick=False):
+    logging.getLogger("benchmark").addHandler(logging.NullHandler())
+    logging.getLogger("benchmark").propagate = False
+    scale = 10 if quick else 1
+    results = {}
+    for name, func in BENCHMARKS:
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        try:
+            results[name] = func(scale)
+        except SkipBenchmark as e:
+            results[name] = {'skipped': str(e)}
+        print(f"{name:28s} {_describe(results[name])}", file=sys.stderr)
+        if 'limit' in results[name] and results[name]['max'] > results[name]['limit']:
+            results[name]['over_limit'] = True
+            print(f"{name:28s} max {results[name]['max'] * 1000:.1f} ms exceeds the "
+                  f"{results[name]['limit'] * 1000:.0f} ms limit", file=sys.stderr)
+    return {
+        'meta': {
+            'timestamp': time.time(),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'seed': SEED,
+            'quick': quick,
+        },
+        'results': results,
+    }
+
+def _describe(result):
+    if 'skipped' in result:
+        return f"skipped ({result['skipped']})"
+    return f"median {result['median'] * 1e6:12.2f} us/op   min {result['min'] * 1e6:12.2f} us/op"
+
+def compare(current, baseline, threshold):
+    """Print per-benchmark ratios; return the names that regressed beyond threshold"""
+    regressions = []
+    for name, result in current['results'].items():
+        old = baseline.get('results', {}).get(name)
+        if not old or 'median' not in old or 'median' not in result:
+            continue
+        ratio = result['median'] / old['median'] if old['median'] else float('inf')
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{name:28s} {ratio:6.2f}x {flag}", file=sys.stderr)
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', help="Write JSON results to this file (default: stdout)")
+    parser.add_argument('--compare', help="Baseline JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument('--quick', action='store_true', help="Fewer iterations, for smoke runs")
+    parser.add_argument('benchmarks', nargs='*', help="Only run benchmarks whose name contains one of these")
+    args = parser.parse_args(argv)
+
+    results = run(args.benchmarks, quick=args.quick)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if any(result.get('over_limit') for result in results['results'].values()):
+        return 1
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
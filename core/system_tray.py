@@ -1,7 +1,6 @@
 import threading
 import tkinter as tk
 from tkinter import messagebox
-import logging
 
 try:
     import pystray  # type: ignore
@@ -11,14 +10,17 @@ except ImportError:
     Image = None
     ImageDraw = None
 
-from logic.resources import get_resource_usage
+from logic import log_config
+from logic.resources import UsageSampler
 
 class SystemTray:
     def __init__(self, app):
         self.app = app
         self.icon = None
         self.tray_thread = None
-        self.logger = logging.getLogger("android_studio")
+        self.tooltip_job = None
+        self.usage_sampler = UsageSampler()
+        self.logger = log_config.get_logger("tray")
         self.current_status = "stopped"  # stopped, running, paused
         self.tray_enabled = getattr(app, 'tray_enabled', True)  # Default to True
         if self.tray_enabled:
@@ -82,13 +84,17 @@ class SystemTray:
                 self.icon.icon = new_image
                 self.icon.title = status_text.get(status, "Android Studio")
         except Exception as e:
-            self.logger.error(f"Failed to update tray status: {e}")
+            self.logger.error("Failed to update tray status: %s", e)
 
     def update_tray_resource_tooltip(self):
-        usage = get_resource_usage()
+        usage = self.usage_sampler.sample()
         tooltip = f"CPU: {usage['cpu_percent']:.1f}%\nRAM: {usage['ram_mb']:.1f} MB"
         if usage['gpu_percent'] is not None:
             tooltip += f"\nGPU: {usage['gpu_percent']:.1f}%"
+        controls = getattr(self.app, 'simulation_controls', None)
+        if controls:
+            for note in controls.engine.throttle_notes():
+                tooltip += f"\n{note}"
         if hasattr(self, 'icon') and self.icon:
             self.icon.title = tooltip
 
@@ -106,30 +112,37 @@ class SystemTray:
                     pystray.MenuItem("Exit", self._tray_exit_application)
                 )
                 self.icon = pystray.Icon("AndroidStudio", image, "Android Studio - Stopped", menu)
-                self.tray_thread = threading.Thread(target=self.icon.run, daemon=True)
+                self.tray_thread = threading.Thread(target=self.icon.run, name="tray", daemon=True)
                 self.tray_thread.start()
                 self._schedule_resource_tooltip_update()
             except Exception as e:
                 self.icon = None
-                self.logger.warning(f"Failed to initialize system tray: {e}")
+                self.logger.warning("Failed to initialize system tray: %s", e)
         else:
             self.icon = None
             self.logger.warning("pystray or PIL not installed. System tray icon will be disabled.")
 
     def _schedule_resource_tooltip_update(self):
+        """Refresh the tooltip every 2 s from the app's timer thread; registers only once"""
+        timers = getattr(self.app, 'timers', None)
+        if timers is None or self.tooltip_job is not None:
+            return
+        self.tooltip_job = timers.every(2.0, self._refresh_resource_tooltip, tolerance=1.0)
+
+    def _refresh_resource_tooltip(self):
+        if not self.icon:
+            return
         try:
             self.update_tray_resource_tooltip()
         except Exception:
             pass
-        if hasattr(self, 'app') and hasattr(self.app, 'root'):
-            self.app.root.after(2000, self._schedule_resource_tooltip_update)
 
     def minimize_to_tray(self):
         if self.icon:
             try:
                 self.app.root.after(200, self.app.root.withdraw)
             except Exception as e:
-                self.logger.error(f"Failed to minimize to tray: {e}")
+                self.logger.error("Failed to minimize to tray: %s", e)
                 if self.app.config.get('ui', {}).get('notifications_enabled', False):
                     from tkinter import messagebox
                     messagebox.showerror("Error", f"Failed to minimize to tray: {e}")
@@ -148,6 +161,10 @@ class SystemTray:
         self.app.root.after(0, self.app.exit_application)
 
     def stop(self):
+        timers = getattr(self.app, 'timers', None)
+        if timers is not None:
+            timers.cancel(self.tooltip_job)
+            self.tooltip_job = None
         try:
             if self.icon:
                 self.icon.stop()
@@ -160,4 +177,4 @@ class SystemTray:
                 self.icon.stop()
                 self.icon = None
             except Exception as e:
-                self.logger.warning(f"Failed to hide tray icon: {e}")
+                self.logger.warning("Failed to hide tray icon: %s", e)
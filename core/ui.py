@@ -5,8 +5,8 @@ import logging
 import sys
 import os
 import shutil
+import threading
 from tkinter import messagebox
-import keyboard as global_keyboard  # for hotkey  # type: ignore
 
 # Add the project root directory to sys.path to ensure imports work correctly
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -17,6 +17,23 @@ from core.system_tray import SystemTray
 from ui.ui_components import UIComponents
 from simulation.simulation_controls import SimulationControls
 
+from logic.config_manager import diff_configs, get_default_config, merge_configs, save_config_file
+from logic import log_config
+from logic.control_server import ControlServer, log_levels_result, metrics_result, profiler_handlers
+from logic.hotkeys import HotkeyDispatcher
+from logic.idle import IdleDetector, default_idle_source
+from logic.log_index import LogIndex
+from logic.profiler import SamplingProfiler
+from logic.schedule import ScheduleRunner
+from logic.timers import TimerService
+from simulation.display import LayoutProbe
+
+# Log records arriving within this many ms share one Log tab refresh
+LOG_REFRESH_MS = 200
+
+# Seconds between checks of the monitor layout
+DISPLAY_CHECK_INTERVAL = 5.0
+
 class AndroidStudioUI:
     def __init__(self, root):
         self.root = root
@@ -38,33 +55,75 @@ class AndroidStudioUI:
         self.migrate_old_files()
         self.config = self.load_config()
         self.process = None
-        self.log_messages = []
+        # Line index over the log file for the Log tab
+        self.log_index = LogIndex(self.log_file)
         self.auto_restart_enabled = self.config.get('ui', {}).get('auto_restart', True)
-        self.auto_restart_timer = None
         self.idle_timeout_minutes = self.config.get('ui', {}).get('idle_timeout_minutes', 1)
         self.user_is_idle = False
         
         self.setup_logging()
         
+        # Periodic jobs (tooltips, labels, idle checks, schedule) share one coalescing timer thread
+        self.timers = TimerService()
+        self.timers.bridge_tk(self.root)
+        self.timers.start()
+        
+        # Every global hotkey goes through one keyboard hook; handlers run on the Tk thread
+        self.hotkeys = HotkeyDispatcher(runner=lambda func: self.root.after(0, func))
+        self.hotkeys.set_enabled(self.config.get('ui', {}).get('hotkey_control', True))
+        # Keys released while another window had focus may never reach the hook
+        self.root.bind('<FocusOut>', lambda event: event.widget is self.root and self.hotkeys.reset(), add='+')
+        
         # Initialize components
         self.system_tray = SystemTray(self)
         self.ui_components = UIComponents(self)
         self.simulation_controls = SimulationControls(self)
+        self.profiler = SamplingProfiler(os.path.dirname(self.config_file))
+        # Watches for real user inactivity while a stopped simulation waits to auto-restart
+        self.idle_detector = IdleDetector(
+            default_idle_source(self.simulation_controls.activity),
+            threshold=self.idle_timeout_minutes * 60,
+            timers=self.timers,
+            hysteresis=self.config.get('ui', {}).get('idle_hysteresis_seconds', 5),
+            on_idle=lambda: self.root.after(0, self.on_user_idle))
+        self.schedule_runner = ScheduleRunner(
+            self.config, on_change=lambda active: self.root.after(0, self.apply_schedule_state, active),
+            timers=self.timers)
         
         # Setup UI after components are initialized
         self.setup_ui()
         
+        # Push behavior settings to the engine as they are edited
+        self.pending_config = {}
+        self.config_flush_timer = None
+        self.bind_config_traces()
+        
         # Window management
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
+        # Drop the engine's cached geometry when the monitor layout changes. The OS probe also
+        # works while the window is withdrawn to the tray; Tk's screen size is the fallback.
+        try:
+            self.layout_probe = LayoutProbe()
+        except Exception as e:
+            self.layout_probe = None
+            self.logger.info("Display layout probe unavailable (%s); using the Tk screen size.", e)
+        self.display_signature = self.read_display_signature()
+        self.timers.every(DISPLAY_CHECK_INTERVAL, self.check_display_change, tolerance=1.0,
+                          tk=self.layout_probe is None)
+        
         # Apply theme
         self.ui_components.apply_theme()
         
+        # Local control socket for automation scripts
+        self.control_server = None
+        self.setup_control_server()
+        
+        # Activity windows start and stop the simulation from the timer thread
+        self.schedule_runner.start()
+        
         # Global hotkey for pause/resume
-        try:
-            global_keyboard.add_hotkey('ctrl+shift+p', self.simulation_controls.toggle_simulation_hotkey)
-        except Exception:
-            pass
+        self.hotkeys.bind('ctrl+shift+p', self.simulation_controls.toggle_simulation_hotkey)
         
         # Set window icon if available
         self.set_window_icon()
@@ -81,6 +140,18 @@ class AndroidStudioUI:
         y = (self.root.winfo_screenheight() // 2) - (height // 2)
         self.root.geometry(f'{width}x{height}+{x}+{y}')
 
+    def read_display_signature(self):
+        if self.layout_probe is not None:
+            return self.layout_probe.signature()
+        return (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+
+    def check_display_change(self):
+        """Invalidate cached monitor geometry when the monitor layout changes"""
+        signature = self.read_display_signature()
+        if signature != self.display_signature:
+            self.display_signature = signature
+            self.simulation_controls.engine.display_changed()
+
     def set_window_icon(self):
         """Set the window icon if available"""
         try:
@@ -122,7 +193,7 @@ class AndroidStudioUI:
             # Only log to file, not to console
             logging.basicConfig(
                 level=logging.INFO, 
-                format='%(asctime)s - %(levelname)s - %(message)s', 
+                format=log_config.FORMAT, 
                 handlers=[logging.FileHandler(self.log_file)]
             )
         except Exception as e:
@@ -130,44 +201,103 @@ class AndroidStudioUI:
             self.root.destroy()
             sys.exit(1)
         
-        self.logger = logging.getLogger("android_studio")
+        self.logger = log_config.get_logger()
         self.log_handler = self.LogHandler(self)
         self.logger.addHandler(self.log_handler)
+        # Subsystem loggers (engine.mouse, activity, tray, config, ...) and their levels
+        self.config_logger = log_config.get_logger('config')
+        log_config.apply_config(self.config)
 
     class LogHandler(logging.Handler):
-        """Custom log handler for UI updates"""
+        """Tells the Log tab that the log file grew; a burst of records costs one refresh"""
         def __init__(self, ui):
             super().__init__()
             self.ui = ui
+            self.pending = False
 
         def emit(self, record):
-            log_message = self.format(record)
-            self.ui.log_messages.append(log_message)
-            
-            # Limit to last 100 messages to prevent memory issues
-            if len(self.ui.log_messages) > 100:
-                self.ui.log_messages.pop(0)
-            
-            # Update UI in main thread
-            if hasattr(self.ui.ui_components, 'log_text') and self.ui.ui_components.log_text:
-                self.ui.root.after(0, self.ui.update_log_display)
+            ui_components = getattr(self.ui, 'ui_components', None)
+            if self.pending or getattr(ui_components, 'log_view', None) is None:
+                return
+            self.pending = True
+            try:
+                self.ui.root.after(LOG_REFRESH_MS, self.ui.update_log_display)
+            except RuntimeError:
+                self.pending = False  # Tk is shutting down
+
+    def run_in_ui_thread(self, func, timeout=5):
+        """Run func on the Tk thread and wait for its result"""
+        done = threading.Event()
+        outcome = {}
+        def call():
+            try:
+                outcome['result'] = func()
+            except Exception as e:
+                outcome['error'] = e
+            finally:
+                done.set()
+        self.root.after(0, call)
+        if not done.wait(timeout):
+            raise TimeoutError("UI thread did not respond")
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome.get('result')
+
+    def control_handlers(self):
+        """Methods exposed on the control socket"""
+        engine = self.simulation_controls.engine
+        def on_ui_thread(action):
+            def handler(params):
+                self.run_in_ui_thread(action)
+                return engine.status()
+            return handler
+        def reload_config():
+            changes = diff_configs(self.config, self.load_config())
+            engine.apply_config(changes)
+            if 'schedule' in changes:
+                self.reload_schedule()
+            if 'hotkey_control' in changes.get('ui', {}):
+                self.hotkeys.set_enabled(self.config['ui']['hotkey_control'])
+            self.config_logger.info("Configuration reloaded (%s).", ", ".join(sorted(changes)) or "no changes")
+        handlers = {
+            'start': on_ui_thread(self.start_simulation),
+            'stop': on_ui_thread(self.stop_simulation),
+            'pause': on_ui_thread(self.simulation_controls.pause_simulation),
+            'resume': on_ui_thread(self.simulation_controls.resume_simulation),
+            'status': lambda params: engine.status(),
+            'reload_config': on_ui_thread(reload_config),
+            'display_changed': lambda params: engine.display_changed() or engine.status(),
+            'metrics': lambda params: metrics_result(engine.metrics, params),
+            'schedule': lambda params: self.schedule_runner.status(),
+            'timers': lambda params: self.timers.status(),
+            'hotkeys': lambda params: self.hotkeys.status(),
+            'log_levels': lambda params: log_levels_result(engine, self.config, params),
+        }
+        handlers.update(profiler_handlers(self.profiler))
+        return handlers
+
+    def setup_control_server(self):
+        """Start the local control server if enabled"""
+        control = self.config.get('control', {})
+        if not control.get('enabled', True):
+            return
+        try:
+            self.control_server = ControlServer(self.control_handlers(), path=control.get('socket_path') or None)
+            self.control_server.start()
+        except Exception as e:
+            self.control_server = None
+            self.logger.warning("Failed to start control server: %s", e)
 
     def setup_ui(self):
         """Setup the main UI"""
         self.ui_components.setup_ui()
 
     def update_log_display(self):
-        """Update the log display in the UI"""
-        def do_update():
-            if hasattr(self.ui_components, 'log_text') and self.ui_components.log_text:
-                self.ui_components.log_text.config(state='normal')
-                self.ui_components.log_text.delete(1.0, tk.END)
-                for msg in self.log_messages:
-                    self.ui_components.log_text.insert(tk.END, msg + "\n")
-                self.ui_components.log_text.see(tk.END)
-                self.ui_components.log_text.config(state='disabled')
-        
-        self.root.after(0, do_update)
+        """Show lines appended to the log file (Tk thread); skipped while the Log tab is hidden"""
+        self.log_handler.pending = False
+        log_view = getattr(self.ui_components, 'log_view', None)
+        if log_view is not None and log_view.winfo_viewable():
+            log_view.refresh()
 
     def show_window(self):
         """Show the main window"""
@@ -186,6 +316,27 @@ class AndroidStudioUI:
         except Exception:
             pass
         
+        try:
+            if self.control_server:
+                self.control_server.stop()
+        except Exception:
+            pass
+        
+        try:
+            self.schedule_runner.stop()
+            self.idle_detector.stop()
+            self.timers.stop()
+            self.hotkeys.stop()
+            self.log_index.close()
+        except Exception:
+            pass
+        
+        try:
+            self.simulation_controls.close_user_activity_listener()
+            self.simulation_controls.engine.close()
+        except Exception:
+            pass
+        
         try:
             # Ensure all processes are terminated
             if self.process:
@@ -206,63 +357,101 @@ class AndroidStudioUI:
         if messagebox.askokcancel("Quit", "Do you want to quit Android Studio?"):
             self.exit_application()
 
-    def update_config(self):
-        """Update configuration from UI components"""
-        new_config = {
-            'mouse': {
-                'enabled': self.ui_components.mouse_enabled.get(),
-                'movements': self.ui_components.mouse_movements.get(),
-                'min_duration': self.ui_components.mouse_min_duration.get(),
-                'max_duration': self.ui_components.mouse_max_duration.get(),
-                'min_interval': self.ui_components.mouse_min_interval.get(),
-                'max_interval': self.ui_components.mouse_max_interval.get(),
-                'scrolls': self.ui_components.mouse_scrolls.get(),
-                'scroll_sensitivity': self.ui_components.mouse_scroll_sensitivity.get(),
-                'hscrolls': self.ui_components.mouse_hscrolls.get(),
-                'scroll_min_interval': self.ui_components.mouse_scroll_min_interval.get(),
-                'scroll_max_interval': self.ui_components.mouse_scroll_max_interval.get()
-            },
-            'keyboard': {
-                'enabled': self.ui_components.keyboard_enabled.get(),
-                'actions': self.ui_components.keyboard_actions.get(),
-                'phrases': [p.strip() for p in self.ui_components.keyboard_phrases.get().split(',')],
-                'min_interval': self.ui_components.keyboard_min_interval.get(),
-                'max_interval': self.ui_components.keyboard_max_interval.get(),
-                'dart_enabled': self.ui_components.dart_enabled.get(),
-                'dart_lines': self.ui_components.dart_lines.get(),
-                'code_writing_enabled': self.ui_components.code_writing_enabled.get(),
-                'typing_from_file_enabled': self.ui_components.typing_from_file_enabled.get(),
-                'typing_file_path': self.ui_components.typing_file_path.get()
-            },
-            'browser': {
-                'enabled': self.ui_components.browser_enabled.get(),
-                'headless': self.ui_components.browser_headless.get(),
-                'min_interval': self.ui_components.browser_min_interval.get(),
-                'max_interval': self.ui_components.browser_max_interval.get()
-            },
-            'ui': {
-                'dark_mode': self.ui_components.is_dark_mode,
-                'auto_restart': self.auto_restart_enabled,
-                'idle_timeout_minutes': self.idle_timeout_minutes,
-                'minimize_on_start': self.ui_components.minimize_on_start_var.get(),
-                'hotkey_control': self.ui_components.hotkey_control_var.get(),
-                'notifications_enabled': self.ui_components.notifications_enabled.get()
-            }
-        }
-        
-        self.config = new_config
+    def config_variables(self):
+        """(section, key, Tk variable) for every behavior setting in the UI"""
+        c = self.ui_components
+        return [
+            ('mouse', 'enabled', c.mouse_enabled),
+            ('mouse', 'movements', c.mouse_movements),
+            ('mouse', 'min_duration', c.mouse_min_duration),
+            ('mouse', 'max_duration', c.mouse_max_duration),
+            ('mouse', 'min_interval', c.mouse_min_interval),
+            ('mouse', 'max_interval', c.mouse_max_interval),
+            ('mouse', 'scrolls', c.mouse_scrolls),
+            ('mouse', 'scroll_sensitivity', c.mouse_scroll_sensitivity),
+            ('mouse', 'hscrolls', c.mouse_hscrolls),
+            ('mouse', 'scroll_min_interval', c.mouse_scroll_min_interval),
+            ('mouse', 'scroll_max_interval', c.mouse_scroll_max_interval),
+            ('keyboard', 'enabled', c.keyboard_enabled),
+            ('keyboard', 'actions', c.keyboard_actions),
+            ('keyboard', 'phrases', c.keyboard_phrases),
+            ('keyboard', 'min_interval', c.keyboard_min_interval),
+            ('keyboard', 'max_interval', c.keyboard_max_interval),
+            ('keyboard', 'dart_enabled', c.dart_enabled),
+            ('keyboard', 'dart_lines', c.dart_lines),
+            ('keyboard', 'code_writing_enabled', c.code_writing_enabled),
+            ('keyboard', 'typing_from_file_enabled', c.typing_from_file_enabled),
+            ('keyboard', 'typing_file_path', c.typing_file_path),
+            ('browser', 'enabled', c.browser_enabled),
+            ('browser', 'headless', c.browser_headless),
+            ('browser', 'min_interval', c.browser_min_interval),
+            ('browser', 'max_interval', c.browser_max_interval),
+            ('schedule', 'enabled', c.schedule_enabled),
+            ('ui', 'hotkey_control', c.hotkey_control_var),
+        ]
+
+    def bind_config_traces(self):
+        """Trace each setting variable so edits reach the engine without a full config rebuild"""
+        for section, key, variable in self.config_variables():
+            variable.trace_add('write', lambda *args, section=section, key=key, variable=variable:
+                               self.on_setting_changed(section, key, variable))
+
+    def on_setting_changed(self, section, key, variable):
+        """Queue one changed setting; slider drags and typing are coalesced for 250 ms"""
+        try:
+            value = variable.get()
+        except tk.TclError:
+            return  # half-typed number
+        if key == 'phrases':
+            value = [p.strip() for p in value.split(',')]
+        pending = self.pending_config.setdefault(section, {})
+        pending[key] = value
+        if self.config_flush_timer is None:
+            self.config_flush_timer = self.root.after(250, self.flush_config_changes)
+
+    def flush_config_changes(self):
+        """Apply pending setting changes to the engine and save them; returns the changes"""
+        if self.config_flush_timer is not None:
+            self.root.after_cancel(self.config_flush_timer)
+            self.config_flush_timer = None
+        changes = diff_configs(self.config, self.pending_config)
+        self.pending_config = {}
+        if not changes:
+            return changes
+        affected = self.simulation_controls.engine.apply_config(changes)
+        if 'schedule' in changes:
+            self.reload_schedule()
+        if 'hotkey_control' in changes.get('ui', {}):
+            self.hotkeys.set_enabled(self.config['ui']['hotkey_control'])
         self.save_config()
+        self.config_logger.info("Applied %s (reconfigured: %s).",
+                                ", ".join(f"{section}.{key}" for section, values in changes.items() for key in values),
+                                ", ".join(affected) or "none")
+        return changes
+
+    def reload_schedule(self):
+        """Hand the current 'schedule' section to the runner and refresh its label"""
+        self.schedule_runner.reload(self.config)
+        self.root.after(200, self.ui_components.update_schedule_status)
+
+    def apply_schedule_state(self, active):
+        """Start or stop the simulation as a schedule window opens or closes (Tk thread)"""
+        running = self.simulation_controls.simulation_running
+        if active and not running:
+            self.start_simulation()
+        elif not active and running:
+            self.simulation_controls.stop_simulation(schedule_restart=False)
+            self.update_status("🔴 Status: Stopped")
+        self.ui_components.update_schedule_status()
 
     def apply_changes(self):
-        """Apply configuration changes"""
-        if self.simulation_controls.simulation_running:
-            self.update_config()
-            self.notify_info("Success", "Changes applied to running simulation.")
-        else:
-            self.notify_warning("Warning", "No simulation is running. Start the simulation first.")
+        """Apply any setting changes still waiting for the debounce timer"""
+        self.flush_config_changes()
+        self.notify_info("Success", "Changes applied.")
 
     def start_simulation(self):
         """Start the simulation"""
+        self.cancel_auto_restart()
         self.simulation_controls.start_simulation()
         self.update_status("🟢 Status: Running")
 
@@ -283,6 +472,8 @@ class AndroidStudioUI:
             self.config['ui'] = {}
         self.config['ui']['auto_restart'] = self.auto_restart_enabled
         self.save_config()
+        if not self.auto_restart_enabled:
+            self.cancel_auto_restart()
 
     def toggle_hotkey_control(self):
         """Toggle hotkey control"""
@@ -290,6 +481,7 @@ class AndroidStudioUI:
         if 'ui' not in self.config:
             self.config['ui'] = {}
         self.config['ui']['hotkey_control'] = hotkey_enabled
+        self.hotkeys.set_enabled(hotkey_enabled)
         self.save_config()
 
     def toggle_notifications(self):
@@ -309,23 +501,32 @@ class AndroidStudioUI:
         self.save_config()
 
     def schedule_idle_check(self):
-        """Schedule idle timeout check"""
-        if self.auto_restart_enabled and self.simulation_controls.simulation_running:
-            self.auto_restart_timer = self.root.after(
-                self.idle_timeout_minutes * 60 * 1000,  # Convert minutes to milliseconds
-                self.check_user_idle_and_restart
-            )
+        """Watch for the user going idle so the stopped simulation can restart"""
+        if self.auto_restart_enabled and not self.simulation_controls.simulation_running:
+            self.user_is_idle = False
+            self.simulation_controls.watch_for_activity()
+            self.idle_detector.start()
 
     def cancel_auto_restart(self):
-        """Cancel auto-restart timer"""
-        if self.auto_restart_timer:
-            self.root.after_cancel(self.auto_restart_timer)
-            self.auto_restart_timer = None
+        """Stop waiting for the user to go idle"""
+        self.idle_detector.stop()
+        if not self.simulation_controls.simulation_running:
+            self.simulation_controls.stop_user_activity_listener()
+
+    def on_user_idle(self):
+        """Idle detector callback, run on the Tk thread"""
+        self.user_is_idle = True
+        self.check_user_idle_and_restart()
 
     def check_user_idle_and_restart(self):
         """Check if user is idle and restart if needed"""
-        if self.user_is_idle and self.auto_restart_enabled:
-            self.simulation_controls.start_simulation()
+        if self.user_is_idle and self.auto_restart_enabled and not self.simulation_controls.simulation_running:
+            if self.schedule_runner.enabled and not self.schedule_runner.active:
+                # Outside a schedule window: the schedule starts it when the next window opens
+                self.logger.info("User idle, but outside the schedule windows; not restarting.")
+                return
+            self.logger.info("No user input for %s min. Restarting simulation.", self.idle_timeout_minutes)
+            self.start_simulation()
             self.user_is_idle = False
 
     def update_idle_timeout(self):
@@ -335,11 +536,13 @@ class AndroidStudioUI:
             self.config['ui'] = {}
         self.config['ui']['idle_timeout_minutes'] = self.idle_timeout_minutes
         self.save_config()
+        self.idle_detector.configure(threshold=self.idle_timeout_minutes * 60)
 
     def reset_idle_timer(self):
         """Reset the idle timer"""
         self.cancel_auto_restart()
         self.user_is_idle = False
+        self.simulation_controls.activity.note_input()
         self.schedule_idle_check()
 
     def load_config(self):
@@ -357,7 +560,7 @@ class AndroidStudioUI:
                 self.save_config(config)
                 return config
         except Exception as e:
-            self.logger.error(f"Failed to load configuration: {e}")
+            self.logger.error("Failed to load configuration: %s", e)
             return self.get_default_config()
 
     def save_config(self, config=None):
@@ -366,29 +569,13 @@ class AndroidStudioUI:
             config = self.config
         
         try:
-            # Ensure config directory exists
-            config_dir = os.path.dirname(self.config_file)
-            if not os.path.exists(config_dir):
-                os.makedirs(config_dir)
-            
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            save_config_file(self.config_file, config)
         except Exception as e:
-            self.logger.error(f"Failed to save configuration: {e}")
+            self.logger.error("Failed to save configuration: %s", e)
 
     def merge_configs(self, default_config, user_config):
         """Merge default and user configurations"""
-        merged = default_config.copy()
-        
-        def merge_dict(base, update):
-            for key, value in update.items():
-                if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                    merge_dict(base[key], value)
-                else:
-                    base[key] = value
-        
-        merge_dict(merged, user_config)
-        return merged
+        return merge_configs(default_config, user_config)
 
     def notify_info(self, title, message):
         """Show info notification if enabled"""
@@ -414,7 +601,7 @@ class AndroidStudioUI:
         try:
             webbrowser.open(url)
         except Exception as e:
-            self.logger.error(f"Failed to open URL {url}: {e}")
+            self.logger.error("Failed to open URL %s: %s", url, e)
 
     def check_and_open_github_on_first_run(self):
         """Check if this is the first run and open GitHub if needed"""
@@ -429,52 +616,11 @@ class AndroidStudioUI:
                 # Open GitHub in browser
                 self.open_url("https://github.com/yasirSub/AndroidStudioV1")
             except Exception as e:
-                self.logger.error(f"Failed to handle first run: {e}")
+                self.logger.error("Failed to handle first run: %s", e)
 
     def get_default_config(self):
         """Get default configuration"""
-        return {
-            'mouse': {
-                'enabled': False,
-                'movements': 5,
-                'min_duration': 0.5,
-                'max_duration': 2.0,
-                'min_interval': 1.0,
-                'max_interval': 5.0,
-                'scrolls': 3,
-                'scroll_sensitivity': 3,
-                'hscrolls': 1,
-                'scroll_min_interval': 0.2,
-                'scroll_max_interval': 1.0
-            },
-            'keyboard': {
-                'enabled': False,
-                'actions': 3,
-                'phrases': ['hello', 'test', 'android studio'],
-                'min_interval': 2.0,
-                'max_interval': 10.0,
-                'dart_enabled': True,
-                'dart_lines': 700,
-                'code_writing_enabled': True,
-                'typing_from_file_enabled': False,
-                'typing_file_path': ''
-            },
-            'browser': {
-                'enabled': False,
-                'headless': True,
-                'min_interval': 10.0,
-                'max_interval': 30.0
-            },
-            'ui': {
-                'dark_mode': False,
-                'auto_restart': True,
-                'idle_timeout_minutes': 1,
-                'minimize_on_start': True,
-                'hotkey_control': True,
-                'notifications_enabled': False,
-                'pause_after_activity': 3
-            }
-        }
+        return get_default_config()
 
 if __name__ == "__main__":
     import random
@@ -1,6 +1,131 @@
 import json
 import os
-from tkinter import messagebox
+
+def get_default_config():
+    """Get default configuration"""
+    return {
+        'mouse': {
+            'enabled': False,
+            'movements': 5,
+            'min_duration': 0.5,
+            'max_duration': 2.0,
+            'min_interval': 1.0,
+            'max_interval': 5.0,
+            'scrolls': 3,
+            'scroll_sensitivity': 3,
+            'hscrolls': 1,
+            'scroll_min_interval': 0.2,
+            'scroll_max_interval': 1.0,
+            'target_monitors': 'primary',
+            'target_region': [0.2, 0.2, 0.8, 0.8]
+        },
+        'keyboard': {
+            'enabled': False,
+            'actions': 3,
+            'phrases': ['hello', 'test', 'android studio'],
+            'min_interval': 2.0,
+            'max_interval': 10.0,
+            'dart_enabled': True,
+            'dart_lines': 700,
+            'code_writing_enabled': True,
+            'typing_from_file_enabled': False,
+            'typing_file_path': ''
+        },
+        'browser': {
+            'enabled': False,
+            'headless': True,
+            'min_interval': 10.0,
+            'max_interval': 30.0
+        },
+        'ui': {
+            'dark_mode': False,
+            'auto_restart': True,
+            'idle_timeout_minutes': 1,
+            'idle_hysteresis_seconds': 5,
+            'minimize_on_start': True,
+            'hotkey_control': True,
+            'notifications_enabled': False,
+            'pause_after_activity': 3
+        },
+        'control': {
+            'enabled': True,
+            'socket_path': ''
+        },
+        'engine': {
+            'seed': None,
+            'trace_file': '',
+            'isolate': False,
+            'hang_timeout': 15
+        },
+        'governor': {
+            'enabled': True,
+            'interval': 30,
+            'load_per_cpu': 0.8,
+            'cpu_pressure': 20.0,
+            'battery_percent': 30,
+            'throttle_on_battery': True,
+            'budget_interval': 5,
+            'cpu_budget_percent': 5.0,
+            'rss_budget_mb': 200
+        },
+        'history': {
+            'enabled': True,
+            'path': '',
+            'flush_interval': 60
+        },
+        'logging': {
+            'level': 'INFO',
+            'levels': {}
+        },
+        'schedule': {
+            'enabled': False,
+            'windows': [
+                {'days': 'mon-fri', 'start': '09:00', 'end': '12:30'},
+                {'days': 'mon-fri', 'start': '13:30', 'end': '18:00'}
+            ]
+        }
+    }
+
+def merge_configs(default_config, user_config):
+    """Merge default and user configurations"""
+    merged = default_config.copy()
+
+    def merge_dict(base, update):
+        for key, value in update.items():
+            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
+                merge_dict(base[key], value)
+            else:
+                base[key] = value
+
+    merge_dict(merged, user_config)
+    return merged
+
+def diff_configs(old_config, new_config):
+    """Return {section: {key: value}} for every setting that differs in new_config"""
+    changes = {}
+    for section, values in new_config.items():
+        if not isinstance(values, dict):
+            continue
+        old_values = old_config.get(section)
+        if not isinstance(old_values, dict):
+            old_values = {}
+        changed = {key: value for key, value in values.items() if key not in old_values or old_values[key] != value}
+        if changed:
+            changes[section] = changed
+    return changes
+
+def load_config_file(config_file):
+    """Load a config file merged over the defaults, without touching any UI"""
+    with open(config_file, 'r') as f:
+        return merge_configs(get_default_config(), json.load(f))
+
+def save_config_file(config_file, config):
+    """Write a config file, creating its directory if needed"""
+    config_dir = os.path.dirname(config_file)
+    if config_dir and not os.path.exists(config_dir):
+        os.makedirs(config_dir)
+    with open(config_file, 'w') as f:
+        json.dump(config, f, indent=2)
 
 class ConfigManager:
     def __init__(self, config_file=None):
@@ -25,6 +150,7 @@ class ConfigManager:
                 return json.load(file)
         except Exception as e:
             if self._notifications_enabled():
+                from tkinter import messagebox
                 messagebox.showerror("Error", f"Failed to load configuration: {e}")
             return {}
 
@@ -35,9 +161,11 @@ class ConfigManager:
             with open(self.config_file, 'w') as file:
                 json.dump(config, file, indent=2)
             if self._notifications_enabled():
+                from tkinter import messagebox
                 messagebox.showinfo("Success", "Configuration saved successfully.")
         except Exception as e:
             if self._notifications_enabled():
+                from tkinter import messagebox
                 messagebox.showerror("Error", f"Failed to save configuration: {e}")
 
     def update_config(self, new_config):
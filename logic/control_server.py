@@ -0,0 +1,289 @@
+"""Local JSON-RPC-style control server.
+
+Listens on a Unix domain socket (TCP loopback on platforms without one) and
+speaks newline-delimited JSON:
+
+    -> {"id": 1, "method": "status", "params": {}}
+    <- {"id": 1, "result": {"state": "running", ...}}
+    <- {"id": 1, "error": {"code": -32601, "message": "Unknown method: foo"}}
+
+The asyncio loop runs on its own thread and sits blocked in select() while no
+client is connected, so an idle server costs no wakeups.
+
+Only the user running the app may connect. The Unix socket is bound inside
+a private 0700 directory, set to mode 0600 and only then moved into place;
+a socket that still answers belongs to a running instance and is left
+alone. A loopback TCP port is open to every local process, so in that
+mode the port file (readable only by its owner where the OS supports it)
+also holds a random token, and each request must carry it as "token".
+"""
+import argparse
+import asyncio
+import errno
+import hmac
+import json
+import os
+import secrets
+import socket
+import sys
+import tempfile
+import threading
+
+from logic import log_config
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+UNAUTHORIZED = -32001
+
+HAS_UNIX_SOCKETS = hasattr(socket, 'AF_UNIX') and hasattr(asyncio, 'start_unix_server')
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+def default_socket_path():
+    """Return the default control socket path inside the config directory"""
+    return os.path.join(project_root, "config", "anoid.sock")
+
+def _port_file(path):
+    return path + ".port"
+
+def _write_private(path, text):
+    """Create ``path`` readable and writable by its owner only"""
+    try:
+        os.unlink(path)  # O_CREAT's mode only applies to a new file
+    except FileNotFoundError:
+        pass
+    with os.fdopen(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), 'w') as f:
+        f.write(text)
+
+def _socket_in_use(path):
+    """True if a server answers on the Unix socket at ``path``; False if it is stale or absent"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError as e:
+        if e.errno in (errno.ECONNREFUSED, errno.ENOENT):
+            return False
+        raise
+    finally:
+        probe.close()
+    return True
+
+def _bind_private_unix(path):
+    """Return a socket bound at ``path`` that no other user could reach at any point.
+
+    It is bound in a fresh 0700 directory next to ``path``, chmod'ed to 0600
+    and renamed into place, so the process umask is never touched.
+    """
+    if os.path.exists(path):
+        if _socket_in_use(path):
+            raise OSError(errno.EADDRINUSE, f"another instance is serving {path}")
+        os.unlink(path)  # stale socket from a crashed instance
+    directory = tempfile.mkdtemp(prefix=".anoid-sock-", dir=os.path.dirname(os.path.abspath(path)))
+    staged = os.path.join(directory, "sock")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(staged)
+        os.chmod(staged, 0o600)
+        os.rename(staged, path)
+    except BaseException:
+        sock.close()
+        raise
+    finally:
+        try:
+            os.unlink(staged)
+        except FileNotFoundError:
+            pass
+        os.rmdir(directory)
+    return sock
+
+class ControlServer:
+    """Serve ``handlers`` (method name -> callable(params) -> result) to local clients"""
+    def __init__(self, handlers, path=None, logger=None):
+        self.handlers = dict(handlers)
+        self.path = path or default_socket_path()
+        self.logger = logger or log_config.get_logger("control")
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.token = None
+        self.listening = False
+        self._ready = threading.Event()
+
+    def start(self):
+        """Start serving on a background thread"""
+        if self.thread and self.thread.is_alive():
+            return
+        self._ready.clear()
+        self.thread = threading.Thread(target=self._run, name="control-server", daemon=True)
+        self.thread.start()
+        self._ready.wait(timeout=5)
+
+    def stop(self):
+        """Stop serving and remove the socket file (only if this server created it)"""
+        if self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=2)
+        self.thread = None
+        if not self.listening:
+            return
+        self.listening = False
+        for path in (self.path, _port_file(self.path)):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(self._listen())
+            self.listening = True
+        except Exception as e:
+            self.logger.error("Failed to start control server: %s", e)
+            self._ready.set()
+            self.loop.close()
+            return
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.server.close()
+            self.loop.run_until_complete(self.server.wait_closed())
+            self.loop.close()
+
+    async def _listen(self):
+        if HAS_UNIX_SOCKETS:
+            server = await asyncio.start_unix_server(self._handle_client, sock=_bind_private_unix(self.path))
+            self.logger.info("Control server listening on %s", self.path)
+        else:
+            self.token = secrets.token_hex(16)
+            server = await asyncio.start_server(self._handle_client, host='127.0.0.1', port=0)
+            port = server.sockets[0].getsockname()[1]
+            _write_private(_port_file(self.path), f"{port}\n{self.token}\n")
+            self.logger.info("Control server listening on 127.0.0.1:%d", port)
+        return server
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self._dispatch(line)
+                writer.write(json.dumps(response).encode('utf-8') + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, line):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {'id': None, 'error': {'code': PARSE_ERROR, 'message': "Invalid JSON"}}
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return {'id': None, 'error': {'code': INVALID_REQUEST, 'message': "Missing method"}}
+        request_id = request.get('id')
+        if self.token is not None and not hmac.compare_digest(str(request.get('token', '')), self.token):
+            return {'id': request_id, 'error': {'code': UNAUTHORIZED, 'message': "Invalid token"}}
+        method = request['method']
+        handler = self.handlers.get(method)
+        if handler is None:
+            return {'id': request_id, 'error': {'code': METHOD_NOT_FOUND, 'message': f"Unknown method: {method}"}}
+        params = request.get('params') or {}
+        try:
+            # Handlers may block (e.g. waiting on the Tk thread); keep the loop free
+            result = await self.loop.run_in_executor(None, handler, params)
+        except Exception as e:
+            self.logger.error("Control method %s failed: %s", method, e)
+            return {'id': request_id, 'error': {'code': INTERNAL_ERROR, 'message': str(e)}}
+        return {'id': request_id, 'result': result}
+
+def metrics_result(metrics, params):
+    """Result of the "metrics" method; writes the OpenMetrics file if params has a path"""
+    if params.get('path'):
+        metrics.export(params['path'])
+    return {'summary': metrics.summary(), 'openmetrics': metrics.render_openmetrics()}
+
+def log_levels_result(engine, config, params):
+    """Result of the "log_levels" method.
+
+    ``{"levels": {"engine.mouse": "DEBUG"}}`` changes subsystem levels (null
+    resets one) and ``{"level": "WARNING"}`` the app level. Changes go through
+    engine.apply_config() so an isolated engine process follows them too.
+    """
+    section = dict(config.get('logging', {}))
+    if 'levels' in params:
+        levels = dict(section.get('levels', {}))
+        for subsystem, level in params['levels'].items():
+            if level in (None, ''):
+                levels.pop(subsystem, None)
+            else:
+                log_config.parse_level(level)
+                levels[subsystem] = level
+        section['levels'] = levels
+    if 'level' in params:
+        log_config.parse_level(params['level'])
+        section['level'] = params['level']
+    if 'levels' in params or 'level' in params:
+        engine.apply_config({'logging': section})
+    return log_config.current_levels()
+
+def profiler_handlers(profiler):
+    """Control methods for starting and stopping the sampling profiler"""
+    def profile_start(params):
+        profiler.start(duration=params.get('duration', 30), interval=params.get('interval', 0.005))
+        return profiler.status()
+    def profile_stop(params):
+        profiler.stop()
+        return profiler.status()
+    return {
+        'profile_start': profile_start,
+        'profile_stop': profile_stop,
+        'profile_status': lambda params: profiler.status(),
+    }
+
+def send_command(method, params=None, path=None, timeout=10):
+    """Send one request to a running instance and return its ``result``"""
+    path = path or default_socket_path()
+    request = {'id': 1, 'method': method, 'params': params or {}}
+    if HAS_UNIX_SOCKETS:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        address = path
+    else:
+        with open(_port_file(path)) as f:
+            port, token = f.read().split()
+        request['token'] = token
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        address = ('127.0.0.1', int(port))
+    sock.settimeout(timeout)
+    with sock:
+        sock.connect(address)
+        sock.sendall(json.dumps(request).encode('utf-8') + b"\n")
+        with sock.makefile('rb') as f:
+            response = json.loads(f.readline())
+    if 'error' in response:
+        raise RuntimeError(response['error']['message'])
+    return response.get('result')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Send a command to a running instance.")
+    parser.add_argument('method', help="start, stop, pause, resume, status, reload_config, metrics, ...")
+    parser.add_argument('--params', default='{}', help="JSON object with method parameters")
+    parser.add_argument('--socket', default=None, help="Control socket path")
+    args = parser.parse_args(argv)
+    try:
+        result = send_command(args.method, json.loads(args.params), path=args.socket)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""Global hotkeys through one keyboard hook.
+
+Every keyboard.add_hotkey() or on_press_key() registration adds a handler
+that the ``keyboard`` module runs on every keystroke system-wide.
+HotkeyDispatcher installs a single hook instead. It tracks the held
+modifiers as a bit mask and matches a key-down with one dict lookup on
+(mask, key), so the work per keystroke does not grow with the number of
+bindings. Callbacks never run on the hook thread: they go to ``runner``
+(the Tk loop in the GUI) or to a "hotkeys" worker thread.
+
+A key-up the hook never sees (released on the lock screen, or while
+another hook swallowed it) would leave the key held for good. A key-down
+for a held key more than REPEAT_GAP after the last one is therefore a new
+press rather than auto-repeat, and reset() forgets every held key; the GUI
+calls it when its window loses focus.
+"""
+import queue
+import threading
+import time
+
+try:
+    import keyboard  # type: ignore
+except ImportError:
+    keyboard = None
+
+from logic import log_config
+
+MODIFIERS = {'ctrl': 1, 'shift': 2, 'alt': 4, 'windows': 8}
+
+# Names the keyboard module reports for either side of a modifier
+ALIASES = {
+    'control': 'ctrl', 'left ctrl': 'ctrl', 'right ctrl': 'ctrl',
+    'left shift': 'shift', 'right shift': 'shift',
+    'left alt': 'alt', 'right alt': 'alt', 'alt gr': 'alt', 'option': 'alt',
+    'win': 'windows', 'left windows': 'windows', 'right windows': 'windows',
+    'command': 'windows', 'cmd': 'windows', 'super': 'windows',
+}
+
+# Auto-repeat sends key-downs at most ~1 s apart (the longest initial delay)
+REPEAT_GAP = 1.5
+
+# Shifted symbols (US layout) back to their key, so 'ctrl+shift+`' matches a '~' event
+SHIFTED = dict(zip('~!@#$%^&*()_+{}|:"<>?', '`1234567890-=[]\\;\',./'))
+
+def normalize_key(name):
+    name = (name or '').lower()
+    return ALIASES.get(name, SHIFTED.get(name, name))
+
+def parse_chord(chord, any_modifiers=False):
+    """'ctrl+shift+p' -> (modifier mask, key); exactly one non-modifier key.
+
+    With ``any_modifiers`` the chord is a bare key and the mask is None, so
+    it matches whatever modifiers are held.
+    """
+    mask, key = 0, None
+    for part in chord.split('+'):
+        name = normalize_key(part.strip())
+        if name in MODIFIERS:
+            mask |= MODIFIERS[name]
+        elif key is None and name:
+            key = name
+        else:
+            raise ValueError(f"invalid hotkey: {chord!r}")
+    if key is None:
+        raise ValueError(f"hotkey has no key: {chord!r}")
+    if any_modifiers:
+        if mask:
+            raise ValueError(f"hotkey for any modifiers has modifiers: {chord!r}")
+        mask = None
+    return mask, key
+
+class HotkeyDispatcher:
+    """Owns the process's only keyboard hook and maps chords to callbacks.
+
+    The hook is installed only while enabled with at least one binding.
+    ``runner(func)`` schedules a callback elsewhere (``root.after(0, func)``
+    in the GUI); without one, callbacks run on a worker thread.
+    """
+    def __init__(self, runner=None, logger=None, backend=None):
+        self.runner = runner
+        self.logger = logger or log_config.get_logger("hotkeys")
+        self.backend = keyboard if backend is None else backend
+        self.lock = threading.Lock()
+        self.table = {}
+        self.names = {}
+        self.enabled = True
+        self.hook = None
+        self.mask = 0
+        self.down = {}  # held key -> monotonic time of its last key-down
+        self.queue = None
+        self.worker = None
+        self.events = 0
+        self.matches = 0
+
+    def bind(self, chord, callback, any_modifiers=False):
+        """Run callback() when ``chord`` is pressed; replaces an existing binding for it.
+
+        ``any_modifiers`` binds a bare key whatever modifiers are held, as
+        keyboard.on_press_key() did.
+        """
+        combo = parse_chord(chord, any_modifiers)
+        with self.lock:
+            # Copy on write: the hook reads self.table without taking the lock
+            table = dict(self.table)
+            table[combo] = callback
+            self.table = table
+            self.names[combo] = chord
+        self._update_hook()
+        return combo
+
+    def unbind(self, chord, any_modifiers=False):
+        combo = parse_chord(chord, any_modifiers)
+        with self.lock:
+            table = dict(self.table)
+            table.pop(combo, None)
+            self.table = table
+            self.names.pop(combo, None)
+        self._update_hook()
+
+    def set_enabled(self, enabled):
+        self.enabled = bool(enabled)
+        self._update_hook()
+
+    def _update_hook(self):
+        with self.lock:
+            wanted = self.enabled and bool(self.table)
+            if wanted and self.hook is None:
+                if self.backend is None:
+                    self.logger.warning("keyboard module not installed. Global hotkeys are disabled.")
+                    self.enabled = False
+                    return
+                try:
+                    self.hook = self.backend.hook(self.on_event)
+                except Exception as e:
+                    self.logger.warning("Failed to install the hotkey hook: %s", e)
+            elif not wanted and self.hook is not None:
+                try:
+                    self.backend.unhook(self.hook)
+                except Exception:
+                    pass
+                self.hook = None
+                self.reset()
+
+    def reset(self):
+        """Forget the held keys, e.g. when key-ups may have been missed"""
+        self.mask = 0
+        self.down.clear()
+
+    def on_event(self, event):
+        """Hook callback: constant work per keystroke"""
+        self.events += 1
+        name = normalize_key(event.name)
+        bit = MODIFIERS.get(name, 0)
+        if event.event_type == 'up':
+            self.mask &= ~bit
+            self.down.pop(name, None)
+            return
+        now = time.monotonic()
+        last = self.down.get(name)
+        self.down[name] = now
+        if last is not None and now - last < REPEAT_GAP:
+            return  # auto-repeat while held
+        if bit:
+            self.mask |= bit
+            return
+        table = self.table
+        callback = table.get((self.mask, name))
+        if callback is not None:
+            self.matches += 1
+            self._dispatch(callback)
+        callback = table.get((None, name))
+        if callback is not None:
+            self.matches += 1
+            self._dispatch(callback)
+
+    def _dispatch(self, callback):
+        if self.runner is not None:
+            try:
+                self.runner(lambda: self._call(callback))
+            except RuntimeError:
+                pass  # Tk is shutting down
+            return
+        if self.worker is None:
+            self.queue = queue.SimpleQueue()
+            self.worker = threading.Thread(target=self._work, name="hotkeys", daemon=True)
+            self.worker.start()
+        self.queue.put(callback)
+
+    def _call(self, callback):
+        try:
+            callback()
+        except Exception as e:
+            self.logger.error("Hotkey handler %s failed: %s", getattr(callback, '__name__', callback), e)
+
+    def _work(self):
+        while True:
+            callback = self.queue.get()
+            if callback is None:
+                return
+            self._call(callback)
+
+    def stop(self):
+        """Remove the hook and end the worker thread"""
+        self.enabled = False
+        self._update_hook()
+        if self.worker is not None:
+            self.queue.put(None)
+            self.worker = None
+
+    def status(self):
+        return {'enabled': self.enabled, 'hooked': self.hook is not None, 'bindings': sorted(self.names.values()),
+                'events': self.events, 'matches': self.matches}
@@ -0,0 +1,195 @@
+"""User idle detection for auto-restart.
+
+An idle source reports seconds since the last real user input:
+
+- SystemIdleSource asks the OS (GetLastInputInfo on Windows, the
+  XScreenSaver extension on X11).
+- ActivityIdleSource is a timestamp the activity listeners update, used
+  where the OS cannot be asked.
+- FakeIdleSource is driven by hand, for headless runs and checks.
+
+The OS counts injected input too, so the detector is only meant to run while
+the engine is stopped. IdleDetector does not poll on a fixed beat: while the
+user is active its TimerService job waits until the idle threshold could
+first be reached, and while idle it checks once a second for the user
+coming back.
+"""
+import ctypes
+import ctypes.util
+import sys
+
+from logic import log_config
+from simulation.clock import REAL_CLOCK
+
+# Never poll more often than this
+POLL_INTERVAL = 1.0
+
+class FakeIdleSource:
+    """Idle time under manual control, measured on ``clock``"""
+    def __init__(self, clock=None):
+        self.clock = clock or REAL_CLOCK
+        self.last_input = self.clock.monotonic()
+
+    def note_input(self):
+        self.last_input = self.clock.monotonic()
+
+    def set_idle(self, seconds):
+        self.last_input = self.clock.monotonic() - seconds
+
+    def idle_seconds(self):
+        return self.clock.monotonic() - self.last_input
+
+class ActivityIdleSource(FakeIdleSource):
+    """Idle time since the activity listeners last called note_input()"""
+
+class _LastInputInfo(ctypes.Structure):
+    _fields_ = [('cbSize', ctypes.c_uint), ('dwTime', ctypes.c_uint)]
+
+class _XScreenSaverInfo(ctypes.Structure):
+    _fields_ = [('window', ctypes.c_ulong), ('state', ctypes.c_int), ('kind', ctypes.c_int),
+                ('til_or_since', ctypes.c_ulong), ('idle', ctypes.c_ulong), ('eventMask', ctypes.c_ulong)]
+
+class SystemIdleSource:
+    """OS-wide idle time; raises OSError from the constructor where unsupported"""
+    def __init__(self):
+        if sys.platform == 'win32':
+            self._query = self._windows_query()
+        else:
+            self._query = self._x11_query()
+        self._query()  # fail now rather than on the first poll
+
+    @staticmethod
+    def _windows_query():
+        user32, kernel32 = ctypes.windll.user32, ctypes.windll.kernel32  # type: ignore[attr-defined]
+        info = _LastInputInfo(cbSize=ctypes.sizeof(_LastInputInfo))
+        def query():
+            if not user32.GetLastInputInfo(ctypes.byref(info)):
+                raise OSError("GetLastInputInfo failed")
+            # Both counters are 32-bit milliseconds and wrap after 49.7 days
+            return ((kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF) / 1000
+        return query
+
+    @staticmethod
+    def _x11_query():
+        x11_path, xss_path = ctypes.util.find_library('X11'), ctypes.util.find_library('Xss')
+        if not x11_path or not xss_path:
+            raise OSError("libX11/libXss not available")
+        x11, xss = ctypes.CDLL(x11_path), ctypes.CDLL(xss_path)
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        x11.XDefaultRootWindow.restype = ctypes.c_ulong
+        xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(_XScreenSaverInfo)
+        xss.XScreenSaverQueryInfo.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XScreenSaverInfo)]
+        display = x11.XOpenDisplay(None)
+        if not display:
+            raise OSError("cannot open X display")
+        root = x11.XDefaultRootWindow(display)
+        info = xss.XScreenSaverAllocInfo()
+        def query():
+            if not xss.XScreenSaverQueryInfo(display, root, info):
+                raise OSError("XScreenSaver extension not available")
+            return info.contents.idle / 1000
+        return query
+
+    def idle_seconds(self):
+        return self._query()
+
+def default_idle_source(fallback, logger=None):
+    """The OS idle source if it works here, otherwise ``fallback``"""
+    try:
+        return SystemIdleSource()
+    except Exception as e:
+        (logger or log_config.get_logger("activity")).info(
+            "OS idle time unavailable (%s); using activity listener timestamps.", e)
+        return fallback
+
+class IdleDetector:
+    """Calls ``on_idle()`` after ``threshold`` seconds without input and
+    ``on_active()`` once input has lasted ``hysteresis`` seconds.
+
+    The hysteresis keeps a single bumped mouse or key from ending an idle
+    period. Polls (and callbacks) run on the ``timers`` thread.
+    """
+    def __init__(self, source, threshold, timers, hysteresis=5.0, on_idle=None, on_active=None, clock=None,
+                 logger=None):
+        self.source = source
+        self.timers = timers
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self.on_idle = on_idle
+        self.on_active = on_active
+        self.clock = clock or REAL_CLOCK
+        self.logger = logger or log_config.get_logger("activity")
+        self.job = None
+        self.running = False
+        self.idle = False
+        self.activity_since = None
+        self.polls = 0
+
+    def configure(self, threshold=None, hysteresis=None):
+        """Change the thresholds; a sleeping detector re-checks at once"""
+        if threshold is not None:
+            self.threshold = threshold
+        if hysteresis is not None:
+            self.hysteresis = hysteresis
+        if self.running:
+            self._arm(0)
+
+    def start(self):
+        """Start watching from the active state; no-op if already running"""
+        if self.running:
+            return
+        self.idle = False
+        self.activity_since = None
+        self.running = True
+        self._arm(0)
+
+    def stop(self):
+        self.running = False
+        self.timers.cancel(self.job)
+        self.job = None
+
+    def _arm(self, delay):
+        self.timers.cancel(self.job)
+        # Long waits may run a little late so they share a wakeup with other jobs
+        self.job = self.timers.call_later(delay, self._tick, tolerance=min(max(delay / 10, POLL_INTERVAL), 10.0))
+
+    def poll(self):
+        """Check the source once and return the seconds until the next check"""
+        self.polls += 1
+        idle_seconds = self.source.idle_seconds()
+        now = self.clock.monotonic()
+        if not self.idle:
+            if idle_seconds < self.threshold:
+                # Idle time cannot reach the threshold any sooner than this
+                return max(POLL_INTERVAL, self.threshold - idle_seconds)
+            self.idle = True
+            self.activity_since = None
+            self.logger.info("User idle for %.1f min.", idle_seconds / 60)
+            if self.on_idle:
+                self.on_idle()
+            return POLL_INTERVAL
+        if idle_seconds >= POLL_INTERVAL * 1.5:
+            self.activity_since = None  # no input since the last check
+            return POLL_INTERVAL
+        if self.activity_since is None:
+            self.activity_since = now - idle_seconds
+        if now - self.activity_since >= self.hysteresis:
+            self.idle = False
+            self.activity_since = None
+            self.logger.info("User active again.")
+            if self.on_active:
+                self.on_active()
+            return max(POLL_INTERVAL, self.threshold)
+        return POLL_INTERVAL
+
+    def _tick(self):
+        if not self.running:
+            return
+        try:
+            delay = self.poll()
+        except Exception as e:
+            self.logger.error("Idle check failed: %s", e)
+            delay = 60.0
+        if self.running:  # on_idle may have stopped us
+            self._arm(delay)
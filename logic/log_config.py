@@ -0,0 +1,61 @@
+"""Per-subsystem loggers and their runtime levels.
+
+Every subsystem logs to a child of the "android_studio" logger, so records
+still reach the log file and the Log tab. Each child has its own level:
+
+    "logging": {"level": "INFO", "levels": {"engine.mouse": "DEBUG", "activity": "WARNING"}}
+
+Log calls pass their values as arguments ("%s") instead of f-strings, so a
+statement below its logger's level costs one isEnabledFor() check and
+formats nothing. Per-action and per-round chatter is logged at DEBUG.
+"""
+import logging
+
+ROOT = "android_studio"
+
+# Log file lines carry the logger name, e.g. "android_studio.engine.mouse"
+FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+
+SUBSYSTEMS = (
+    'engine', 'engine.mouse', 'engine.scroll', 'engine.keyboard', 'engine.browser',
+    'activity', 'tray', 'config', 'schedule', 'hotkeys', 'timers', 'governor', 'history', 'control',
+    'profiler',
+)
+
+def get_logger(subsystem=None):
+    """The logger for ``subsystem`` (e.g. 'engine.mouse'), or the app logger"""
+    return logging.getLogger(f"{ROOT}.{subsystem}" if subsystem else ROOT)
+
+def parse_level(level):
+    """'debug', 'INFO' or 10 -> a logging level number"""
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).upper())
+    if not isinstance(value, int):
+        raise ValueError(f"unknown log level: {level}")
+    return value
+
+def set_levels(levels):
+    """Set {subsystem: level} now; None or '' resets a subsystem to inherit its parent's level"""
+    for subsystem, level in levels.items():
+        get_logger(subsystem or None).setLevel(logging.NOTSET if level in (None, '') else parse_level(level))
+    return current_levels()
+
+def apply_config(config):
+    """Apply the 'logging' section; subsystems it does not list inherit the app level again"""
+    section = (config or {}).get('logging', {})
+    levels = {subsystem: None for subsystem in SUBSYSTEMS}
+    levels.update(section.get('levels', {}))
+    levels[''] = section.get('level', 'INFO')
+    try:
+        return set_levels(levels)
+    except ValueError as e:
+        get_logger('config').error("Invalid logging section: %s", e)
+        return current_levels()
+
+def current_levels():
+    """Effective level name of the app logger and every subsystem"""
+    levels = {'': logging.getLevelName(get_logger().getEffectiveLevel())}
+    for subsystem in SUBSYSTEMS:
+        levels[subsystem] = logging.getLevelName(get_logger(subsystem).getEffectiveLevel())
+    return levels
@@ -0,0 +1,136 @@
+"""Line index over a growing log file.
+
+LogIndex records where each line of anoid.log starts and its level, reading
+only the bytes appended since the last refresh(). The Log tab then reads
+just the lines it shows, and filters by level or text without loading the
+file: the level filter runs over one byte per line, the text filter is a
+regex search over the file read in chunks. The file is only open while it
+is being read, so the log handler can still truncate or rotate it (Windows
+refuses both while a handle or mapping is open). A file that shrinks or is
+replaced (cleared or rotated) is indexed again from the start.
+
+Lines are expected in log_config.FORMAT ("<asctime> - LEVEL - ..."); lines
+that are not, such as traceback lines, take the level of the line before.
+"""
+import itertools
+import os
+import re
+from array import array
+from bisect import bisect_right
+
+# First letter of the level name -> level number
+LEVEL_CODES = {ord('D'): 10, ord('I'): 20, ord('W'): 30, ord('E'): 40, ord('C'): 50}
+
+# "2026-01-01 12:00:00,000" is 23 bytes, then " - " and the level name
+LEVEL_AT = 23
+
+# Bytes indexed per refresh() call, so a large file is indexed in steps
+CHUNK = 8 << 20
+
+class LogIndex:
+    """Line offsets and levels of a growing log file"""
+    def __init__(self, path):
+        self.path = path
+        self.reset()
+
+    def reset(self):
+        self.starts = array('Q', [0])  # start of every line, then the end of the last complete one
+        self.levels = bytearray()
+        self.indexed = 0
+        self.identity = None  # (device, inode) of the indexed file
+
+    def close(self):
+        """Nothing stays open between reads; kept for callers that close the index on exit"""
+
+    def __len__(self):
+        return len(self.levels)
+
+    def refresh(self, budget=CHUNK):
+        """Index up to ``budget`` new bytes; returns True while more remain"""
+        try:
+            with open(self.path, 'rb') as file:
+                stat = os.fstat(file.fileno())
+                identity = (stat.st_dev, stat.st_ino)
+                if stat.st_size < self.indexed or identity != self.identity:
+                    self.reset()  # cleared, or rotated to a new file
+                    self.identity = identity
+                if stat.st_size == 0:
+                    return False
+                base = self.indexed
+                file.seek(base)
+                data = file.read(min(stat.st_size, base + budget) - base)
+        except OSError:
+            self.reset()
+            return False
+        self._scan(data, base)
+        return base + len(data) < stat.st_size
+
+    def _scan(self, data, base):
+        """Index the complete lines of ``data``, which starts at file offset ``base``"""
+        starts, levels = self.starts, self.levels
+        level = levels[-1] if levels else 20
+        find = data.find
+        pos = 0
+        while True:
+            newline = find(b'\n', pos)
+            if newline < 0:
+                break
+            head = data[pos + LEVEL_AT:pos + LEVEL_AT + 4]
+            if head[:3] == b' - ':
+                level = LEVEL_CODES.get(head[3], level)
+            levels.append(level)
+            pos = newline + 1
+            starts.append(base + pos)
+        self.indexed = starts[-1]
+
+    def line(self, number):
+        return self.lines((number,))[0]
+
+    def lines(self, numbers):
+        """Text of the given lines, read with one open of the file"""
+        starts, texts = self.starts, []
+        try:
+            with open(self.path, 'rb') as file:
+                for number in numbers:
+                    file.seek(starts[number])
+                    data = file.read(starts[number + 1] - starts[number])
+                    texts.append(data.decode('utf-8', 'replace').rstrip('\r\n'))
+        except OSError:
+            pass  # gone since the last refresh(), which will reset the index
+        return texts
+
+    def select(self, min_level=0, text=None, start=0):
+        """Numbers of the lines from ``start`` on at or above ``min_level`` that contain ``text`` (any case)"""
+        count = len(self.levels)
+        if start >= count:
+            return array('L')
+        wanted = self.levels[start:].translate(bytes(int(level >= min_level) for level in range(256)))
+        lines = itertools.compress(range(start, count), wanted)
+        if text:
+            lines = (number for number in self._search(text, start) if wanted[number - start])
+        return array('L', lines)
+
+    def _search(self, text, start):
+        pattern = re.compile(re.escape(text.encode('utf-8')), re.IGNORECASE)
+        starts, count = self.starts, len(self.levels)
+        first = start
+        try:
+            file = open(self.path, 'rb')
+        except OSError:
+            return
+        with file:
+            file.seek(starts[first])
+            while first < count:
+                # Whole lines of about CHUNK bytes, so no match spans two reads
+                last = max(first + 1, bisect_right(starts, starts[first] + CHUNK, first, count + 1) - 1)
+                base = starts[first]
+                data = file.read(starts[last] - base)
+                pos = 0
+                while True:
+                    match = pattern.search(data, pos)
+                    if match is None:
+                        break
+                    number = bisect_right(starts, base + match.start(), first, last) - 1
+                    yield number
+                    pos = starts[number + 1] - base  # one hit per line
+                first = last
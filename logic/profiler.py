@@ -0,0 +1,134 @@
+"""On-demand sampling profiler covering every thread in the process.
+
+While running, a single background thread samples ``sys._current_frames()``
+at a fixed interval. When the window ends (or ``stop()`` is called) the
+samples are written to the output directory as:
+
+    profile-<timestamp>.collapsed   one "thread;frame;frame count" per line,
+                                    ready for flamegraph.pl / speedscope
+    profile-<timestamp>.pstats      loadable with ``pstats.Stats(path)``
+
+Nothing is installed or running while the profiler is idle.
+"""
+import marshal
+import os
+import sys
+import threading
+import time
+
+from logic import log_config
+
+MAX_DURATION = 600
+
+def _frame_key(frame):
+    code = frame.f_code
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+class SamplingProfiler:
+    def __init__(self, output_dir, logger=None):
+        self.output_dir = output_dir
+        self.logger = logger or log_config.get_logger("profiler")
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.interval = 0.005
+        self.duration = 0
+        self.started_at = None
+        self.samples = 0
+        self.stacks = {}
+        self.last_output = None
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, duration=30, interval=0.005):
+        """Sample all threads for ``duration`` seconds; returns False if already running"""
+        if self.running:
+            return False
+        self.duration = max(1, min(float(duration), MAX_DURATION))
+        self.interval = max(0.001, float(interval))
+        self.stacks = {}
+        self.samples = 0
+        self.started_at = time.time()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self.thread.start()
+        self.logger.info("Profiler started for %.0f s.", self.duration)
+        return True
+
+    def stop(self):
+        """End the window early; the result is written by the sampler thread"""
+        if not self.running:
+            return False
+        self.stop_event.set()
+        self.thread.join(timeout=5)
+        return True
+
+    def status(self):
+        return {
+            'running': self.running,
+            'samples': self.samples,
+            'elapsed_seconds': time.time() - self.started_at if self.running else 0,
+            'duration_seconds': self.duration,
+            'last_output': self.last_output,
+        }
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        deadline = time.monotonic() + self.duration
+        while not self.stop_event.wait(self.interval) and time.monotonic() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_key(frame))
+                    frame = frame.f_back
+                stack.reverse()
+                key = (names.get(ident, f"thread-{ident}"), tuple(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+        try:
+            self.last_output = self._write()
+            self.logger.info("Profiler wrote %s.collapsed / .pstats (%d samples).", self.last_output, self.samples)
+        except Exception as e:
+            self.logger.error("Failed to write profile: %s", e)
+
+    def _write(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, time.strftime("profile-%Y%m%d-%H%M%S", time.localtime(self.started_at)))
+        with open(base + ".collapsed", 'w', encoding='utf-8') as f:
+            for (thread_name, stack), count in sorted(self.stacks.items()):
+                frames = [thread_name] + [f"{name} ({os.path.basename(filename)}:{line})" for filename, line, name in stack]
+                f.write(";".join(frames) + f" {count}\n")
+        with open(base + ".pstats", 'wb') as f:
+            marshal.dump(self._pstats(), f)
+        return base
+
+    def _pstats(self):
+        """Convert samples to the dict layout pstats.Stats loads from disk"""
+        stats = {}
+        def entry(func):
+            if func not in stats:
+                stats[func] = [0, 0, 0.0, 0.0, {}]
+            return stats[func]
+        for (_, stack), count in self.stacks.items():
+            seconds = count * self.interval
+            seen = set()
+            for i, func in enumerate(stack):
+                row = entry(func)
+                if func not in seen:
+                    # Count each function once per stack for cumulative time
+                    seen.add(func)
+                    row[0] += count
+                    row[1] += count
+                    row[3] += seconds
+                    if i > 0:
+                        caller = stack[i - 1]
+                        cc, nc, tt, ct = row[4].get(caller, (0, 0, 0.0, 0.0))
+                        row[4][caller] = (cc + count, nc + count, tt, ct + seconds)
+            leaf = entry(stack[-1]) if stack else None
+            if leaf is not None:
+                leaf[2] += seconds
+        return {func: (cc, nc, tt, ct, callers) for func, (cc, nc, tt, ct, callers) in stats.items()}
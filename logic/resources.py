@@ -1,22 +1,179 @@
-import psutil
 import os
+import threading
+import time
+
+try:
+    import psutil  # type: ignore
+except ImportError:
+    psutil = None
+
+class UsageSampler:
+    """Process CPU, RAM, and (if available) GPU usage for one consumer.
+
+    CPU is measured since this sampler's previous sample() (0.0 on the first),
+    so it never blocks. Each consumer needs its own sampler: two sharing one
+    would each see only the time since the other's last read.
+    """
+    def __init__(self):
+        self.process = None
+
+    def sample(self):
+        if self.process is None or self.process.pid != os.getpid():
+            self.process = psutil.Process(os.getpid())
+        mem_info = self.process.memory_info()
+        cpu_percent = self.process.cpu_percent(interval=None)
+        ram_mb = mem_info.rss / (1024 * 1024)
+        gpu_usage = None
+        try:
+            import GPUtil  # type: ignore
+            gpus = GPUtil.getGPUs()
+            if gpus:
+                gpu_usage = gpus[0].load * 100  # percent
+        except Exception:
+            gpu_usage = None
+        return {
+            'cpu_percent': cpu_percent,
+            'ram_mb': ram_mb,
+            'gpu_percent': gpu_usage
+        }
+
+_sampler = UsageSampler()
 
 def get_resource_usage():
-    """Return a dict with current process CPU, RAM, and (if available) GPU usage."""
-    process = psutil.Process(os.getpid())
-    mem_info = process.memory_info()
-    cpu_percent = process.cpu_percent(interval=0.1)
-    ram_mb = mem_info.rss / (1024 * 1024)
-    gpu_usage = None
+    """One-off usage reading; CPU covers the time since the previous call.
+    Periodic consumers should keep their own UsageSampler instead."""
+    return _sampler.sample()
+
+def get_process_footprint():
+    """Return current RSS (MB) and OS thread count without sampling CPU.
+
+    Works without psutil on Linux by reading /proc, so the headless daemon
+    can report its footprint on minimal installs.
+    """
+    if psutil is not None:
+        process = psutil.Process(os.getpid())
+        return {'ram_mb': process.memory_info().rss / (1024 * 1024), 'threads': process.num_threads()}
+    ram_mb = 0.0
+    threads = threading.active_count()
     try:
-        import GPUtil  # type: ignore
-        gpus = GPUtil.getGPUs()
-        if gpus:
-            gpu_usage = gpus[0].load * 100  # percent
-    except Exception:
-        gpu_usage = None
-    return {
-        'cpu_percent': cpu_percent,
-        'ram_mb': ram_mb,
-        'gpu_percent': gpu_usage
-    }
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    ram_mb = int(line.split()[1]) / 1024
+                elif line.startswith('Threads:'):
+                    threads = int(line.split()[1])
+    except OSError:
+        pass
+    return {'ram_mb': ram_mb, 'threads': threads}
+
+class ProcessSampler:
+    """Process CPU% (of one core) and RSS between successive sample() calls.
+
+    Uses os.times() deltas, so unlike get_resource_usage() it never blocks
+    and needs no psutil.
+    """
+    def __init__(self):
+        self.last_cpu = self._cpu_seconds()
+        self.last_time = time.monotonic()
+
+    @staticmethod
+    def _cpu_seconds():
+        times = os.times()
+        return times.user + times.system
+
+    def sample(self):
+        cpu, now = self._cpu_seconds(), time.monotonic()
+        elapsed = now - self.last_time
+        cpu_percent = (cpu - self.last_cpu) / elapsed * 100 if elapsed > 0 else 0.0
+        self.last_cpu, self.last_time = cpu, now
+        return {'cpu_percent': cpu_percent, 'ram_mb': get_process_footprint()['ram_mb']}
+
+def thread_names():
+    """Map OS thread ids to Python thread names, labelling library threads we did not name"""
+    names = {}
+    for thread in threading.enumerate():
+        if thread.native_id is None:
+            continue
+        name = thread.name
+        module = getattr(getattr(thread, '_target', None), '__module__', None) or ''
+        if thread is threading.main_thread():
+            name = "tk-main"
+        elif module.startswith('keyboard'):
+            name = "keyboard-hook"
+        names[thread.native_id] = name
+    return names
+
+def get_thread_times():
+    """Return {tid: (cpu_seconds, voluntary_switches)} for every OS thread of this process.
+
+    Reads /proc on Linux (context switches included); elsewhere uses psutil,
+    which has no per-thread switch counts (None).
+    """
+    times = {}
+    if os.path.isdir('/proc/self/task'):
+        ticks = os.sysconf('SC_CLK_TCK')
+        for tid in os.listdir('/proc/self/task'):
+            try:
+                with open(f'/proc/self/task/{tid}/stat') as f:
+                    fields = f.read().rsplit(')', 1)[1].split()
+                switches = None
+                with open(f'/proc/self/task/{tid}/status') as f:
+                    for line in f:
+                        if line.startswith('voluntary_ctxt_switches:'):
+                            switches = int(line.split()[1])
+                            break
+            except (OSError, IndexError, ValueError):
+                continue  # the thread exited while we looked
+            # utime and stime are fields 14 and 15 of stat, counted after the ')' of the name
+            times[int(tid)] = ((int(fields[11]) + int(fields[12])) / ticks, switches)
+    elif psutil is not None:
+        for thread in psutil.Process(os.getpid()).threads():
+            times[thread.id] = (thread.user_time + thread.system_time, None)
+    return times
+
+class ThreadSampler:
+    """Per-thread CPU% and wakeups/s (voluntary context switches) between sample() calls.
+
+    Without /proc there are no per-thread switch counts; ``process_wakeups_per_sec``
+    then comes from psutil's process-wide count (None without psutil).
+    """
+    def __init__(self):
+        self.process = psutil.Process(os.getpid()) if psutil is not None else None
+        self.last = get_thread_times()
+        self.last_switches = self._process_switches()
+        self.last_time = time.monotonic()
+        self.process_wakeups_per_sec = None
+
+    def _process_switches(self):
+        if self.process is None:
+            return None
+        try:
+            return self.process.num_ctx_switches().voluntary
+        except Exception:
+            return None
+
+    def sample(self):
+        """Rows of {name, tid, cpu_percent, cpu_seconds, wakeups_per_sec}, busiest first"""
+        current, now = get_thread_times(), time.monotonic()
+        elapsed = max(now - self.last_time, 1e-9)
+        names = thread_names()
+        rows = []
+        for tid, (cpu, switches) in current.items():
+            last_cpu, last_switches = self.last.get(tid, (0.0, 0))  # new threads count from zero
+            wakeups = None
+            if switches is not None and last_switches is not None:
+                wakeups = (switches - last_switches) / elapsed
+            rows.append({'name': names.get(tid, f"native-{tid}"), 'tid': tid,
+                         'cpu_percent': (cpu - last_cpu) / elapsed * 100, 'cpu_seconds': cpu,
+                         'wakeups_per_sec': wakeups})
+        rates = [row['wakeups_per_sec'] for row in rows if row['wakeups_per_sec'] is not None]
+        if rates:
+            self.process_wakeups_per_sec = sum(rates)
+        else:
+            switches = self._process_switches()
+            self.process_wakeups_per_sec = (switches - self.last_switches) / elapsed \
+                if switches is not None and self.last_switches is not None else None
+            self.last_switches = switches
+        self.last, self.last_time = current, now
+        rows.sort(key=lambda row: (-row['cpu_percent'], -(row['wakeups_per_sec'] or 0), row['name']))
+        return rows
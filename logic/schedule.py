@@ -0,0 +1,206 @@
+"""Weekly activity windows that start and stop the engine.
+
+Windows come from the 'schedule' config section, for example::
+
+    "schedule": {"enabled": true, "windows": [
+        {"days": "mon-fri", "start": "09:00", "end": "12:30"},
+        {"days": "mon-fri", "start": "13:30", "end": "18:00"}]}
+
+``days`` is 'daily', a range ('mon-fri') or a list ('sat,sun'); a window
+whose end is before its start runs past midnight. ScheduleRunner arms one
+job on the app's TimerService for the next transition, so there are no
+wakeups inside or between windows. The desired state is always recomputed
+from the wall clock when it wakes, so clock changes and suspend/resume
+cannot leave the engine in the wrong state for longer than MAX_SLEEP.
+"""
+import threading
+from datetime import datetime, timedelta
+
+from logic import log_config
+from simulation.clock import REAL_CLOCK
+
+DAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+MINUTES_PER_WEEK = 7 * 24 * 60
+
+# Upper bound on one sleep, so a wall-clock jump we cannot observe is corrected within this time
+MAX_SLEEP = 3600.0
+
+def parse_days(spec):
+    """'daily', 'mon-fri' or 'sat,sun' (or a list) -> sorted weekday numbers (Monday is 0)"""
+    if isinstance(spec, (list, tuple)):
+        spec = ",".join(spec)
+    spec = str(spec).strip().lower()
+    if spec in ('', 'daily', '*', 'all'):
+        return list(range(7))
+    days = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if '-' in part:
+            first, last = (DAYS.index(p.strip()[:3]) for p in part.split('-', 1))
+            day = first
+            days.add(day)
+            while day != last:
+                day = (day + 1) % 7
+                days.add(day)
+        elif part:
+            days.add(DAYS.index(part[:3]))
+    return sorted(days)
+
+def parse_time(text):
+    """'HH:MM' -> minutes after midnight ('24:00' is allowed as an end)"""
+    hours, minutes = str(text).split(':')
+    value = int(hours) * 60 + int(minutes)
+    if not 0 <= value <= 24 * 60:
+        raise ValueError(f"time out of range: {text}")
+    return value
+
+class WeeklySchedule:
+    """Merged weekly intervals in minutes since Monday 00:00"""
+    def __init__(self, windows):
+        intervals = []
+        for window in windows:
+            start = parse_time(window.get('start', '00:00'))
+            end = parse_time(window.get('end', '24:00'))
+            length = (end - start) % (24 * 60) or 24 * 60
+            for day in parse_days(window.get('days', 'daily')):
+                begin = day * 24 * 60 + start
+                intervals.append((begin, begin + length))
+        # Unroll past the end of the week, then merge overlaps
+        unrolled = []
+        for begin, end in intervals:
+            if end > MINUTES_PER_WEEK:
+                unrolled.append((begin, MINUTES_PER_WEEK))
+                unrolled.append((0, end - MINUTES_PER_WEEK))
+            else:
+                unrolled.append((begin, end))
+        merged = []
+        for begin, end in sorted(unrolled):
+            if merged and begin <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((begin, end))
+        self.intervals = merged
+
+    @staticmethod
+    def _minute_of_week(moment):
+        return moment.weekday() * 24 * 60 + moment.hour * 60 + moment.minute + moment.second / 60
+
+    def is_active(self, moment):
+        minute = self._minute_of_week(moment)
+        return any(begin <= minute < end for begin, end in self.intervals)
+
+    def next_transition(self, moment):
+        """Local datetime of the next window start or end after ``moment`` (None if never)"""
+        boundaries = {b % MINUTES_PER_WEEK for interval in self.intervals for b in interval}
+        if self.intervals and self.intervals[0][0] == 0 and self.intervals[-1][1] == MINUTES_PER_WEEK:
+            boundaries.discard(0)  # the window continues across the week wrap
+        if not boundaries:
+            return None
+        boundaries = sorted(boundaries)
+        minute = self._minute_of_week(moment)
+        whole = int(minute)
+        ahead = [b - whole for b in boundaries if b > minute]
+        delta = min(ahead) if ahead else boundaries[0] + MINUTES_PER_WEEK - whole
+        # Naive local arithmetic: the result is the wall-clock time, DST included
+        return moment.replace(second=0, microsecond=0) + timedelta(minutes=delta)
+
+class ScheduleRunner:
+    """Calls ``on_change(active)`` whenever the schedule opens or closes a window.
+
+    Runs on the ``timers`` thread (a TimerService); ``reload(config)`` and
+    ``stop()`` are thread-safe.
+    """
+    def __init__(self, config, on_change, timers, clock=None, logger=None):
+        self.on_change = on_change
+        self.timers = timers
+        self.clock = clock or REAL_CLOCK
+        self.logger = logger or log_config.get_logger("schedule")
+        self.lock = threading.Lock()
+        self.job = None
+        self.running = False
+        self.active = None
+        self.next_change = None
+        self.wakeups = 0
+        self.configure(config)
+
+    def configure(self, config):
+        section = (config or {}).get('schedule', {})
+        self.enabled = bool(section.get('enabled'))
+        try:
+            self.schedule = WeeklySchedule(section.get('windows', []))
+        except (ValueError, AttributeError) as e:
+            self.logger.error("Invalid schedule windows, schedule disabled: %s", e)
+            self.enabled = False
+            self.schedule = WeeklySchedule([])
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self._arm(0)
+
+    def stop(self):
+        self.running = False
+        self.timers.cancel(self.job)
+
+    def _arm(self, delay):
+        with self.lock:
+            self.timers.cancel(self.job)
+            self.job = self.timers.call_later(delay, self._tick, tolerance=1.0)
+
+    def reload(self, config):
+        """Apply a new 'schedule' section and re-evaluate at once"""
+        with self.lock:
+            was_enabled = self.enabled
+            self.configure(config)
+            if self.enabled and not was_enabled:
+                self.active = None  # enforce the current window state right away
+        if self.running:
+            self._arm(0)
+
+    def status(self):
+        return {
+            'enabled': self.enabled,
+            'active': self.active,
+            'next_change': self.next_change.isoformat(timespec='minutes') if self.next_change else None,
+        }
+
+    def describe(self):
+        """One line for the UI"""
+        if not self.enabled:
+            return "Schedule off"
+        if self.next_change is None:
+            return "Always active" if self.active else "No windows configured"
+        when = self.next_change.strftime("%a %H:%M")
+        return f"Active until {when}" if self.active else f"Next window opens {when}"
+
+    def reconcile(self):
+        """Recompute the desired state and the next transition from the wall clock"""
+        with self.lock:
+            if not self.enabled:
+                self.next_change = None
+                return None
+            moment = datetime.fromtimestamp(self.clock.time())
+            active = self.schedule.is_active(moment)
+            self.next_change = self.schedule.next_transition(moment)
+            changed = active != self.active
+            self.active = active
+        if changed:
+            self.logger.info("Schedule window %s; %s.", 'opened' if active else 'closed', self.describe())
+            self.on_change(active)
+        return active
+
+    def _tick(self):
+        if not self.running:
+            return
+        self.wakeups += 1
+        try:
+            self.reconcile()
+        except Exception as e:
+            self.logger.error("Schedule update failed: %s", e)
+        if not self.enabled:
+            return  # nothing to do until reload() or stop()
+        next_change = self.next_change
+        delay = MAX_SLEEP if next_change is None else \
+            min(MAX_SLEEP, max(0.0, next_change.timestamp() - self.clock.time()))
+        self._arm(delay)
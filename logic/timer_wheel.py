@@ -0,0 +1,161 @@
+"""Hierarchical timing wheel for coarse timers (schedules, periodic UI and tray work).
+
+Level 0 has one bucket per tick for the current window of ``slots`` ticks.
+Each level above covers ``slots`` times the span of the one below, one bucket
+per window of the level beneath. A timer goes into the lowest level whose
+current window contains its tick. When time enters a new window, that
+window's bucket one level up cascades down, so each timer is re-hashed at
+most once per level. Scheduling and cancelling are O(1). ``advance()`` skips
+whole windows while the levels below are empty, so a long sleep costs a
+handful of steps, not one per tick. Six levels of 64 ticks of 50 ms span
+over a century; later timers wait in an overflow list.
+
+``next_deadline()`` lets the owner sleep exactly until the next timer
+instead of waking on every tick.
+"""
+
+class Timer:
+    """Handle returned by TimerWheel.schedule(); pass it to cancel()"""
+    __slots__ = ('deadline', 'tick', 'callback', 'args', 'cancelled', 'bucket')
+
+    def __init__(self, deadline, tick, callback, args):
+        self.deadline = deadline
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self.bucket = None  # the list holding the timer while it is pending
+
+class TimerWheel:
+    """Hierarchical hashed wheel; times are whatever clock the owner advances it with"""
+    def __init__(self, tick=1.0, slots=64, levels=6, now=0.0):
+        if slots < 2 or slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+        self.tick = tick
+        self.bits = slots.bit_length() - 1
+        self.mask = slots - 1
+        self.levels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.filled = [0] * levels  # timers held per level, to skip empty windows
+        self.overflow = []
+        self.current_tick = int(now // tick)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def schedule(self, deadline, callback, *args):
+        """Call callback(*args) from the first advance() at or after ``deadline``"""
+        timer = Timer(deadline, max(int(deadline // self.tick), self.current_tick), callback, args)
+        self._place(timer)
+        self.count += 1
+        return timer
+
+    def _place(self, timer):
+        tick, current = timer.tick, self.current_tick
+        for level in range(len(self.levels)):
+            shift = self.bits * (level + 1)
+            if tick >> shift == current >> shift:
+                # Same window one level up: the bucket here is reached by counting or cascading
+                bucket = self.levels[level][(tick >> (self.bits * level)) & self.mask]
+                self.filled[level] += 1
+                break
+        else:
+            bucket = self.overflow
+        bucket.append(timer)
+        timer.bucket = bucket
+
+    def _take(self, bucket, level):
+        """Empty a bucket and return its timers"""
+        timers = bucket[:]
+        bucket.clear()
+        if level is not None:
+            self.filled[level] -= len(timers)
+        return timers
+
+    def cancel(self, timer):
+        """Cancel a pending timer and drop it from its bucket"""
+        if timer is None or timer.cancelled:
+            return
+        timer.cancelled = True
+        self.count -= 1
+        bucket, timer.bucket = timer.bucket, None
+        if bucket is not None:
+            bucket.remove(timer)
+            if bucket is not self.overflow:
+                for level, buckets in enumerate(self.levels):
+                    if bucket is buckets[(timer.tick >> (self.bits * level)) & self.mask]:
+                        self.filled[level] -= 1
+                        break
+
+    def _cascade(self, tick):
+        """Entering ``tick``: move down the buckets of every window that starts there"""
+        top = len(self.levels)
+        if tick & ((1 << (self.bits * top)) - 1) == 0 and self.overflow:
+            for timer in self._take(self.overflow, None):
+                self._place(timer)
+        for level in range(top - 1, 0, -1):
+            if tick & ((1 << (self.bits * level)) - 1) == 0:
+                bucket = self.levels[level][(tick >> (self.bits * level)) & self.mask]
+                for timer in self._take(bucket, level):
+                    self._place(timer)
+
+    def advance(self, now):
+        """Fire every timer due at ``now``; returns how many fired.
+
+        Callbacks run in deadline order and may schedule or cancel other
+        timers.
+        """
+        now_tick = max(int(now // self.tick), self.current_tick)  # a clock going backwards rescans this tick
+        due = []
+        bucket0 = self.levels[0]
+        while True:
+            bucket = bucket0[self.current_tick & self.mask]
+            if bucket:
+                keep = [timer for timer in bucket if timer.deadline > now]
+                if len(keep) < len(bucket):
+                    for timer in bucket:
+                        if timer.deadline <= now:
+                            timer.bucket = None  # cancel() must not look for it in the bucket
+                            due.append(timer)
+                    self.filled[0] -= len(bucket) - len(keep)
+                    bucket[:] = keep
+            if self.current_tick == now_tick:
+                break
+            # With levels below k empty, nothing happens before the next window of level k starts
+            step = None
+            for level in range(len(self.levels)):
+                if self.filled[level]:
+                    step = 1 << (self.bits * level)
+                    break
+            else:
+                if self.overflow:
+                    step = 1 << (self.bits * len(self.levels))
+            target = (self.current_tick // step + 1) * step if step else now_tick + 1
+            if target > now_tick:
+                self.current_tick = now_tick  # no window with timers starts on the way
+                break
+            self.current_tick = target
+            self._cascade(target)
+        fired = 0
+        for timer in sorted(due, key=lambda t: t.deadline):
+            if timer.cancelled:
+                continue  # cancelled by an earlier callback in this batch
+            timer.cancelled = True
+            self.count -= 1
+            timer.callback(*timer.args)
+            fired += 1
+        return fired
+
+    def next_deadline(self):
+        """Earliest pending deadline, or None if no timers are scheduled"""
+        if not self.count:
+            return None
+        # Every timer on a level is due after every timer on the levels below it
+        for level, buckets in enumerate(self.levels):
+            if not self.filled[level]:
+                continue
+            start = (self.current_tick >> (self.bits * level)) & self.mask
+            for index in range(start, self.mask + 1):
+                if buckets[index]:
+                    return min(t.deadline for t in buckets[index])
+        return min(t.deadline for t in self.overflow)
@@ -0,0 +1,155 @@
+"""One timer thread for every periodic job in the app.
+
+Jobs register with ``call_later``/``every`` instead of running their own
+``after`` loop or sleeping thread. Deadlines live on a TimerWheel, and the
+thread sleeps until the earliest one. A job's ``tolerance`` says how late it
+may run. Deadlines are rounded up to a multiple of their tolerance, so jobs
+with compatible slack fire on the same wakeup: with the window hidden, every
+job here lines up on one wakeup per second.
+
+Jobs marked ``tk=True`` run on the Tk thread. All of them due on one wakeup
+are handed over in a single ``after(0)`` call.
+"""
+import math
+import threading
+
+from logic import log_config
+from logic.timer_wheel import TimerWheel
+from simulation.clock import REAL_CLOCK
+
+# Fraction of its tolerance a job may run early, so a job re-armed just after a
+# grid point (by the job that ran on it) lands on the next point, not the one after
+EARLY = 0.05
+
+class Job:
+    """Handle returned by TimerService.call_later() and every(); pass it to cancel()"""
+    __slots__ = ('callback', 'args', 'interval', 'tolerance', 'tk', 'timer', 'cancelled')
+
+    def __init__(self, callback, args, interval, tolerance, tk):
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.tolerance = tolerance
+        self.tk = tk
+        self.timer = None
+        self.cancelled = False
+
+class TimerService:
+    """Runs registered jobs from a single "timers" thread (monotonic clock time)"""
+    def __init__(self, clock=None, logger=None):
+        self.clock = clock or REAL_CLOCK
+        self.logger = logger or log_config.get_logger("timers")
+        self.wheel = TimerWheel(tick=0.05, now=self.clock.monotonic())
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.tk_call = None
+        self._due = []
+        self.thread = None
+        self.running = False
+        self.wakeups = 0
+        self.started_at = self.clock.monotonic()
+
+    def bridge_tk(self, root):
+        """Run tk=True jobs on root's thread"""
+        self.tk_call = lambda func: root.after(0, func)
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.started_at = self.clock.monotonic()
+        self.thread = threading.Thread(target=self._run, name="timers", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=2)
+        self.thread = None
+
+    def call_later(self, delay, callback, *args, tolerance=0.0, tk=False):
+        """Run callback(*args) once, ``delay`` to ``delay + tolerance`` seconds from now"""
+        job = Job(callback, args, None, tolerance, tk)
+        self._arm(job, self.clock.monotonic() + delay)
+        return job
+
+    def every(self, interval, callback, *args, tolerance=None, tk=False):
+        """Run callback(*args) every ``interval`` seconds; tolerance defaults to a quarter interval"""
+        job = Job(callback, args, interval, interval / 4 if tolerance is None else tolerance, tk)
+        self._arm(job, self.clock.monotonic() + interval)
+        return job
+
+    def reschedule(self, job, delay):
+        """Move a pending or finished job to ``delay`` seconds from now"""
+        with self.lock:
+            self.wheel.cancel(job.timer)
+        job.cancelled = False
+        self._arm(job, self.clock.monotonic() + delay)
+
+    def cancel(self, job):
+        if job is None:
+            return
+        with self.lock:
+            job.cancelled = True
+            self.wheel.cancel(job.timer)
+
+    def _arm(self, job, due):
+        if job.tolerance > 0:
+            # Round up onto the tolerance grid so jobs with the same slack share a wakeup
+            due = math.ceil(due / job.tolerance - EARLY) * job.tolerance
+        with self.lock:
+            first = self.wheel.next_deadline()
+            job.timer = self.wheel.schedule(due, self._collect, job)
+        if (first is None or due < first) and threading.current_thread() is not self.thread:
+            self.wakeup.set()  # the thread is sleeping past the new deadline
+
+    def _collect(self, job):
+        self._due.append(job)  # called by the wheel under the lock; jobs run after it is released
+
+    def run_due(self):
+        """Run every job that is due now; returns the next deadline (None if no jobs)"""
+        with self.lock:
+            self.wheel.advance(self.clock.monotonic())
+            due, self._due = self._due, []
+        tk_jobs = [job for job in due if job.tk and not job.cancelled]
+        for job in due:
+            if not job.tk and not job.cancelled:
+                self._call(job)
+        if tk_jobs:
+            if self.tk_call is None:
+                for job in tk_jobs:
+                    self._call(job)
+            else:
+                try:
+                    self.tk_call(lambda: [self._call(job) for job in tk_jobs])
+                except RuntimeError:
+                    pass  # Tk is shutting down
+        now = self.clock.monotonic()
+        for job in due:
+            if job.interval is not None and not job.cancelled:
+                # Keep the period anchored to the grid; skip missed runs after a stall
+                due_next = job.timer.deadline + job.interval
+                self._arm(job, due_next if due_next > now else now + job.interval)
+        with self.lock:
+            return self.wheel.next_deadline()
+
+    def _call(self, job):
+        if job.cancelled:
+            return
+        try:
+            job.callback(*job.args)
+        except Exception as e:
+            self.logger.error("Timer job %s failed: %s", getattr(job.callback, '__name__', job.callback), e)
+
+    def _run(self):
+        while self.running:
+            self.wakeup.clear()
+            deadline = self.run_due()
+            timeout = None if deadline is None else max(0.0, deadline - self.clock.monotonic())
+            self.wakeup.wait(timeout)
+            self.wakeups += 1
+
+    def status(self):
+        elapsed = max(self.clock.monotonic() - self.started_at, 1e-9)
+        return {'jobs': len(self.wheel), 'wakeups': self.wakeups, 'wakeups_per_sec': self.wakeups / elapsed}
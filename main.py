@@ -1,14 +1,16 @@
 import pyautogui  # type: ignore
 pyautogui.FAILSAFE = False  # Disable fail-safe to prevent interruption
-import time
 import random
 import json
 import sys
 import os
+import threading
 from logic.config_manager import ConfigManager
+from logic.hotkeys import HotkeyDispatcher
+from simulation.breaker import CircuitBreaker
+from simulation.clock import REAL_CLOCK
 import logging
 from datetime import datetime
-import keyboard  # type: ignore
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', 
@@ -21,87 +23,90 @@ def load_config():
         with open('config/anoid.json', 'r') as file:
             return json.load(file)
     except Exception as e:
-        logger.error(f"Failed to load configuration: {e}")
+        logger.error("Failed to load configuration: %s", e)
         return {}
 
-# Simulate mouse movement with human-like patterns
-def simulate_mouse(config):
-    try:
-        screen_width, screen_height = pyautogui.size()
-        logger.info("Starting mouse simulation...")
-        for _ in range(config['mouse']['movements']):
-            # Simulate more natural movement by favoring center of screen
-            x = random.randint(int(screen_width * 0.25), int(screen_width * 0.75))
-            y = random.randint(int(screen_height * 0.25), int(screen_height * 0.75))
-            duration = random.uniform(config['mouse']['min_duration'], config['mouse']['max_duration'])
-            pyautogui.moveTo(x, y, duration=duration)
-            # Occasionally click or double-click to mimic interaction
-            if random.random() < 0.25:
-                pyautogui.click()
-            elif random.random() < 0.1:
-                pyautogui.doubleClick()
-            # Random small movements to mimic cursor hovering
-            for _ in range(random.randint(0, 3)):
-                x_small = x + random.randint(-20, 20)
-                y_small = y + random.randint(-20, 20)
-                pyautogui.moveTo(x_small, y_small, duration=random.uniform(0.1, 0.3))
-            time.sleep(random.uniform(config['mouse']['min_interval'], config['mouse']['max_interval']))
-        logger.info("Mouse simulation cycle completed.")
-    except Exception as e:
-        logger.error(f"Error in mouse simulation: {e}")
+# Simulate mouse movement with human-like patterns; errors reach run_simulation's breaker
+def simulate_mouse(config, clock=REAL_CLOCK):
+    screen_width, screen_height = pyautogui.size()
+    logger.info("Starting mouse simulation...")
+    for _ in range(config['mouse']['movements']):
+        # Simulate more natural movement by favoring center of screen
+        x = random.randint(int(screen_width * 0.25), int(screen_width * 0.75))
+        y = random.randint(int(screen_height * 0.25), int(screen_height * 0.75))
+        duration = random.uniform(config['mouse']['min_duration'], config['mouse']['max_duration'])
+        pyautogui.moveTo(x, y, duration=duration)
+        # Occasionally click or double-click to mimic interaction
+        if random.random() < 0.25:
+            pyautogui.click()
+        elif random.random() < 0.1:
+            pyautogui.doubleClick()
+        # Random small movements to mimic cursor hovering
+        for _ in range(random.randint(0, 3)):
+            x_small = x + random.randint(-20, 20)
+            y_small = y + random.randint(-20, 20)
+            pyautogui.moveTo(x_small, y_small, duration=random.uniform(0.1, 0.3))
+        clock.sleep(random.uniform(config['mouse']['min_interval'], config['mouse']['max_interval']))
+    logger.info("Mouse simulation cycle completed.")
 
 # Simulate keyboard input with human-like variability
-def simulate_keyboard(config):
-    try:
-        logger.info("Starting keyboard simulation...")
-        for _ in range(config['keyboard']['actions']):
-            phrase = random.choice(config['keyboard']['phrases'])
-            # Add occasional typos to mimic human error
-            if random.random() < 0.15:
-                typo_index = random.randint(0, len(phrase) - 1)
-                phrase = phrase[:typo_index] + random.choice('abcdefghijklmnopqrstuvwxyz') + phrase[typo_index + 1:]
-                pyautogui.write(phrase, interval=random.uniform(0.05, 0.2))
-                time.sleep(random.uniform(0.5, 1.5))
-                pyautogui.press('backspace', presses=len(phrase) - typo_index)
-                pyautogui.write(phrase[typo_index:], interval=random.uniform(0.05, 0.2))
-            else:
-                pyautogui.write(phrase, interval=random.uniform(0.05, 0.2))
-            # Randomly press enter or other keys
-            if random.random() < 0.6:
-                pyautogui.press('enter')
-            elif random.random() < 0.3:
-                pyautogui.press(random.choice(['backspace', 'space', 'tab']))
-            else:
-                pyautogui.hotkey('ctrl', random.choice(['c', 'v', 'a']))
-            time.sleep(random.uniform(config['keyboard']['min_interval'], config['keyboard']['max_interval']))
-        logger.info("Keyboard simulation cycle completed.")
-    except Exception as e:
-        logger.error(f"Error in keyboard simulation: {e}")
+def simulate_keyboard(config, clock=REAL_CLOCK):
+    logger.info("Starting keyboard simulation...")
+    for _ in range(config['keyboard']['actions']):
+        phrase = random.choice(config['keyboard']['phrases'])
+        # Add occasional typos to mimic human error
+        if random.random() < 0.15:
+            typo_index = random.randint(0, len(phrase) - 1)
+            phrase = phrase[:typo_index] + random.choice('abcdefghijklmnopqrstuvwxyz') + phrase[typo_index + 1:]
+            pyautogui.write(phrase, interval=random.uniform(0.05, 0.2))
+            clock.sleep(random.uniform(0.5, 1.5))
+            pyautogui.press('backspace', presses=len(phrase) - typo_index)
+            pyautogui.write(phrase[typo_index:], interval=random.uniform(0.05, 0.2))
+        else:
+            pyautogui.write(phrase, interval=random.uniform(0.05, 0.2))
+        # Randomly press enter or other keys
+        if random.random() < 0.6:
+            pyautogui.press('enter')
+        elif random.random() < 0.3:
+            pyautogui.press(random.choice(['backspace', 'space', 'tab']))
+        else:
+            pyautogui.hotkey('ctrl', random.choice(['c', 'v', 'a']))
+        clock.sleep(random.uniform(config['keyboard']['min_interval'], config['keyboard']['max_interval']))
+    logger.info("Keyboard simulation cycle completed.")
 
 # Remove simulate_browser and all browser simulation logic
 # Remove browser simulation from run_simulation
 
-def run_simulation(config, last_config_load):
+# Backs off exponentially (with jitter) on repeated failures instead of a fixed 10 s
+breaker = CircuitBreaker("simulation")
+
+def run_simulation(config, last_config_load, clock=REAL_CLOCK):
+    if not breaker.allow():
+        # Open after repeated failures: wait out the backoff instead of attempting again
+        clock.sleep(breaker.retry_in())
+        return config, last_config_load
     try:
         # Reload config every 5 minutes in case it was updated via UI
-        current_time = time.time()
+        current_time = clock.time()
         if current_time - last_config_load > 300:
             config = load_config()
             last_config_load = current_time
             logger.info("Configuration reloaded.")
         if config['mouse']['enabled']:
-            simulate_mouse(config)
+            simulate_mouse(config, clock)
         if config['keyboard']['enabled']:
-            simulate_keyboard(config)
+            simulate_keyboard(config, clock)
         #if config['browser']['enabled']:
         #    simulate_browser(config)
         # Random pause between cycles to avoid predictable patterns
         pause = random.uniform(5, 15)
-        logger.info(f"Pausing for {pause:.2f} seconds before next cycle.")
-        time.sleep(pause)
+        logger.info("Pausing for %.2f seconds before next cycle.", pause)
+        clock.sleep(pause)
+        breaker.record_success()
     except Exception as e:
-        logger.error(f"Unexpected error in simulation loop: {e}")
-        time.sleep(10)  # Wait before retrying to avoid rapid error loops
+        delay = breaker.record_failure(e)
+        logger.error("Error in simulation: %s; retrying in %.1f s.", e, delay)
+        clock.sleep(delay)  # Wait before retrying to avoid rapid error loops
     return config, last_config_load
 
 def main():
@@ -133,6 +138,10 @@ def main():
         else:
             logger.info("Simulation is not running.")
     
+    # One keyboard hook serves every hotkey; handlers run on a worker thread
+    hotkeys = HotkeyDispatcher()
+    exit_event = threading.Event()
+    
     # Register only ALT+` for hide/show tray
     hotkey_control_enabled = config.get('ui', {}).get('hotkey_control', True)
     if hotkey_control_enabled:
@@ -147,13 +156,15 @@ def main():
             else:
                 logger.info("Showing from tray with ALT+`")
                 # Implement tray show logic if running with UI
-        keyboard.add_hotkey('alt+`', toggle_tray)
+        hotkeys.bind('alt+`', toggle_tray)
         logger.info("Hotkey registered: ALT+` (hide/show tray)")
     else:
         logger.info("Hotkey control is disabled in configuration. Use UI to control tray.")
     
     # Keep the script running to listen for hotkeys or until user exits
-    keyboard.wait('esc')  # This will keep the script running until 'esc' is pressed to exit completely
+    hotkeys.bind('esc', exit_event.set)  # 'esc' exits completely
+    exit_event.wait()
+    hotkeys.stop()
     logger.info("Android Studio terminated by user.")
 
 if __name__ == "__main__":
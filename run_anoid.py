@@ -11,11 +11,13 @@ if project_root not in sys.path:
 # Import the main application class
 from core.ui import AndroidStudioUI
 import tkinter as tk
+import multiprocessing
 import sys
 import os
 from logic.config_manager import ConfigManager
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # the isolated engine process in frozen builds
     root = tk.Tk()
     root.title("Android Studio")
     app = AndroidStudioUI(root)
@@ -0,0 +1,12 @@
+import sys
+import os
+
+# Add the project root directory to sys.path to ensure imports work correctly
+project_root = os.path.abspath(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from simulation.headless import main
+
+if __name__ == "__main__":
+    sys.exit(main())
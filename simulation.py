@@ -1,26 +1,34 @@
-import time
 import random
 import pyautogui
 import logging
 
+from simulation.breaker import CircuitBreaker
+from simulation.clock import REAL_CLOCK
+
 class Simulation:
-    def __init__(self, config, logger):
+    def __init__(self, config, logger, clock=None):
         self.config = config
         self.logger = logger
+        self.clock = clock or REAL_CLOCK
+        self.breaker = CircuitBreaker("simulation", clock=self.clock)
         self.simulation_running = False
 
     def run_simulation(self):
         last_config_load = 0
         while self.simulation_running:
+            if not self.breaker.allow():
+                # Open after repeated failures: wait out the backoff instead of attempting again
+                self.clock.sleep(self.breaker.retry_in())
+                continue
             try:
-                current_time = time.time()
+                current_time = self.clock.time()
                 if current_time - last_config_load > 300:  # Reload config every 5 minutes
                     # Assuming config is updated externally if needed
                     last_config_load = current_time
                     self.logger.info("Configuration reloaded.")
                 if self.config['mouse']['enabled']:
                     screen_width, screen_height = pyautogui.size()
-                    self.logger.info("Starting mouse simulation...")
+                    self.logger.debug("Starting mouse simulation...")
                     for _ in range(self.config['mouse']['movements']):
                         # Use a more natural movement pattern with bezier-like curves
                         start_x, start_y = pyautogui.position()
@@ -42,13 +50,13 @@ class Simulation:
                         action_chance = random.random()
                         if action_chance < 0.3:
                             pyautogui.click()
-                            self.logger.info("Performed a click.")
+                            self.logger.debug("Performed a click.")
                         elif action_chance < 0.4:
                             pyautogui.doubleClick()
-                            self.logger.info("Performed a double-click.")
+                            self.logger.debug("Performed a double-click.")
                         elif action_chance < 0.45:
                             pyautogui.rightClick()
-                            self.logger.info("Performed a right-click.")
+                            self.logger.debug("Performed a right-click.")
                         
                         # Random small movements to mimic cursor hovering or reading
                         for _ in range(random.randint(0, 5)):
@@ -57,11 +65,11 @@ class Simulation:
                             pyautogui.moveTo(x_small, y_small, duration=random.uniform(0.1, 0.4))
                         
                         # Introduce random micro-pauses to mimic human hesitation
-                        time.sleep(random.uniform(0.1, 0.5))
-                        time.sleep(random.uniform(self.config['mouse']['min_interval'], self.config['mouse']['max_interval']))
-                    self.logger.info("Mouse simulation cycle completed.")
+                        self.clock.sleep(random.uniform(0.1, 0.5))
+                        self.clock.sleep(random.uniform(self.config['mouse']['min_interval'], self.config['mouse']['max_interval']))
+                    self.logger.debug("Mouse simulation cycle completed.")
                 if self.config['keyboard']['enabled']:
-                    self.logger.info("Starting keyboard simulation...")
+                    self.logger.debug("Starting keyboard simulation...")
                     for _ in range(self.config['keyboard']['actions']):
                         if self.config['keyboard']['dart_enabled']:
                             # Simulate typing Dart code
@@ -77,21 +85,21 @@ class Simulation:
                                 "Widget _buildItem(BuildContext context, int index) {\n  return ListTile(\n    title: Text('Item $index'),\n    onTap: () => print('Tapped item $index'),\n  );\n}",
                                 "final TextEditingController _controller = TextEditingController();\nString getText() => _controller.text;"
                             ]
-                            self.logger.info("Simulating Dart code typing...")
+                            self.logger.debug("Simulating Dart code typing...")
                             code_snippet = random.choice(dart_code_snippets)
                             lines = code_snippet.split('\n')
                             for i in range(min(len(lines), self.config['keyboard']['dart_lines'])):
                                 line = lines[i]
                                 for char in line:
                                     pyautogui.write(char)
-                                    time.sleep(random.uniform(0.03, 0.1))
+                                    self.clock.sleep(random.uniform(0.03, 0.1))
                                 pyautogui.press('enter')
-                                time.sleep(random.uniform(0.1, 0.3))
+                                self.clock.sleep(random.uniform(0.1, 0.3))
                             # Simulate scrolling after typing
                             pyautogui.scroll(-random.randint(100, 300))
-                            time.sleep(random.uniform(0.5, 1.5))
+                            self.clock.sleep(random.uniform(0.5, 1.5))
                             pyautogui.scroll(random.randint(50, 150))
-                            self.logger.info("Dart code simulation cycle completed.")
+                            self.logger.debug("Dart code simulation cycle completed.")
                         else:
                             phrase = random.choice(self.config['keyboard']['phrases'])
                             # Add occasional typos with correction for human-like behavior
@@ -100,10 +108,10 @@ class Simulation:
                                 typo_char = random.choice('abcdefghijklmnopqrstuvwxyz')
                                 typo_phrase = phrase[:typo_index] + typo_char + phrase[typo_index + 1:]
                                 pyautogui.write(typo_phrase, interval=random.uniform(0.05, 0.15))
-                                time.sleep(random.uniform(0.3, 1.2))
+                                self.clock.sleep(random.uniform(0.3, 1.2))
                                 pyautogui.press('backspace', presses=len(typo_phrase) - typo_index)
                                 pyautogui.write(phrase[typo_index:], interval=random.uniform(0.05, 0.15))
-                                self.logger.info("Simulated a typo and correction.")
+                                self.logger.debug("Simulated a typo and correction.")
                             else:
                                 pyautogui.write(phrase, interval=random.uniform(0.05, 0.15))
                             
@@ -115,25 +123,27 @@ class Simulation:
                                 pyautogui.press(random.choice(['backspace', 'space', 'tab', 'delete']))
                             elif action_chance < 0.85:
                                 pyautogui.hotkey('ctrl', random.choice(['c', 'v', 'a', 'x']))
-                                self.logger.info("Simulated a keyboard shortcut.")
+                                self.logger.debug("Simulated a keyboard shortcut.")
                             else:
                                 # Simulate random key combinations for complexity
                                 modifiers = random.sample(['ctrl', 'alt', 'shift'], random.randint(0, 2))
                                 if modifiers:
                                     keys = modifiers + [random.choice(['f1', 'f2', 'f3', 'f4', 'f5', 'tab', 'esc'])]
                                     pyautogui.hotkey(*keys)
-                                    self.logger.info(f"Simulated complex key combo: {keys}")
+                                    self.logger.debug("Simulated complex key combo: %s", keys)
                             
                             # Introduce random pauses to mimic thinking or reading
-                            time.sleep(random.uniform(0.2, 1.0))
-                        time.sleep(random.uniform(self.config['keyboard']['min_interval'], self.config['keyboard']['max_interval']))
-                    self.logger.info("Keyboard simulation cycle completed.")
+                            self.clock.sleep(random.uniform(0.2, 1.0))
+                        self.clock.sleep(random.uniform(self.config['keyboard']['min_interval'], self.config['keyboard']['max_interval']))
+                    self.logger.debug("Keyboard simulation cycle completed.")
                 #if self.config['browser']['enabled']:
                 #    # Browser simulation code is now disabled
                 #    pass
                 pause = random.uniform(5, 15)
-                self.logger.info(f"Pausing for {pause:.2f} seconds before next cycle.")
-                time.sleep(pause)
+                self.logger.debug("Pausing for %.2f seconds before next cycle.", pause)
+                self.clock.sleep(pause)
+                self.breaker.record_success()
             except Exception as e:
-                self.logger.error(f"Error in simulation: {e}")
-                time.sleep(10)
+                delay = self.breaker.record_failure(e)
+                self.logger.error("Error in simulation: %s; retrying in %.1f s.", e, delay)
+                self.clock.sleep(delay)
@@ -0,0 +1,70 @@
+"""Per-behavior circuit breaker with jittered exponential backoff.
+
+Consecutive failures back off exponentially; after ``threshold`` of them (or
+at once for a missing dependency, which will not fix itself between rounds)
+the breaker opens and the behavior is skipped until the backoff expires.
+The next attempt is a half-open probe: success closes the breaker, failure
+re-opens it with a longer delay.
+"""
+import random
+
+from simulation.clock import REAL_CLOCK
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """Failure state for one behavior"""
+    def __init__(self, name, threshold=3, base_delay=1.0, max_delay=600.0, clock=None, rng=None,
+                 permanent=(ImportError,)):
+        self.name = name
+        self.permanent = permanent
+        self.threshold = threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock or REAL_CLOCK
+        self.rng = rng or random.Random()
+        self.state = CLOSED
+        self.failures = 0
+        self.retry_at = 0.0
+        self.last_error = None
+
+    def allow(self):
+        """Return True if the behavior may run now (moving an expired open breaker to half-open)"""
+        if self.state == OPEN:
+            if self.clock.monotonic() < self.retry_at:
+                return False
+            self.state = HALF_OPEN
+        return True
+
+    def retry_in(self):
+        return max(0.0, self.retry_at - self.clock.monotonic())
+
+    def record_success(self):
+        """Close the breaker; returns True if it was recovering from failures"""
+        recovered = self.failures > 0
+        self.state = CLOSED
+        self.failures = 0
+        self.last_error = None
+        return recovered
+
+    def record_failure(self, error):
+        """Count a failure and return the backoff delay in seconds"""
+        self.failures += 1
+        self.last_error = error
+        if isinstance(error, self.permanent):
+            # A missing dependency will not appear between rounds: open right away
+            self.failures = max(self.failures, self.threshold)
+        delay = min(self.max_delay, self.base_delay * 2 ** (self.failures - 1))
+        # Equal jitter: keep half the delay, randomize the rest so retries do not align
+        delay = delay / 2 + self.rng.uniform(0, delay / 2)
+        self.retry_at = self.clock.monotonic() + delay
+        if self.failures >= self.threshold:
+            self.state = OPEN
+        return delay
+
+    def status(self):
+        return {'state': self.state, 'failures': self.failures,
+                'retry_in': self.retry_in() if self.state == OPEN else 0.0,
+                'last_error': str(self.last_error) if self.last_error else None}
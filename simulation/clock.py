@@ -0,0 +1,75 @@
+"""Clock abstraction so the engine can run against real or virtual time."""
+import asyncio
+import selectors
+import threading
+import time
+
+class RealClock:
+    """Wall-clock time backed by the time module"""
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def new_event_loop(self):
+        return asyncio.new_event_loop()
+
+class VirtualClock:
+    """Simulated time: sleep() advances the clock instantly instead of blocking.
+
+    Combined with FakeInputBackend this runs hours of engine behaviour in
+    seconds. ``time()`` reports ``wall_start`` plus the virtual elapsed time.
+    """
+    def __init__(self, start=0.0, wall_start=None):
+        self.now = float(start)
+        self.wall_start = time.time() if wall_start is None else wall_start
+        self.lock = threading.Lock()
+
+    def time(self):
+        return self.wall_start + self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.advance(seconds)
+
+    def advance(self, seconds):
+        with self.lock:
+            self.now += seconds
+
+    def new_event_loop(self):
+        return VirtualEventLoop(self)
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Selector that jumps the clock to the next timer instead of waiting for it"""
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def select(self, timeout=None):
+        events = super().select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None:
+            # Nothing scheduled: only another thread (an executor, stop()) can wake us
+            return super().select(None)
+        self.clock.advance(timeout)
+        return []
+
+class VirtualEventLoop(asyncio.SelectorEventLoop):
+    """asyncio loop whose timers (asyncio.sleep, call_later) run on a VirtualClock"""
+    def __init__(self, clock):
+        super().__init__(_VirtualSelector(clock))
+        self.clock = clock
+
+    def time(self):
+        return self.clock.monotonic()
+
+REAL_CLOCK = RealClock()
@@ -0,0 +1,133 @@
+"""Cached monitor layout and cursor position for the engine.
+
+Monitor rectangles are queried from the input backend once and kept until
+``invalidate()`` is called on a display change; the cursor position is
+tracked from the engine's own moves, so behaviors pick targets without any
+per-move geometry query.
+
+LayoutProbe tells when to invalidate: a cheap fingerprint of the OS monitor
+layout that works while the app's window is withdrawn to the tray.
+"""
+import ctypes
+import ctypes.util
+import sys
+from collections import namedtuple
+
+Monitor = namedtuple('Monitor', 'x y width height')
+
+# Fractions of each target monitor that moves land in: left, top, right, bottom
+DEFAULT_REGION = (0.2, 0.2, 0.8, 0.8)
+
+class DisplayService:
+    """Monitor geometry and cursor cache in front of an input backend"""
+    def __init__(self, backend):
+        self.backend = backend
+        self._monitors = None
+        self._boxes = {}
+        self.cursor = None
+        self.queries = 0
+
+    def monitors(self):
+        """Monitor rectangles, primary first"""
+        if self._monitors is None:
+            self.queries += 1
+            self._monitors = [Monitor(*rect) for rect in self.backend.monitors()]
+        return self._monitors
+
+    def invalidate(self):
+        """Forget the cached layout and cursor; call on display-change events"""
+        self._monitors = None
+        self._boxes = {}
+        self.cursor = None
+
+    def forget_cursor(self):
+        """The user moved the pointer (e.g. while paused); re-read it on next use"""
+        self.cursor = None
+
+    def position(self):
+        if self.cursor is None:
+            self.queries += 1
+            self.cursor = tuple(self.backend.position())
+        return self.cursor
+
+    def note_move(self, x, y):
+        self.cursor = (x, y)
+
+    def target_boxes(self, target='primary', region=DEFAULT_REGION):
+        """Return (left, top, right, bottom) boxes in desktop coordinates.
+
+        ``target`` is 'primary', 'all', a monitor index or a list of indexes;
+        ``region`` is the fractional box within each monitor. Unknown indexes
+        fall back to the primary monitor.
+        """
+        key = (repr(target), tuple(region))
+        boxes = self._boxes.get(key)
+        if boxes is None:
+            monitors = self.monitors()
+            if target == 'all':
+                chosen = monitors
+            elif target == 'primary' or target is None:
+                chosen = monitors[:1]
+            else:
+                indexes = target if isinstance(target, (list, tuple)) else [target]
+                chosen = [monitors[i] for i in indexes if isinstance(i, int) and 0 <= i < len(monitors)]
+                chosen = chosen or monitors[:1]
+            left, top, right, bottom = region
+            boxes = self._boxes[key] = [
+                (int(m.x + m.width * left), int(m.y + m.height * top),
+                 int(m.x + m.width * right), int(m.y + m.height * bottom))
+                for m in chosen
+            ]
+        return boxes
+
+class _XRRScreenResources(ctypes.Structure):
+    _fields_ = [('timestamp', ctypes.c_ulong), ('configTimestamp', ctypes.c_ulong), ('ncrtc', ctypes.c_int)]
+
+class LayoutProbe:
+    """Fingerprint of the monitor layout; raises OSError from the constructor where unsupported.
+
+    Windows reads the virtual screen rectangle and monitor count with
+    GetSystemMetrics. X11 reads the RandR configuration timestamps, which
+    change on every mode or monitor change; neither asks the hardware.
+    """
+    def __init__(self):
+        if sys.platform == 'win32':
+            self._query = self._windows_query()
+        else:
+            self._query = self._x11_query()
+        self._query()
+
+    @staticmethod
+    def _windows_query():
+        user32 = ctypes.windll.user32  # type: ignore[attr-defined]
+        # SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN, SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN, SM_CMONITORS
+        return lambda: tuple(user32.GetSystemMetrics(index) for index in (76, 77, 78, 79, 80))
+
+    @staticmethod
+    def _x11_query():
+        x11_path, xrandr_path = ctypes.util.find_library('X11'), ctypes.util.find_library('Xrandr')
+        if not x11_path or not xrandr_path:
+            raise OSError("libX11/libXrandr not available")
+        x11, xrandr = ctypes.CDLL(x11_path), ctypes.CDLL(xrandr_path)
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        x11.XDefaultRootWindow.restype = ctypes.c_ulong
+        xrandr.XRRGetScreenResourcesCurrent.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+        xrandr.XRRGetScreenResourcesCurrent.restype = ctypes.POINTER(_XRRScreenResources)
+        xrandr.XRRFreeScreenResources.argtypes = [ctypes.POINTER(_XRRScreenResources)]
+        display = x11.XOpenDisplay(None)
+        if not display:
+            raise OSError("cannot open X display")
+        root = x11.XDefaultRootWindow(display)
+        def query():
+            resources = xrandr.XRRGetScreenResourcesCurrent(display, root)
+            if not resources:
+                raise OSError("RandR extension not available")
+            try:
+                return (resources.contents.timestamp, resources.contents.configTimestamp, resources.contents.ncrtc)
+            finally:
+                xrandr.XRRFreeScreenResources(resources)
+        return query
+
+    def signature(self):
+        return self._query()
@@ -0,0 +1,783 @@
+import asyncio
+import os
+import threading
+import random
+import logging
+
+from logic import log_config
+from logic.config_manager import diff_configs
+from simulation.breaker import CircuitBreaker
+from simulation.clock import REAL_CLOCK
+from simulation.display import DEFAULT_REGION, DisplayService
+from simulation.governor import BudgetGovernor, LoadGovernor
+from simulation.history import HistoryWriter, SessionRecorder
+from simulation.input_backend import InstrumentedBackend, PyAutoGUIBackend
+from simulation.metrics import EngineMetrics
+from simulation.trace import TraceRecorder
+
+# Independent behavior tasks; each runs rounds at its own cadence
+BEHAVIORS = ('mouse', 'scroll', 'keyboard', 'browser')
+
+# Mouse-section settings that belong to the scroll behavior
+SCROLL_KEYS = {'scrolls', 'hscrolls', 'scroll_sensitivity', 'scroll_min_interval', 'scroll_max_interval'}
+
+# Longest stretch a primitive blocks before re-checking pause/stop; keeps both under 50 ms
+SLICE_SECONDS = 0.02
+
+# A disabled behavior re-checks its config this often; apply_config() wakes it sooner
+DISABLED_POLL = 60.0
+
+# Activity history database, next to the config file unless 'history.path' is set
+HISTORY_FILE = "anoid-history.db"
+
+DART_CODE_SNIPPETS = [
+    "void main() {\n  print('Hello, World!');\n}",
+    "class MyApp extends StatelessWidget {\n  @override\n  Widget build(BuildContext context) {\n    return MaterialApp(\n      home: Scaffold(\n        appBar: AppBar(title: Text('My App')),\n        body: Center(child: Text('Welcome')),\n      ),\n    );\n  }\n}",
+    "Future<String> fetchData() async {\n  await Future.delayed(Duration(seconds: 2));\n  return 'Data fetched';\n}",
+    "List<int> numbers = [1, 2, 3, 4, 5];\nint sum = numbers.reduce((a, b) => a + b);",
+    "import 'package:flutter/material.dart';\nvoid main() => runApp(MyApp());",
+    "enum Status { LOADING, SUCCESS, ERROR }\nStatus currentStatus = Status.LOADING;",
+    "Map<String, dynamic> user = {\n  'name': 'John',\n  'age': 30,\n  'isActive': true\n};",
+    "Stream<int> countStream() async* {\n  for (int i = 1; i <= 5; i++) {\n    yield i;\n    await Future.delayed(Duration(seconds: 1));\n  }\n}",
+    "Widget _buildItem(BuildContext context, int index) {\n  return ListTile(\n    title: Text('Item $index'),\n    onTap: () => print('Tapped item $index'),\n  );\n}",
+    "final TextEditingController _controller = TextEditingController();\nString getText() => _controller.text;"
+]
+
+class BackendUnavailable(Exception):
+    """Raised when no input backend can be created (e.g. pyautogui missing)"""
+
+class BehaviorDisabled(Exception):
+    """Raised inside a behavior round when its setting is switched off mid-round"""
+
+def _resolve(future, value):
+    if not future.done():
+        future.set_result(value)
+
+class SimulationEngine:
+    """GUI-free simulation engine shared by the Tk app and the headless daemon.
+
+    ``host`` supplies the configuration: it must expose a ``config`` dict plus
+    ``load_config()`` and ``get_default_config()``. ``on_status`` is called with
+    "running", "paused" or "stopped" whenever the engine changes state.
+    ``input_backend`` replaces pyautogui (e.g. a FakeInputBackend for dry runs)
+    and ``clock`` replaces real time (e.g. a VirtualClock for soak tests).
+
+    The engine thread runs an asyncio loop with one task per behavior (mouse,
+    scroll, keyboard, browser). Behaviors never touch the backend directly:
+    they ``await dispatch(...)``, and a single dispatcher task injects the
+    queued actions in order, so behaviors interleave at their own rates.
+    """
+    def __init__(self, host, on_status=None, logger=None, input_backend=None, clock=None, on_stats=None):
+        self.host = host
+        self.on_status = on_status
+        self.on_stats = on_stats
+        # "<app>.engine", with one child per behavior so each can have its own level
+        root = logger or logging.getLogger(log_config.ROOT)
+        self.logger = root.getChild("engine")
+        self.behavior_loggers = {name: self.logger.getChild(name) for name in BEHAVIORS}
+        self.config_logger = root.getChild("config")
+        self.history_logger = root.getChild("history")
+        self.clock = clock or REAL_CLOCK
+        self.running = False
+        self.paused = False
+        self.thread = None
+        self.metrics = EngineMetrics(clock=self.clock)
+        if on_stats:
+            self.metrics.live.on_publish = self._publish_stats
+        self.governor = LoadGovernor(host.config, logger=root.getChild("governor"))
+        self.budget = BudgetGovernor(host.config, logger=root.getChild("governor"))
+        self.input_backend = input_backend
+        self.backend = None
+        self.display = None
+        self._paused_since = None
+        # pause/resume/stop arrive from the Tk, listener and control threads
+        self.state_lock = threading.Lock()
+        self.rngs = {name: random.Random() for name in BEHAVIORS}
+        self.breakers = {}
+        self._sleepers = {}
+        self.seed = None
+        self.recorder = None
+        self._trace_file = None
+        self.history = None
+        self.session = None
+        self.scheduled_at = None
+        self.loop = None
+        self.queue = None
+        self._main_task = None
+        self._resumed = None
+
+    def _set_status(self, status):
+        if self.on_status:
+            try:
+                self.on_status(status)
+            except Exception as e:
+                self.logger.error("Status callback failed: %s", e)
+
+    def _publish_stats(self, snapshot):
+        try:
+            self.on_stats(snapshot)
+        except Exception as e:
+            self.logger.error("Stats callback failed: %s", e)
+
+    def start(self, requested_at=None):
+        """Start the engine thread; returns False if it is already running.
+
+        ``requested_at`` (clock.monotonic()) is when the caller was asked to
+        start; the metrics time the first action from there.
+        """
+        with self.state_lock:
+            if self.running:
+                return False
+            self.running = True
+            self.paused = False
+            self.metrics.mark_start(requested_at)
+            self.metrics.live.begin()
+        self.metrics.live.publish()
+        self._prepare_run()
+        self.thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self.thread.start()
+        self._set_status("running")
+        return True
+
+    def stop(self, timeout=2):
+        """Stop the engine thread; returns False if it was not running"""
+        with self.state_lock:
+            if not self.running:
+                return False
+            self.running = False
+            self._account_pause()
+            self.paused = False
+            self.metrics.live.end()
+        self.metrics.live.publish()
+        self._cancel_tasks()
+        if self.thread and self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=timeout)
+        self._set_status("stopped")
+        return True
+
+    def close(self):
+        """Stop the engine before the application exits"""
+        self.stop()
+        if self.history:
+            self.history.close()
+            self.history = None
+
+    def pause(self, reason=None):
+        """Pause the engine; returns False if it was not running or already paused.
+
+        ``reason`` (e.g. "keyboard input") is shown as the last pause reason.
+        """
+        with self.state_lock:
+            if not self.running or self.paused:
+                return False
+            self.paused = True
+            self._paused_since = self.clock.monotonic()
+            self.metrics.live.pause(reason)
+        self.metrics.live.publish()
+        self._set_status("paused")
+        return True
+
+    def resume(self):
+        """Resume a paused engine; returns False if it was not paused"""
+        with self.state_lock:
+            if not self.running or not self.paused:
+                return False
+            self._account_pause()
+            self.paused = False
+            self.metrics.live.resume()
+        self.metrics.live.publish()
+        if self.display:
+            self.display.forget_cursor()  # the user probably moved the pointer meanwhile
+        self._wake()
+        self._set_status("running")
+        return True
+
+    def status(self):
+        """Return a snapshot of the engine state"""
+        if not self.running:
+            state = "stopped"
+        elif self.paused:
+            state = "paused"
+        else:
+            state = "running"
+        return {'state': state, 'running': self.running, 'paused': self.paused, 'seed': self.seed,
+                'trace_file': self.recorder.path if self.recorder else None,
+                'history': self.history.path if self.history else None,
+                'live': self.metrics.live.snapshot(),
+                'behaviors': {name: breaker.status() for name, breaker in self.breakers.items()},
+                'governor': self.governor.status(), 'budget': self.budget.status()}
+
+    def throttle_notes(self):
+        """Why the engine is running below full intensity, one line per governor"""
+        return [note for note in (self.governor.describe(), self.budget.describe()) if note]
+
+    def _prepare_run(self):
+        """Seed the RNG and open the action trace configured in the 'engine' section"""
+        engine_config = (self.host.config or {}).get('engine', {})
+        self.seed = engine_config.get('seed')
+        # Per-behavior streams keep a seeded run reproducible however the tasks interleave
+        self.rngs = {name: random.Random(None if self.seed is None else f"{self.seed}:{name}")
+                     for name in BEHAVIORS}
+        self.breakers = {
+            name: CircuitBreaker(name, clock=self.clock, permanent=(ImportError, BackendUnavailable),
+                                 rng=random.Random(None if self.seed is None else f"{self.seed}:{name}:backoff"))
+            for name in BEHAVIORS
+        }
+        if self.seed is not None:
+            self.logger.info("Deterministic mode: seed %s.", self.seed)
+        # Rebuild the backend chain so a trace recorder can be inserted or removed
+        self.backend = None
+        self.display = None
+        self.scheduled_at = None
+        self._close_trace()
+        trace_file = engine_config.get('trace_file')
+        if trace_file:
+            self._trace_file = trace_file
+        self._open_history()
+
+    def _open_history(self):
+        """Start, retarget or drop the history writer per the 'history' section"""
+        section = (self.host.config or {}).get('history', {})
+        path = section.get('path') or None
+        config_file = getattr(self.host, 'config_file', None)
+        if path is None and config_file:
+            path = os.path.join(os.path.dirname(os.path.abspath(config_file)), HISTORY_FILE)
+        if not section.get('enabled', True):
+            path = None
+        if self.history and self.history.path != path:
+            self.history.close()
+            self.history = None
+        if path and not self.history:
+            self.history = HistoryWriter(path, logger=self.history_logger)
+            self.history.start()
+
+    def _flush_history(self):
+        if self.session is not None:
+            with self.state_lock:
+                since = self._paused_since
+            paused_now = self.clock.monotonic() - since if since is not None else 0.0
+            self.session.flush(paused_now)
+
+    def _close_trace(self):
+        self._trace_file = None
+        if self.recorder:
+            self.recorder.close()
+            self.logger.info("Action trace closed (%d actions in %s).", self.recorder.records, self.recorder.path)
+            self.recorder = None
+
+    def _scheduled_time(self):
+        return self.scheduled_at if self.scheduled_at is not None else self.clock.monotonic()
+
+    def get_backend(self):
+        """Return the instrumented input backend, or None if pyautogui is missing"""
+        if self.backend is None:
+            try:
+                raw = self.input_backend or PyAutoGUIBackend()
+            except ImportError:
+                return None
+            if self._trace_file:
+                try:
+                    self.recorder = TraceRecorder(raw, self._trace_file, scheduled=self._scheduled_time,
+                                                  clock=self.clock)
+                    raw = self.recorder
+                    self.logger.info("Recording action trace to %s.", self._trace_file)
+                except OSError as e:
+                    self.logger.error("Cannot open action trace %s: %s", self._trace_file, e)
+            self.backend = InstrumentedBackend(raw, self.metrics)
+            self.display = DisplayService(self.backend)
+        return self.backend
+
+    def display_changed(self):
+        """Drop cached monitor geometry after a resolution or monitor layout change"""
+        if self.display:
+            self.display.invalidate()
+            self.logger.info("Display layout changed; geometry will be re-read.")
+
+    def _account_pause(self):
+        """Count the pause that is ending as paused time; call with ``state_lock`` held"""
+        if self._paused_since is not None:
+            self.metrics.add_paused_time(self.clock.monotonic() - self._paused_since)
+            self._paused_since = None
+
+    async def _sleep(self, seconds, behavior=None):
+        """Sleep between actions, recording how late the wakeup was.
+
+        With ``behavior`` the sleep ends early when that behavior's settings
+        change, so new intervals apply from the next action; BehaviorDisabled
+        is raised if the change switched it off. Such interval sleeps are
+        stretched by the load and budget governors.
+        """
+        if behavior is not None:
+            seconds = self.governor.scale_interval(seconds) * self.budget.stretch
+        deadline = self.clock.monotonic() + seconds
+        if behavior is None:
+            await asyncio.sleep(seconds)
+        elif await self._interruptible_sleep(seconds, behavior):
+            if not self._behavior_enabled(behavior):
+                raise BehaviorDisabled(behavior)
+            return
+        self.metrics.observe_lateness(self.clock.monotonic() - deadline)
+
+    async def _interruptible_sleep(self, seconds, behavior):
+        """Sleep until the timeout (returns False) or a settings change for behavior (True)"""
+        loop = asyncio.get_running_loop()
+        wakeup = loop.create_future()
+        timer = loop.call_later(seconds, _resolve, wakeup, False)
+        self._sleepers[behavior] = wakeup
+        try:
+            return await wakeup
+        finally:
+            timer.cancel()
+            if self._sleepers.get(behavior) is wakeup:
+                del self._sleepers[behavior]
+
+    def apply_config(self, changes):
+        """Merge {section: {key: value}} into the live config and wake only the affected
+        behaviors; safe to call from any thread"""
+        config = self.host.config
+        affected = set()
+        for section, values in changes.items():
+            config.setdefault(section, {}).update(values)
+            if section == 'governor':
+                self.governor.configure(config)
+                self.budget.configure(config)
+            elif section == 'logging':
+                log_config.apply_config(config)
+            for key in values:
+                if section == 'mouse':
+                    if key == 'enabled':
+                        affected.update(('mouse', 'scroll'))
+                    else:
+                        affected.add('scroll' if key in SCROLL_KEYS else 'mouse')
+                elif section in BEHAVIORS:
+                    affected.add(section)
+        loop = self.loop
+        if affected and loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._wake_behaviors, affected)
+            except RuntimeError:
+                pass  # loop already closed
+        return sorted(affected)
+
+    def _wake_behaviors(self, names):
+        for name in names:
+            wakeup = self._sleepers.get(name)
+            if wakeup is not None:
+                _resolve(wakeup, True)
+
+    async def checkpoint(self):
+        """Return once the engine is not paused; stop() cancels whatever task is awaiting here"""
+        while self.paused and self.running:
+            self._resumed.clear()
+            await self._resumed.wait()
+
+    def _wake(self):
+        """Release checkpoint() waiters; safe to call from any thread"""
+        loop, resumed = self.loop, self._resumed
+        if loop is None or resumed is None:
+            return
+        try:
+            loop.call_soon_threadsafe(resumed.set)
+        except RuntimeError:
+            pass  # loop already closed
+
+    async def dispatch(self, behavior, action, *args, **kwargs):
+        """Queue one input action for the dispatcher and wait until it is injected"""
+        future = asyncio.get_running_loop().create_future()
+        task = asyncio.current_task()
+        owner = task.get_name() if task else behavior
+        self.queue.put_nowait((behavior, action, args, kwargs, owner, self.clock.monotonic(), future))
+        return await future
+
+    async def _dispatcher(self):
+        """Sole consumer of the input queue: behaviors interleave here, one action at a time"""
+        while True:
+            behavior, action, args, kwargs, owner, queued_at, future = await self.queue.get()
+            await self.checkpoint()
+            if future.done():
+                continue  # the behavior was cancelled while its action was queued
+            try:
+                backend = self.require_backend()
+                backend.behavior = behavior
+                backend.task = owner
+                self.scheduled_at = queued_at
+                future.set_result(await self._inject(backend, action, args, kwargs))
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def _inject(self, backend, action, args, kwargs):
+        """Perform one action, splitting glides and typing into slices of at most SLICE_SECONDS
+        with a pause/stop checkpoint between slices"""
+        if action == 'move_to' and kwargs.get('duration', 0.0) > SLICE_SECONDS:
+            x, y = args
+            duration = kwargs['duration']
+            start_x, start_y = self.display.position()
+            # Over its CPU budget the engine samples glides more coarsely
+            steps = int(duration / (SLICE_SECONDS * self.budget.motion_scale)) + 1
+            for step in range(1, steps + 1):
+                await self.checkpoint()
+                step_x = int(start_x + (x - start_x) * step / steps)
+                step_y = int(start_y + (y - start_y) * step / steps)
+                backend.move_to(step_x, step_y, duration=0.0)
+                self.display.note_move(step_x, step_y)
+                self.scheduled_at = None  # later slices are due when dispatched
+                await asyncio.sleep(duration / steps)
+            return None
+        if action == 'write' and len(args[0]) > 1:
+            interval = kwargs.get('interval', 0.0)
+            for char in args[0]:
+                await self.checkpoint()
+                backend.write(char)
+                self.scheduled_at = None
+                await asyncio.sleep(interval)
+            return None
+        if action == 'press' and kwargs.get('presses', 1) > 1:
+            for _ in range(kwargs['presses']):
+                await self.checkpoint()
+                backend.press(args[0])
+                self.scheduled_at = None
+                await asyncio.sleep(0)
+            return None
+        result = getattr(backend, action)(*args, **kwargs)
+        if action == 'move_to':
+            self.display.note_move(*args)
+        return result
+
+    def require_backend(self):
+        backend = self.get_backend()
+        if backend is None:
+            raise BackendUnavailable("pyautogui not installed. Input simulation will not work.")
+        return backend
+
+    def _behavior_enabled(self, name):
+        section = 'mouse' if name == 'scroll' else name
+        return bool(self.host.config.get(section, {}).get('enabled'))
+
+    def _run(self):
+        loop = self.clock.new_event_loop()
+        self.loop = loop
+        try:
+            loop.run_until_complete(self.run_simulation())
+        finally:
+            loop.run_until_complete(loop.shutdown_default_executor())
+            self.loop = None
+            loop.close()
+            self._close_trace()
+            # The loop also exits when an engine task crashes; a missing pyautogui only opens the behaviors' breakers
+            with self.state_lock:
+                ended = self.running
+                if ended:
+                    self.running = False
+                    self.paused = False
+                    self.metrics.live.end()
+            if ended:
+                self.metrics.live.publish()
+                self._set_status("stopped")
+
+    def run_for(self, seconds):
+        """Run all behaviors on the calling thread for ``seconds`` of clock time.
+
+        Meant for soak tests and benchmarks on a VirtualClock; call
+        ``_prepare_run()`` first.
+        """
+        loop = self.clock.new_event_loop()
+        self.loop = loop
+        self.running = True
+        try:
+            loop.run_until_complete(self.run_simulation(duration=seconds))
+        finally:
+            loop.run_until_complete(loop.shutdown_default_executor())
+            self.loop = None
+            loop.close()
+            self.running = False
+
+    def _cancel_tasks(self):
+        """Cancel the behavior tasks from any thread so stop() does not wait for a sleep to end"""
+        loop, task = self.loop, self._main_task
+        if loop is None or task is None:
+            return
+        try:
+            loop.call_soon_threadsafe(task.cancel)
+        except RuntimeError:
+            pass  # loop already closed
+
+    async def run_simulation(self, duration=None):
+        """Run every behavior as its own task until stopped (or for ``duration`` seconds)"""
+        self._main_task = asyncio.current_task()
+        self.queue = asyncio.Queue()
+        self._resumed = asyncio.Event()
+        tasks = [asyncio.create_task(self._dispatcher(), name="dispatch"),
+                 asyncio.create_task(self._config_reloader(), name="config"),
+                 asyncio.create_task(self._governor_loop(), name="governor"),
+                 asyncio.create_task(self._budget_loop(), name="budget")]
+        tasks += [asyncio.create_task(self._behavior_loop(name), name=name) for name in BEHAVIORS]
+        self.session = SessionRecorder(self.history, self.metrics, self.clock) if self.history else None
+        if self.session:
+            tasks.append(asyncio.create_task(self._history_loop(), name="history"))
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=duration, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if not task.cancelled() and task.exception():
+                    self.logger.error("Engine task %s failed: %s", task.get_name(), task.exception())
+        except asyncio.CancelledError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._flush_history()
+            self.session = None
+            self._main_task = None
+            self._resumed = None
+
+    async def _history_loop(self):
+        """Queue this run's activity for the history database every flush_interval seconds"""
+        while True:
+            await asyncio.sleep(self.host.config.get('history', {}).get('flush_interval', 60))
+            self._flush_history()
+
+    async def _config_reloader(self):
+        while True:
+            # Defensive: ensure config has all required keys
+            if not self.host.config or 'mouse' not in self.host.config or 'keyboard' not in self.host.config or 'browser' not in self.host.config:
+                self.config_logger.warning("Config missing required keys, resetting to default.")
+                self.host.config = self.host.get_default_config()
+            await asyncio.sleep(300)  # Reload config every 5 minutes
+            changes = diff_configs(self.host.config, self.host.load_config())
+            if changes:
+                self.apply_config(changes)
+                self.config_logger.info("Configuration reloaded (%s).", ", ".join(sorted(changes)))
+
+    async def _governor_loop(self):
+        """Re-sample system load at the governor interval; wake behaviors when the level changes"""
+        while True:
+            if self.governor.enabled:
+                try:
+                    if self.governor.update():
+                        self.metrics.inc('anoid_throttle_changes', (('level', self.governor.level),))
+                        self._wake_behaviors(BEHAVIORS)
+                except Exception as e:
+                    self.logger.error("Load governor sample failed: %s", e)
+            await asyncio.sleep(self.governor.interval)
+
+    async def _budget_loop(self):
+        """Check the process CPU/RSS budget; shed tasks wake when they are restored"""
+        while True:
+            await asyncio.sleep(self.budget.interval)
+            if self.budget.enabled:
+                try:
+                    if self.budget.update(self.metrics.cpu_seconds()):
+                        self._wake_behaviors(BEHAVIORS)
+                except Exception as e:
+                    self.logger.error("Budget sample failed: %s", e)
+
+    async def _behavior_loop(self, name):
+        """Run rounds of one behavior at its own cadence behind its circuit breaker"""
+        run_round = getattr(self, f"{name}_round")
+        log = self.behavior_loggers[name]
+        rng = self.rngs[name]
+        breaker = self.breakers[name]
+        while self.running:
+            await self.checkpoint()
+            if not self._behavior_enabled(name):
+                await self._interruptible_sleep(DISABLED_POLL, name)
+                continue
+            if not self.governor.allows(name) or not self.budget.allows(name):
+                await self._interruptible_sleep(self.governor.interval, name)
+                continue
+            if not breaker.allow():
+                await asyncio.sleep(breaker.retry_in())
+                continue
+            try:
+                await run_round(rng)
+            except BehaviorDisabled:
+                log.info("%s simulation disabled.", name.capitalize())
+                continue
+            except Exception as e:
+                self.metrics.inc('anoid_errors', (('behavior', name),))
+                delay = breaker.record_failure(e)
+                if breaker.state == "open":
+                    self.metrics.inc('anoid_breaker_opens', (('behavior', name),))
+                    log.error("%s simulation disabled for %.0f s after %d failures: %s",
+                              name.capitalize(), delay, breaker.failures, e)
+                else:
+                    log.error("Error in %s simulation: %s; retrying in %.1f s.", name, e, delay)
+                await asyncio.sleep(delay)
+                continue
+            if breaker.record_success():
+                log.info("%s simulation recovered.", name.capitalize())
+            self.metrics.inc('anoid_rounds', (('behavior', name),))
+            pause = rng.uniform(5, 15)
+            log.debug("Pausing %s simulation for %.2f seconds before next round.", name, pause)
+            try:
+                await self._sleep(pause, name)
+            except BehaviorDisabled:
+                log.info("%s simulation disabled.", name.capitalize())
+
+    async def mouse_round(self, rng):
+        """Bezier glides between random points of the target monitors, with small hover movements"""
+        config = self.host.config['mouse']
+        self.require_backend()
+        boxes = self.display.target_boxes(config.get('target_monitors', 'primary'),
+                                          config.get('target_region', DEFAULT_REGION))
+        self.behavior_loggers['mouse'].debug("Starting mouse simulation...")
+        for _ in range(self.governor.scale_count(config['movements'])):
+            start_x, start_y = self.display.position()
+            left, top, right, bottom = rng.choice(boxes)
+            end_x = rng.randint(left, right)
+            end_y = rng.randint(top, bottom)
+            control_x = rng.randint(min(start_x, end_x), max(start_x, end_x))
+            control_y = rng.randint(min(start_y, end_y), max(start_y, end_y))
+            duration = rng.uniform(config['min_duration'], config['max_duration'])
+            steps = rng.randint(5, 10)
+            for t in range(steps + 1):
+                t_norm = t / steps
+                x = (1 - t_norm)**2 * start_x + 2 * (1 - t_norm) * t_norm * control_x + t_norm**2 * end_x
+                y = (1 - t_norm)**2 * start_y + 2 * (1 - t_norm) * t_norm * control_y + t_norm**2 * end_y
+                await self.dispatch("mouse", "move_to", int(x), int(y), duration=duration/steps)
+            for _ in range(rng.randint(0, 5)):
+                x_small = end_x + rng.randint(-30, 30)
+                y_small = end_y + rng.randint(-30, 30)
+                await self.dispatch("mouse", "move_to", x_small, y_small, duration=rng.uniform(0.1, 0.4))
+            # Micro-pause to mimic human hesitation, as before the behaviors ran as tasks
+            await self._sleep(rng.uniform(0.1, 0.5), "mouse")
+        self.behavior_loggers['mouse'].debug("Mouse simulation cycle completed.")
+
+    async def scroll_round(self, rng):
+        """Vertical then horizontal scrolls at the configured scroll interval"""
+        config = self.host.config['mouse']
+        for action, count in (('scroll', config.get('scrolls', 3)), ('hscroll', config.get('hscrolls', 1))):
+            for _ in range(self.governor.scale_count(count)):
+                amount = rng.choice([-1, 1]) * config.get('scroll_sensitivity', 3)
+                await self.dispatch("mouse", action, amount)
+                await self._sleep(rng.uniform(config.get('scroll_min_interval', 0.2),
+                                              config.get('scroll_max_interval', 1.0)), "scroll")
+
+    async def keyboard_round(self, rng):
+        """Type from a file, Dart snippets, a code block or phrases, per the keyboard settings"""
+        config = self.host.config['keyboard']
+        self.behavior_loggers['keyboard'].debug("Starting keyboard simulation...")
+        typing_file_path = config.get('typing_file_path', '')
+        dart_enabled = config.get('dart_enabled', False)
+        code_writing_enabled = config.get('code_writing_enabled', False)
+        phrases = config.get('phrases', ["hello"])
+        dart_lines = config.get('dart_lines', 10)
+        actions = self.governor.scale_count(config.get('actions', 3))
+
+        if config.get('typing_from_file_enabled', False) and typing_file_path:
+            await self._type_from_file(rng, typing_file_path)
+        elif dart_enabled and self.governor.allows('dart'):
+            for _ in range(actions):
+                code_snippet = rng.choice(DART_CODE_SNIPPETS)
+                lines = code_snippet.split('\n')
+                for i in range(min(len(lines), dart_lines)):
+                    line = lines[i]
+                    for char in line:
+                        await self.dispatch("keyboard", "write", char)
+                        await self._sleep(rng.uniform(0.03, 0.1))
+                    await self.dispatch("keyboard", "press", 'enter')
+                    await self._sleep(rng.uniform(0.1, 0.3))
+                await self.dispatch("keyboard", "scroll", -rng.randint(100, 300))
+                await self._sleep(rng.uniform(0.5, 1.5))
+                await self.dispatch("keyboard", "scroll", rng.randint(50, 150))
+                self.behavior_loggers['keyboard'].debug("Dart code simulation cycle completed.")
+                await self._sleep(self._keyboard_interval(rng), "keyboard")
+        elif code_writing_enabled:
+            for _ in range(actions):
+                await self.dispatch("keyboard", "write", "--------------------------------\n")
+                code_snippet = "def example_function():\n    print('This is a test code snippet.')\n    return True\n"
+                await self.dispatch("keyboard", "write", code_snippet)
+                await self._sleep(rng.uniform(2.0, 4.0))  # Wait before erasing
+                await self.dispatch("keyboard", "hotkey", 'ctrl', 'a')  # Select all
+                await self._sleep(0.5)
+                await self.dispatch("keyboard", "press", 'backspace')  # Delete selected text
+                await self._sleep(rng.uniform(0.2, 1.0))
+                await self._sleep(self._keyboard_interval(rng), "keyboard")
+        else:
+            for _ in range(actions):
+                phrase = rng.choice(phrases)
+                await self.dispatch("keyboard", "write", phrase, interval=rng.uniform(0.05, 0.15))
+                await self.dispatch("keyboard", "press", 'enter')
+                await self._sleep(rng.uniform(0.2, 1.0))
+                await self._sleep(self._keyboard_interval(rng), "keyboard")
+        self.behavior_loggers['keyboard'].debug("Keyboard simulation cycle completed.")
+
+    def _keyboard_interval(self, rng):
+        config = self.host.config['keyboard']
+        return rng.uniform(config.get('min_interval', 2.0), config.get('max_interval', 10.0))
+
+    async def _type_from_file(self, rng, typing_file_path):
+        """Type the file line by line until the setting is turned off or the engine stops"""
+        try:
+            with open(typing_file_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except Exception as e:
+            self.behavior_loggers['keyboard'].error("Failed to type from file: %s", e)
+            return
+        if not lines:
+            self.behavior_loggers['keyboard'].warning("Selected file %s is empty.", typing_file_path)
+            return
+        config = self.host.config['keyboard']
+        idx = 0
+        while self.running and config.get('typing_from_file_enabled', False) and config.get('typing_file_path') == typing_file_path:
+            line = lines[idx % len(lines)].rstrip('\n')
+            await self.dispatch("keyboard", "write", line, interval=0.08)
+            await self.dispatch("keyboard", "press", 'enter')
+            idx += 1
+            await self._sleep(self._keyboard_interval(rng), "keyboard")
+            # Reload file if changed
+            try:
+                with open(typing_file_path, 'r', encoding='utf-8') as f:
+                    new_lines = f.readlines()
+                if new_lines != lines:
+                    lines = new_lines
+                    idx = 0
+            except Exception:
+                pass
+            config = self.host.config['keyboard']
+
+    async def browser_round(self, rng):
+        """Open and close a selenium session off the event loop, then wait the browser interval"""
+        self.behavior_loggers['browser'].debug("Starting browser simulation...")
+        await asyncio.get_running_loop().run_in_executor(None, self._browser_session, rng)
+        config = self.host.config['browser']
+        await self._sleep(rng.uniform(config['min_interval'], config['max_interval']), "browser")
+
+    def _browser_session(self, rng):
+        """One selenium session; failures (including a missing selenium) go to the browser breaker"""
+        from selenium import webdriver  # type: ignore
+        from selenium.webdriver.chrome.options import Options  # type: ignore
+        chrome_options = Options()
+        if self.host.config['browser']['headless']:
+            chrome_options.add_argument("--headless")
+        browser_version = f"{rng.randint(90, 120)}.0.{rng.randint(4000, 5000)}.{rng.randint(100, 200)}"
+        os_platforms = [
+            "Windows NT 10.0; Win64; x64",
+            "Windows NT 6.1; Win64; x64",
+            "Macintosh; Intel Mac OS X 10_15_7",
+            "Macintosh; Intel Mac OS X 11_2_3"
+        ]
+        os_platform = rng.choice(os_platforms)
+        user_agent = f"Mozilla/5.0 ({os_platform}) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{browser_version} Safari/537.36"
+        chrome_options.add_argument(f"user-agent={user_agent}")
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--no-sandbox")
+        if not self.host.config['browser']['headless']:
+            width = rng.randint(800, 1920)
+            height = rng.randint(600, 1080)
+            chrome_options.add_argument(f"--window-size={width},{height}")
+            self.behavior_loggers['browser'].debug("Setting browser window size to %dx%d", width, height)
+        chrome_options.add_argument("--disable-webgl")
+        chrome_options.add_argument("--disable-canvas-aa")
+        chrome_options.add_argument("--disable-2d-canvas-clip-aa")
+        driver = webdriver.Chrome(options=chrome_options)
+        try:
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            # ... rest of browser simulation ...
+        finally:
+            driver.quit()
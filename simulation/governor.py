@@ -0,0 +1,279 @@
+"""System-load and battery governor for the engine.
+
+Every ``interval`` seconds the governor samples the load average per CPU,
+Linux CPU pressure (/proc/pressure/cpu) and the battery (psutil, optional)
+and picks an intensity level. Where the OS has no load average (Windows),
+psutil's emulated one is used, or else system CPU% as a fraction of all CPUs:
+
+    normal   full counts and intervals
+    reduced  on battery, or load/pressure over threshold: half the actions,
+             no browser sessions or Dart typing
+    minimal  battery low, or load over twice the threshold: a quarter of
+             the actions
+
+A throttled level only clears once every reading is back under 80% of its
+threshold, so the engine does not flap around a limit.
+
+BudgetGovernor does the same for the process's own footprint: it keeps
+CPU% and RSS under a configured budget by stretching intervals, coarsening
+glide slices and finally shedding the behavior that burns the most CPU.
+Per-thread CPU tells it whether the engine is to blame at all.
+"""
+import gc
+import os
+import time
+
+from logic import log_config
+from logic.resources import ProcessSampler, ThreadSampler, psutil
+
+NORMAL = "normal"
+REDUCED = "reduced"
+MINIMAL = "minimal"
+
+FACTORS = {NORMAL: 1.0, REDUCED: 0.5, MINIMAL: 0.25}
+
+# Behaviors (and keyboard modes) that are dropped while throttled
+EXPENSIVE = {'browser', 'dart'}
+
+# Fraction of a threshold a reading must fall under before throttling clears
+RECOVERY = 0.8
+
+# The engine's event loop thread; behaviors are only shed when it is the busiest thread
+ENGINE_THREAD = "simulation"
+
+# Minimum seconds between forced garbage collections while RSS is over budget
+GC_INTERVAL = 60.0
+
+def sample_system():
+    """Return the current load readings; unavailable values are None"""
+    sample = {'load_per_cpu': None, 'cpu_pressure': None, 'battery_percent': None, 'on_battery': False}
+    try:
+        sample['load_per_cpu'] = os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        # Windows has no load average
+        sample['load_per_cpu'] = _psutil_load()
+    try:
+        with open('/proc/pressure/cpu') as f:
+            # "some avg10=1.23 avg60=... avg300=... total=..."
+            fields = dict(item.split('=') for item in f.readline().split()[1:])
+            sample['cpu_pressure'] = float(fields['avg10'])
+    except (OSError, KeyError, ValueError):
+        pass
+    if psutil is not None:
+        try:
+            battery = psutil.sensors_battery()
+        except Exception:
+            battery = None
+        if battery is not None:
+            sample['battery_percent'] = battery.percent
+            sample['on_battery'] = not battery.power_plugged
+    return sample
+
+def _psutil_load():
+    """Load per CPU from psutil: its emulated load average, else system CPU% / 100; None without psutil"""
+    if psutil is None:
+        return None
+    try:
+        return psutil.getloadavg()[0] / (psutil.cpu_count() or 1)
+    except (AttributeError, OSError):
+        pass  # psutil < 5.6.2
+    try:
+        return psutil.cpu_percent(interval=None) / 100
+    except Exception:
+        return None
+
+class LoadGovernor:
+    """Maps system readings to an intensity level the behaviors scale by"""
+    def __init__(self, config, sampler=None, logger=None):
+        self.sampler = sampler or sample_system
+        self.logger = logger or log_config.get_logger("governor")
+        self.configure(config)
+        self.level = NORMAL
+        self.reasons = []
+        self.last_sample = {}
+        self.warned_no_load = False
+
+    def configure(self, config):
+        section = (config or {}).get('governor', {})
+        self.enabled = bool(section.get('enabled', True))
+        self.interval = float(section.get('interval', 30.0))
+        self.load_threshold = float(section.get('load_per_cpu', 0.8))
+        self.pressure_threshold = float(section.get('cpu_pressure', 20.0))
+        self.battery_threshold = float(section.get('battery_percent', 30.0))
+        self.throttle_on_battery = bool(section.get('throttle_on_battery', True))
+        if not self.enabled:
+            self.level = NORMAL
+            self.reasons = []
+
+    @property
+    def factor(self):
+        return FACTORS[self.level]
+
+    @property
+    def throttled(self):
+        return self.level != NORMAL
+
+    def allows(self, name):
+        """False for expensive behaviors while throttled"""
+        return not (self.throttled and name in EXPENSIVE)
+
+    def scale_count(self, count):
+        """Scale an action count, keeping at least one action"""
+        if count <= 0:
+            return count
+        return max(1, int(round(count * self.factor)))
+
+    def scale_interval(self, seconds):
+        return seconds / self.factor
+
+    def update(self):
+        """Sample and re-evaluate; returns True if the level changed"""
+        if not self.enabled:
+            return False
+        self.last_sample = sample = self.sampler()
+        if sample.get('load_per_cpu') is None and sample.get('cpu_pressure') is None and not self.warned_no_load:
+            self.warned_no_load = True
+            self.logger.warning("Load governor: no load average or CPU pressure here (install psutil); "
+                                "throttling on battery only.")
+        # While throttled a reading must drop below RECOVERY x threshold to count as clear
+        margin = RECOVERY if self.throttled else 1.0
+        reasons = []
+        level = NORMAL
+        load = sample.get('load_per_cpu')
+        if load is not None and load >= self.load_threshold * margin:
+            reasons.append(f"load {load:.2f}/cpu")
+            level = MINIMAL if load >= 2 * self.load_threshold else REDUCED
+        pressure = sample.get('cpu_pressure')
+        if pressure is not None and pressure >= self.pressure_threshold * margin:
+            reasons.append(f"cpu pressure {pressure:.0f}%")
+            level = max(level, REDUCED, key=list(FACTORS).index)
+        if sample.get('on_battery'):
+            battery = sample.get('battery_percent')
+            if battery is not None and battery <= self.battery_threshold:
+                reasons.append(f"battery {battery:.0f}%")
+                level = MINIMAL
+            elif self.throttle_on_battery:
+                reasons.append("on battery")
+                level = max(level, REDUCED, key=list(FACTORS).index)
+        changed = level != self.level
+        self.level = level
+        self.reasons = reasons
+        if changed:
+            if level == NORMAL:
+                self.logger.info("Load governor: back to normal intensity.")
+            else:
+                self.logger.info("Load governor: %s intensity (%s).", level, ', '.join(reasons))
+        return changed
+
+    def describe(self):
+        """Short text for the tray tooltip"""
+        if not self.throttled:
+            return ""
+        return f"Throttled ({self.level}): {', '.join(self.reasons)}"
+
+    def status(self):
+        return {'enabled': self.enabled, 'level': self.level, 'factor': self.factor,
+                'reasons': list(self.reasons), 'sample': dict(self.last_sample)}
+
+class BudgetGovernor:
+    """Feedback controller that keeps the process within its CPU and RSS budget.
+
+    Each update multiplies ``stretch`` (applied to interval sleeps) by how far
+    CPU or RSS is over budget, whichever is further. At MAX_STRETCH the task
+    with the most injection CPU time in the last window is shed, provided the
+    engine thread is the busiest thread of the process. Once CPU and RSS are
+    back under RECOVERY x budget, shed tasks return one per update and then
+    the stretch decays. While RSS is over budget, gc.collect() runs at most
+    once per GC_INTERVAL.
+    """
+    MAX_STRETCH = 8.0
+
+    def __init__(self, config, sampler=None, thread_sampler=None, logger=None):
+        self.sampler = sampler or ProcessSampler().sample
+        self.thread_sampler = thread_sampler or ThreadSampler().sample
+        self.logger = logger or log_config.get_logger("governor")
+        self.stretch = 1.0
+        self.shed = []
+        self.violation = None
+        self.last_sample = {}
+        self.last_cpu = {}
+        self.top_thread = None
+        self.last_gc = None
+        self.configure(config)
+
+    def configure(self, config):
+        section = (config or {}).get('governor', {})
+        self.enabled = bool(section.get('enabled', True))
+        self.interval = float(section.get('budget_interval', 5.0))
+        self.cpu_budget = float(section.get('cpu_budget_percent', 5.0))
+        self.rss_budget = float(section.get('rss_budget_mb', 200.0))
+        if not self.enabled:
+            self.stretch = 1.0
+            self.shed = []
+
+    @property
+    def motion_scale(self):
+        """Glide slice multiplier: fewer, longer slices while stretched"""
+        return 2.0 if self.stretch >= 2.0 else 1.0
+
+    def allows(self, name):
+        return name not in self.shed
+
+    def update(self, cpu_seconds):
+        """Sample the process; ``cpu_seconds`` is cumulative CPU per engine task.
+        Returns True if the set of shed tasks changed."""
+        if not self.enabled:
+            return False
+        self.last_sample = sample = self.sampler()
+        threads = self.thread_sampler()
+        self.top_thread = threads[0] if threads and threads[0]['cpu_percent'] > 0 else None
+        window = {task: max(0.0, seconds - self.last_cpu.get(task, 0.0)) for task, seconds in cpu_seconds.items()}
+        self.last_cpu = dict(cpu_seconds)
+        offender = max(window, key=window.get) if any(window.values()) else None
+        # Shedding a behavior only helps if the engine, not the UI or a library thread, burns the CPU
+        engine_busiest = self.top_thread is None or self.top_thread['name'] == ENGINE_THREAD
+        cpu, rss = sample['cpu_percent'], sample['ram_mb']
+        over = []
+        if cpu > self.cpu_budget:
+            over.append(f"CPU {cpu:.1f}% > {self.cpu_budget:.1f}%")
+        if rss > self.rss_budget:
+            over.append(f"RSS {rss:.0f} MB > {self.rss_budget:.0f} MB")
+            now = time.monotonic()
+            if self.last_gc is None or now - self.last_gc >= GC_INTERVAL:
+                self.last_gc = now
+                gc.collect()
+        pressure = max(cpu / self.cpu_budget, rss / self.rss_budget)
+        shed_before = list(self.shed)
+        if pressure > 1.0:
+            self.stretch = min(self.MAX_STRETCH, self.stretch * min(2.0, max(1.25, pressure)))
+            if self.stretch >= self.MAX_STRETCH and engine_busiest and offender and offender not in self.shed:
+                self.shed.append(offender)
+                self.logger.warning("Resource budget: shedding %s until usage drops.", offender)
+        elif pressure < RECOVERY:
+            if self.shed:
+                restored = self.shed.pop()
+                self.logger.info("Resource budget: resuming %s.", restored)
+            else:
+                self.stretch = max(1.0, self.stretch / 1.25)
+        # Log once per episode, not once per sample
+        if over and self.violation is None:
+            self.violation = offender
+            top = self.top_thread
+            self.logger.warning("Over resource budget (%s); busiest thread: %s; top engine task: %s. Slowing down.",
+                                '; '.join(over), f"{top['name']} ({top['cpu_percent']:.1f}%)" if top else 'none',
+                                offender or 'none')
+        elif not over and self.violation is not None and not self.shed and self.stretch == 1.0:
+            self.violation = None
+            self.logger.info("Back within resource budget.")
+        return self.shed != shed_before
+
+    def describe(self):
+        if self.stretch == 1.0 and not self.shed:
+            return ""
+        text = f"Over budget: intervals x{self.stretch:.1f}"
+        return text + (f", shed {', '.join(self.shed)}" if self.shed else "")
+
+    def status(self):
+        return {'enabled': self.enabled, 'stretch': self.stretch, 'shed': list(self.shed),
+                'cpu_budget_percent': self.cpu_budget, 'rss_budget_mb': self.rss_budget,
+                'top_thread': dict(self.top_thread) if self.top_thread else None, 'sample': dict(self.last_sample)}
@@ -0,0 +1,222 @@
+"""Headless daemon: runs the simulation engine without Tk, PIL or pystray.
+
+Control it with signals (POSIX):
+    SIGTERM / SIGINT  stop the engine and exit
+    SIGHUP            reload the config file
+    SIGUSR1           pause
+    SIGUSR2           resume
+
+With the 'schedule' section enabled the engine only runs inside its
+activity windows.
+"""
+import argparse
+import logging
+import os
+import signal
+import sys
+import threading
+
+from logic import log_config
+from logic.control_server import ControlServer, log_levels_result, metrics_result, profiler_handlers
+from logic.profiler import SamplingProfiler
+from logic.config_manager import diff_configs, get_default_config, load_config_file, save_config_file
+from logic.resources import get_process_footprint
+from logic.schedule import ScheduleRunner
+from logic.timers import TimerService
+from simulation.display import LayoutProbe
+from simulation.engine import SimulationEngine
+from simulation.input_backend import FakeInputBackend, PyAutoGUIBackend
+from simulation.trace import TraceReplayer
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Seconds between checks of the monitor layout
+DISPLAY_CHECK_INTERVAL = 5.0
+
+class HeadlessHost:
+    """Config store for the engine backed by a single JSON file"""
+    def __init__(self, config_file, logger):
+        self.config_file = config_file
+        self.logger = logger
+        self.config = self.load_config()
+
+    def load_config(self):
+        """Load configuration from file, creating it from defaults if missing"""
+        try:
+            if os.path.exists(self.config_file):
+                return load_config_file(self.config_file)
+            config = self.get_default_config()
+            save_config_file(self.config_file, config)
+            return config
+        except Exception as e:
+            self.logger.error("Failed to load configuration: %s", e)
+            return self.get_default_config()
+
+    def get_default_config(self):
+        """Get default configuration"""
+        return get_default_config()
+
+class HeadlessDaemon:
+    def __init__(self, config_file, logger=None, dry_run=False, seed=None, trace_file=None):
+        self.logger = logger or log_config.get_logger()
+        self.host = HeadlessHost(config_file, self.logger)
+        log_config.apply_config(self.host.config)
+        engine_config = self.host.config.setdefault('engine', {})
+        if seed is not None:
+            engine_config['seed'] = seed
+        if trace_file:
+            engine_config['trace_file'] = trace_file
+        input_backend = FakeInputBackend(record=False) if dry_run else None
+        self.engine = SimulationEngine(self.host, on_status=self._on_status, logger=self.logger,
+                                       input_backend=input_backend)
+        self.exit_event = threading.Event()
+        self.control_server = None
+        self.profiler = SamplingProfiler(os.path.dirname(os.path.abspath(config_file)))
+        self.timers = TimerService()
+        self.schedule_runner = ScheduleRunner(self.host.config, on_change=self._on_schedule, timers=self.timers)
+
+    def _on_schedule(self, active):
+        if active:
+            self.engine.start()
+        else:
+            self.engine.stop(timeout=2)
+
+    def _on_status(self, status):
+        self.logger.info("Engine status: %s", status)
+
+    def reload_config(self):
+        changes = diff_configs(self.host.config, self.host.load_config())
+        affected = self.engine.apply_config(changes)
+        self.engine.display_changed()
+        if 'schedule' in changes:
+            self.schedule_runner.reload(self.host.config)
+        log_config.get_logger('config').info("Configuration reloaded (%d sections changed, reconfigured: %s).",
+                                             len(changes), ', '.join(affected) or 'none')
+
+    def watch_display(self):
+        """Invalidate the engine's monitor geometry when the OS layout changes; no-op without a display"""
+        try:
+            self.layout_probe = LayoutProbe()
+        except Exception:
+            return
+        self.display_signature = self.layout_probe.signature()
+        self.timers.every(DISPLAY_CHECK_INTERVAL, self.check_display_change, tolerance=1.0)
+
+    def check_display_change(self):
+        signature = self.layout_probe.signature()
+        if signature != self.display_signature:
+            self.display_signature = signature
+            self.engine.display_changed()
+
+    def shutdown(self):
+        self.exit_event.set()
+
+    def control_handlers(self):
+        """Methods exposed on the control socket"""
+        def then_status(action):
+            def handler(params):
+                action()
+                return self.engine.status()
+            return handler
+        handlers = {
+            'start': then_status(self.engine.start),
+            'stop': then_status(self.engine.stop),
+            'pause': then_status(lambda: self.engine.pause("control API")),
+            'resume': then_status(self.engine.resume),
+            'status': then_status(lambda: None),
+            'reload_config': then_status(self.reload_config),
+            'display_changed': then_status(self.engine.display_changed),
+            'metrics': lambda params: metrics_result(self.engine.metrics, params),
+            'schedule': lambda params: self.schedule_runner.status(),
+            'timers': lambda params: self.timers.status(),
+            'log_levels': lambda params: log_levels_result(self.engine, self.host.config, params),
+        }
+        handlers.update(profiler_handlers(self.profiler))
+        return handlers
+
+    def start_control_server(self):
+        control = self.host.config.get('control', {})
+        if not control.get('enabled', True):
+            return
+        self.control_server = ControlServer(self.control_handlers(), path=control.get('socket_path') or None)
+        self.control_server.start()
+
+    def install_signal_handlers(self):
+        handlers = {
+            'SIGTERM': lambda signum, frame: self.shutdown(),
+            'SIGINT': lambda signum, frame: self.shutdown(),
+            'SIGHUP': lambda signum, frame: self.reload_config(),
+            'SIGUSR1': lambda signum, frame: self.engine.pause("SIGUSR1"),
+            'SIGUSR2': lambda signum, frame: self.engine.resume(),
+        }
+        for name, handler in handlers.items():
+            signum = getattr(signal, name, None)
+            if signum is not None:
+                signal.signal(signum, handler)
+
+    def run(self):
+        """Start the engine and block until a termination signal arrives"""
+        self.install_signal_handlers()
+        self.start_control_server()
+        if self.schedule_runner.enabled:
+            self.logger.info("Schedule enabled; the engine runs only inside its activity windows.")
+        else:
+            self.engine.start()
+        self.watch_display()
+        self.timers.start()
+        self.schedule_runner.start()
+        footprint = get_process_footprint()
+        self.logger.info("Headless daemon started (pid %d, RSS %.1f MB, threads %d).",
+                         os.getpid(), footprint['ram_mb'], footprint['threads'])
+        # Event.wait() with a timeout keeps the main thread responsive to
+        # signals on every platform without a periodic busy loop of our own.
+        while not self.exit_event.wait(3600):
+            pass
+        self.schedule_runner.stop()
+        self.timers.stop()
+        self.engine.close()
+        if self.control_server:
+            self.control_server.stop()
+        self.logger.info("Headless daemon stopped.")
+
+def replay(trace_file, dry_run=False, speed=1.0, logger=None):
+    """Re-dispatch a recorded action trace and return the number of actions"""
+    logger = logger or log_config.get_logger("engine")
+    backend = FakeInputBackend(record=False) if dry_run else PyAutoGUIBackend()
+    replayer = TraceReplayer(trace_file, backend)
+    for name in ('SIGTERM', 'SIGINT'):
+        signum = getattr(signal, name, None)
+        if signum is not None:
+            signal.signal(signum, lambda signum, frame: replayer.stop())
+    logger.info("Replaying action trace %s at %sx.", trace_file, speed)
+    count = replayer.run(speed=speed)
+    logger.info("Replay finished: %d actions.", count)
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the simulation engine without a GUI.")
+    parser.add_argument('--config', default=os.path.join(project_root, "config", "anoid.json"),
+                        help="Path to the JSON config file")
+    parser.add_argument('--log-file', default=os.path.join(project_root, "config", "anoid.log"),
+                        help="Path to the log file")
+    parser.add_argument('--verbose', action='store_true', help="Also log to stderr")
+    parser.add_argument('--dry-run', action='store_true', help="Use a fake input backend that injects nothing")
+    parser.add_argument('--seed', type=int, default=None, help="Seed the engine RNG for reproducible runs")
+    parser.add_argument('--trace', default=None, help="Record every dispatched action to this binary trace file")
+    parser.add_argument('--replay', default=None, help="Replay a recorded trace instead of running the engine")
+    parser.add_argument('--speed', type=float, default=1.0, help="Replay speed multiplier")
+    args = parser.parse_args(argv)
+
+    handlers = [logging.FileHandler(args.log_file)]
+    if args.verbose:
+        handlers.append(logging.StreamHandler())
+    logging.basicConfig(level=logging.INFO, format=log_config.FORMAT,
+                        handlers=handlers)
+    if args.replay:
+        replay(args.replay, dry_run=args.dry_run, speed=args.speed)
+        return 0
+    HeadlessDaemon(args.config, dry_run=args.dry_run, seed=args.seed, trace_file=args.trace).run()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""Activity history in a local SQLite database.
+
+While the engine runs, a SessionRecorder adds up the actions per behavior
+from the engine metrics and queues them every ``flush_interval`` seconds
+and when the run ends. One "history" thread owns the connection and writes
+everything queued since its last transaction in a single transaction. The
+database is in WAL mode, so reports can read while it writes.
+
+Tables:
+
+    sessions  one row per engine run: start and end time, active and paused seconds, actions
+    activity  actions per hour (unix time of the hour) and behavior of each session
+
+The ``hourly_activity`` view sums activity over sessions. Reports:
+
+    python -m simulation.history hourly --days 30
+    python -m simulation.history daily --days 30
+    python -m simulation.history sessions --limit 20
+"""
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+from logic import log_config
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "config", "anoid-history.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    ended REAL NOT NULL,
+    active_seconds REAL NOT NULL,
+    paused_seconds REAL NOT NULL,
+    actions INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions (started);
+CREATE TABLE IF NOT EXISTS activity (
+    hour INTEGER NOT NULL,
+    behavior TEXT NOT NULL,
+    session INTEGER NOT NULL,
+    actions INTEGER NOT NULL,
+    PRIMARY KEY (hour, behavior, session)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS activity_behavior ON activity (behavior, hour);
+CREATE VIEW IF NOT EXISTS hourly_activity AS
+    SELECT hour, behavior, SUM(actions) AS actions FROM activity GROUP BY hour, behavior;
+"""
+
+ADD_ACTIVITY = """
+INSERT INTO activity (hour, behavior, session, actions) VALUES (?, ?, ?, ?)
+ON CONFLICT (hour, behavior, session) DO UPDATE SET actions = actions + excluded.actions
+"""
+
+SAVE_SESSION = """
+INSERT OR REPLACE INTO sessions (id, started, ended, active_seconds, paused_seconds, actions)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+def connect(path):
+    """Open (and create) the history database in WAL mode"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+class HistoryWriter:
+    """Queues history rows for the "history" thread; add() and save_session() never block"""
+    def __init__(self, path, logger=None):
+        self.path = path
+        self.logger = logger or log_config.get_logger("history")
+        self.queue = queue.SimpleQueue()
+        self.thread = None
+        self.transactions = 0
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="history", daemon=True)
+            self.thread.start()
+
+    def add(self, rows):
+        """rows: (hour, behavior, session, actions) tuples"""
+        self.queue.put((ADD_ACTIVITY, rows))
+
+    def save_session(self, row):
+        """row: (id, started, ended, active_seconds, paused_seconds, actions)"""
+        self.queue.put((SAVE_SESSION, [row]))
+
+    def close(self, timeout=5):
+        """Write what is queued and end the thread"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join(timeout=timeout)
+            self.thread = None
+
+    def _run(self):
+        try:
+            conn = connect(self.path)
+        except (sqlite3.Error, OSError) as e:
+            self.logger.error("Cannot open activity history %s: %s", self.path, e)
+            while self.queue.get() is not None:
+                pass
+            return
+        try:
+            done = False
+            while not done:
+                batch = [self.queue.get()]
+                while True:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                done = None in batch
+                try:
+                    with conn:
+                        for item in batch:
+                            if item is not None:
+                                conn.executemany(*item)
+                    self.transactions += 1
+                except sqlite3.Error as e:
+                    self.logger.error("Activity history write failed: %s", e)
+        finally:
+            conn.close()
+
+class SessionRecorder:
+    """Turns one engine run's metrics into history rows (engine thread only)"""
+    def __init__(self, writer, metrics, clock):
+        self.writer = writer
+        self.metrics = metrics
+        self.clock = clock
+        self.started = self.clock.time()
+        self.id = int(self.started * 1000)
+        self.actions = {}
+        self.total = 0
+        self.paused = 0.0
+        self.baseline, self.paused_baseline = self._read()
+
+    def _read(self):
+        actions = {}
+        for (name, labels), value in list(self.metrics.counters.items()):
+            if name == 'anoid_actions':
+                behavior = labels[0][1]
+                actions[behavior] = actions.get(behavior, 0) + value
+        return actions, self.metrics.counters.get(('anoid_paused_seconds', ()), 0.0)
+
+    def flush(self, paused_now=0.0):
+        """Queue the actions since the last flush and the session totals; ``paused_now`` is an ongoing pause"""
+        actions, paused = self._read()
+        hour = int(self.clock.time()) // 3600 * 3600
+        rows = []
+        for behavior, value in actions.items():
+            # Counters only grow during a run; a smaller value means they were reset
+            delta = value - self.baseline.get(behavior, 0) if value >= self.baseline.get(behavior, 0) else value
+            if delta:
+                rows.append((hour, behavior, self.id, delta))
+                self.total += delta
+        self.baseline = actions
+        if rows:
+            self.writer.add(rows)
+        self.paused = max(0.0, paused - self.paused_baseline) + paused_now
+        ended = self.clock.time()
+        active = max(0.0, ended - self.started - self.paused)
+        self.writer.save_session((self.id, self.started, ended, active, self.paused, self.total))
+
+def hourly(conn, days=30, now=None):
+    """[(hour, behavior, actions)] for the last ``days`` days, oldest first"""
+    since = int((now or time.time()) - days * 86400) // 3600 * 3600
+    return conn.execute("SELECT hour, behavior, SUM(actions) FROM activity WHERE hour >= ? "
+                        "GROUP BY hour, behavior ORDER BY hour, behavior", (since,)).fetchall()
+
+def daily(conn, days=30, now=None):
+    """[(local date, behavior, actions)] for the last ``days`` days, from the hourly totals"""
+    totals = {}
+    for hour, behavior, actions in hourly(conn, days, now):
+        key = (datetime.fromtimestamp(hour).date().isoformat(), behavior)
+        totals[key] = totals.get(key, 0) + actions
+    return [(day, behavior, actions) for (day, behavior), actions in sorted(totals.items())]
+
+def sessions(conn, limit=20):
+    """The most recent sessions, newest first"""
+    return conn.execute("SELECT id, started, ended, active_seconds, paused_seconds, actions FROM sessions "
+                        "ORDER BY started DESC LIMIT ?", (limit,)).fetchall()
+
+def _print_table(header, rows):
+    widths = [max(len(str(value)) for value in column) for column in zip(header, *rows)]
+    for row in [header] + rows:
+        print("  ".join(str(value).ljust(width) for value, width in zip(row, widths)).rstrip())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m simulation.history", description="Activity history reports")
+    parser.add_argument('report', choices=['hourly', 'daily', 'sessions'])
+    parser.add_argument('--db', default=DEFAULT_PATH, help="History database (default: config/anoid-history.db)")
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--limit', type=int, default=20, help="Sessions to list")
+    parser.add_argument('--json', action='store_true', help="Print JSON rows")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.db):
+        print(f"No activity history at {args.db}", file=sys.stderr)
+        return 1
+    conn = connect(args.db)
+    try:
+        if args.report == 'hourly':
+            header = ('hour', 'behavior', 'actions')
+            rows = [(datetime.fromtimestamp(hour).strftime("%Y-%m-%d %H:00"), behavior, actions)
+                    for hour, behavior, actions in hourly(conn, args.days)]
+        elif args.report == 'daily':
+            header = ('day', 'behavior', 'actions')
+            rows = daily(conn, args.days)
+        else:
+            header = ('started', 'ended', 'active_min', 'paused_min', 'actions')
+            rows = [(datetime.fromtimestamp(started).strftime("%Y-%m-%d %H:%M"),
+                     datetime.fromtimestamp(ended).strftime("%Y-%m-%d %H:%M"),
+                     round(active / 60, 1), round(paused / 60, 1), actions)
+                    for _, started, ended, active, paused, actions in sessions(conn, args.limit)]
+    finally:
+        conn.close()
+    if args.json:
+        print(json.dumps([dict(zip(header, row)) for row in rows], indent=2))
+    else:
+        _print_table(header, rows)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
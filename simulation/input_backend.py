@@ -0,0 +1,195 @@
+"""Input backends: the only place the engine touches the OS input APIs."""
+import time
+
+class PyAutoGUIBackend:
+    """Injects real input through pyautogui (imported lazily)"""
+    def __init__(self):
+        import pyautogui  # type: ignore
+        pyautogui.FAILSAFE = False  # Disable fail-safe to prevent interruption
+        # No built-in 0.1 s pause after each call: the engine paces actions itself
+        # and needs every call to return promptly so pause/stop stay interruptible
+        pyautogui.PAUSE = 0
+        self.pyautogui = pyautogui
+
+    def size(self):
+        return self.pyautogui.size()
+
+    def monitors(self):
+        """Monitor rectangles (x, y, width, height), primary first"""
+        try:
+            from screeninfo import get_monitors  # type: ignore
+            found = sorted(get_monitors(), key=lambda m: not m.is_primary)
+            if found:
+                return [(m.x, m.y, m.width, m.height) for m in found]
+        except Exception:
+            pass  # screeninfo missing or unsupported: fall back to the primary screen
+        width, height = self.size()
+        return [(0, 0, width, height)]
+
+    def position(self):
+        return self.pyautogui.position()
+
+    def move_to(self, x, y, duration=0.0):
+        self.pyautogui.moveTo(x, y, duration=duration)
+
+    def click(self):
+        self.pyautogui.click()
+
+    def double_click(self):
+        self.pyautogui.doubleClick()
+
+    def right_click(self):
+        self.pyautogui.rightClick()
+
+    def scroll(self, amount):
+        self.pyautogui.scroll(amount)
+
+    def hscroll(self, amount):
+        self.pyautogui.hscroll(amount)
+
+    def write(self, text, interval=0.0):
+        self.pyautogui.write(text, interval=interval)
+
+    def press(self, key, presses=1):
+        self.pyautogui.press(key, presses=presses)
+
+    def hotkey(self, *keys):
+        self.pyautogui.hotkey(*keys)
+
+class InstrumentedBackend:
+    """Wraps a backend and records per-primitive latency and action counts"""
+    def __init__(self, backend, metrics):
+        self.backend = backend
+        self.metrics = metrics
+        self._behavior = "engine"
+        # Engine task that queued the current action; injection CPU time is charged to it
+        self.task = "engine"
+
+    @property
+    def behavior(self):
+        return self._behavior
+
+    @behavior.setter
+    def behavior(self, name):
+        # Let wrapped backends (e.g. a trace recorder) tag actions too
+        self._behavior = name
+        if hasattr(self.backend, 'behavior'):
+            self.backend.behavior = name
+
+    def _timed(self, primitive, func, *args, **kwargs):
+        self.metrics.note_action_started()
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.metrics.observe_injection(primitive, time.perf_counter() - started)
+            self.metrics.add_cpu_time(self.task, time.thread_time() - cpu_started)
+
+    def size(self):
+        return self.backend.size()
+
+    def monitors(self):
+        return self.backend.monitors()
+
+    def position(self):
+        return self.backend.position()
+
+    def move_to(self, x, y, duration=0.0):
+        self._timed('move_to', self.backend.move_to, x, y, duration=duration)
+        self.metrics.count_action(self.behavior, 'move')
+
+    def click(self):
+        self._timed('click', self.backend.click)
+        self.metrics.count_action(self.behavior, 'click')
+
+    def double_click(self):
+        self._timed('double_click', self.backend.double_click)
+        self.metrics.count_action(self.behavior, 'double_click')
+
+    def right_click(self):
+        self._timed('right_click', self.backend.right_click)
+        self.metrics.count_action(self.behavior, 'right_click')
+
+    def scroll(self, amount):
+        self._timed('scroll', self.backend.scroll, amount)
+        self.metrics.count_action(self.behavior, 'scroll')
+
+    def hscroll(self, amount):
+        self._timed('hscroll', self.backend.hscroll, amount)
+        self.metrics.count_action(self.behavior, 'hscroll')
+
+    def write(self, text, interval=0.0):
+        self._timed('write', self.backend.write, text, interval=interval)
+        self.metrics.count_action(self.behavior, 'keystroke', len(text))
+
+    def press(self, key, presses=1):
+        self._timed('press', self.backend.press, key, presses=presses)
+        self.metrics.count_action(self.behavior, 'keystroke', presses)
+
+    def hotkey(self, *keys):
+        self._timed('hotkey', self.backend.hotkey, *keys)
+        self.metrics.count_action(self.behavior, 'hotkey')
+
+class FakeInputBackend:
+    """Records input instead of injecting it; used by benchmarks and headless tests.
+
+    With a ``clock`` the durations real input would take (mouse glides, typing
+    intervals) are spent on that clock, so virtual-time runs keep realistic pacing.
+    """
+    def __init__(self, width=1920, height=1080, record=True, clock=None, monitors=None):
+        self.width = width
+        self.height = height
+        self.clock = clock
+        self.monitor_rects = monitors or [(0, 0, width, height)]
+        self.x = width // 2
+        self.y = height // 2
+        self.record = record
+        self.calls = []
+
+    def _log(self, *call):
+        if self.record:
+            self.calls.append(call)
+
+    def size(self):
+        return (self.width, self.height)
+
+    def monitors(self):
+        return list(self.monitor_rects)
+
+    def position(self):
+        return (self.x, self.y)
+
+    def _spend(self, seconds):
+        if self.clock is not None:
+            self.clock.sleep(seconds)
+
+    def move_to(self, x, y, duration=0.0):
+        self.x, self.y = x, y
+        self._spend(duration)
+        self._log('move_to', x, y)
+
+    def click(self):
+        self._log('click')
+
+    def double_click(self):
+        self._log('double_click')
+
+    def right_click(self):
+        self._log('right_click')
+
+    def scroll(self, amount):
+        self._log('scroll', amount)
+
+    def hscroll(self, amount):
+        self._log('hscroll', amount)
+
+    def write(self, text, interval=0.0):
+        self._spend(len(text) * interval)
+        self._log('write', text)
+
+    def press(self, key, presses=1):
+        self._log('press', key, presses)
+
+    def hotkey(self, *keys):
+        self._log('hotkey', keys)
@@ -0,0 +1,282 @@
+"""Engine instrumentation: counters and fixed-bucket latency histograms.
+
+Most writes come from the engine thread, but pause, resume and stop arrive
+from the Tk, listener and control threads, so every read-modify-write takes a
+short, uncontended lock. Readers on other threads copy the dicts and may see
+a value one update behind. Output is OpenMetrics text.
+"""
+import threading
+from bisect import bisect_left
+
+from simulation.clock import REAL_CLOCK
+
+# Upper bounds in seconds; the implicit last bucket is +Inf
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect plus two additions"""
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Approximate quantile from bucket upper bounds (None if empty)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float('inf')
+
+# LiveStats pushes at most one snapshot per this many seconds between state changes
+LIVE_PUBLISH_INTERVAL = 1.0
+
+class LiveStats:
+    """Running figures for the current run, each kept up to date in O(1) per event.
+
+    The owner calls ``publish()`` after each state change (begin, pause,
+    resume, end); while actions come in, add_action() publishes at most once
+    per LIVE_PUBLISH_INTERVAL. ``on_publish(snapshot)`` runs outside the lock,
+    so snapshots from two threads can arrive out of order. A snapshot is
+    valid at its ``at`` time (clock.monotonic()): readers drop one older than
+    what they have, and extend the time of the current state from there
+    instead of asking again.
+    """
+    def __init__(self, clock=None, on_publish=None):
+        self.clock = clock or REAL_CLOCK
+        self.on_publish = on_publish
+        self.lock = threading.Lock()
+        self.state = "stopped"
+        self.started = None
+        self.ended = None
+        self.paused_total = 0.0
+        self.paused_since = None
+        self.pause_reason = None
+        self.actions = {}
+        self.published_at = None
+
+    def begin(self):
+        with self.lock:
+            self.started = self.clock.monotonic()
+            self.ended = None
+            self.paused_total = 0.0
+            self.paused_since = None
+            self.actions = {}
+            self.state = "running"
+
+    def add_action(self, behavior, amount=1):
+        with self.lock:
+            self.actions[behavior] = self.actions.get(behavior, 0) + amount
+            published_at = self.published_at
+            if published_at is not None and self.clock.monotonic() - published_at < LIVE_PUBLISH_INTERVAL:
+                return
+        self.publish()
+
+    def pause(self, reason=None):
+        with self.lock:
+            self.paused_since = self.clock.monotonic()
+            self.pause_reason = reason or "manual"
+            self.state = "paused"
+
+    def resume(self):
+        with self.lock:
+            self._end_pause()
+            self.state = "running"
+
+    def end(self):
+        with self.lock:
+            self._end_pause()
+            self.ended = self.clock.monotonic()
+            self.state = "stopped"
+
+    def _end_pause(self):
+        if self.paused_since is not None:
+            self.paused_total += self.clock.monotonic() - self.paused_since
+            self.paused_since = None
+
+    def snapshot(self):
+        with self.lock:
+            return self._snapshot()
+
+    def _snapshot(self):
+        now = self.clock.monotonic()
+        if self.started is None:
+            uptime = 0.0
+        else:
+            uptime = (self.ended if self.ended is not None else now) - self.started
+        paused = self.paused_total + (now - self.paused_since if self.paused_since is not None else 0.0)
+        active = max(0.0, uptime - paused)
+        return {
+            'at': now,
+            'state': self.state,
+            'uptime_seconds': uptime,
+            'active_seconds': active,
+            'paused_seconds': paused,
+            'actions': dict(self.actions),
+            'last_pause_reason': self.pause_reason,
+        }
+
+    def publish(self):
+        with self.lock:
+            self.published_at = self.clock.monotonic()
+            snapshot = self._snapshot()
+        if self.on_publish:
+            self.on_publish(snapshot)
+
+def actions_per_minute(snapshot, now=None):
+    """Per-behavior actions per active minute, with the snapshot's durations extended to ``now``"""
+    active = snapshot['active_seconds']
+    if now is not None and snapshot['state'] == "running":
+        active += now - snapshot['at']
+    minutes = max(active / 60, 1 / 60)
+    return {behavior: count / minutes for behavior, count in snapshot['actions'].items()}
+
+class EngineMetrics:
+    """Counters and histograms for one engine instance"""
+    def __init__(self, clock=None):
+        self.clock = clock or REAL_CLOCK
+        self.started_at = self.clock.time()
+        self.counters = {}
+        self.histograms = {}
+        self.start_requested_at = None
+        self.start_latency = None
+        self.live = LiveStats(self.clock)
+        self.lock = threading.Lock()
+
+    def inc(self, name, labels=(), amount=1):
+        key = (name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        key = (name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def count_action(self, behavior, action, amount=1):
+        self.inc('anoid_actions', (('behavior', behavior), ('action', action)), amount)
+        self.live.add_action(behavior, amount)
+
+    def observe_injection(self, primitive, seconds):
+        self.observe('anoid_injection_seconds', (('primitive', primitive),), seconds)
+
+    def observe_lateness(self, seconds):
+        self.observe('anoid_schedule_lateness_seconds', (), max(0.0, seconds))
+
+    def add_cpu_time(self, task, seconds):
+        self.inc('anoid_cpu_seconds', (('task', task),), seconds)
+
+    def cpu_seconds(self):
+        """Injection CPU time per engine task"""
+        return {dict(labels)['task']: value for (name, labels), value in list(self.counters.items())
+                if name == 'anoid_cpu_seconds'}
+
+    def mark_start(self, requested_at=None):
+        """Time the next injected action from ``requested_at`` (clock.monotonic(); default now)"""
+        self.start_requested_at = self.clock.monotonic() if requested_at is None else requested_at
+
+    def note_action_started(self):
+        """Called as each primitive begins; records start-to-first-action once per run"""
+        if self.start_requested_at is not None:
+            self.start_latency = self.clock.monotonic() - self.start_requested_at
+            self.start_requested_at = None
+            self.observe('anoid_start_to_first_action_seconds', (), self.start_latency)
+
+    def add_paused_time(self, seconds):
+        self.inc('anoid_paused_seconds', (), seconds)
+
+    def reset(self):
+        with self.lock:
+            self.started_at = self.clock.time()
+            self.counters = {}
+            self.histograms = {}
+        self.start_latency = None
+
+    def summary(self):
+        """Return a JSON-friendly snapshot with per-minute action rates"""
+        elapsed_min = max((self.clock.time() - self.started_at) / 60, 1e-9)
+        actions = {}
+        for (name, labels), value in list(self.counters.items()):
+            if name == 'anoid_actions':
+                action = dict(labels)['action']
+                actions[action] = actions.get(action, 0) + value
+        latency = {}
+        for (name, labels), histogram in list(self.histograms.items()):
+            if name == 'anoid_injection_seconds':
+                latency[dict(labels)['primitive']] = {
+                    'count': histogram.count,
+                    'mean_ms': histogram.sum / histogram.count * 1000 if histogram.count else 0.0,
+                    'p95_ms': (histogram.quantile(0.95) or 0.0) * 1000,
+                }
+        lateness = self.histograms.get(('anoid_schedule_lateness_seconds', ()))
+        return {
+            'uptime_seconds': self.clock.time() - self.started_at,
+            'actions': actions,
+            'actions_per_minute': {k: v / elapsed_min for k, v in actions.items()},
+            'paused_seconds': self.counters.get(('anoid_paused_seconds', ()), 0),
+            'lateness_p95_ms': (lateness.quantile(0.95) or 0.0) * 1000 if lateness else 0.0,
+            'injection_latency': latency,
+            'cpu_seconds': self.cpu_seconds(),
+            'start_to_first_action_ms': self.start_latency * 1000 if self.start_latency is not None else None,
+        }
+
+    def render_openmetrics(self):
+        """Render all metrics in the OpenMetrics text exposition format"""
+        lines = []
+        counters = {}
+        for (name, labels), value in list(self.counters.items()):
+            counters.setdefault(name, []).append((labels, value))
+        for name in sorted(counters):
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(counters[name]):
+                lines.append(f"{name}_total{_format_labels(labels)} {_format_value(value)}")
+        histograms = {}
+        for (name, labels), histogram in list(self.histograms.items()):
+            histograms.setdefault(name, []).append((labels, histogram))
+        for name in sorted(histograms):
+            lines.append(f"# TYPE {name} histogram")
+            lines.append(f"# UNIT {name} seconds")
+            for labels, histogram in sorted(histograms[name], key=lambda item: item[0]):
+                cumulative = 0
+                counts = list(histogram.counts)
+                for bound, n in zip(histogram.buckets, counts):
+                    cumulative += n
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', repr(bound)),))} {cumulative}")
+                cumulative += counts[-1]
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {cumulative}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+        lines.append("# TYPE anoid_start_time_seconds gauge")
+        lines.append(f"anoid_start_time_seconds {_format_value(self.started_at)}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Write the OpenMetrics text to path"""
+        with open(path, 'w') as f:
+            f.write(self.render_openmetrics())
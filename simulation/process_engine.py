@@ -0,0 +1,413 @@
+"""Run the simulation engine in a child process.
+
+In-process, the engine shares one interpreter (and GIL) with the Tk loop,
+the input listeners, the keyboard hook and the tray. With
+``"engine": {"isolate": true}`` SimulationControls uses ProcessEngine
+instead. Commands go to the child over a pipe. The child publishes its
+state and counters once a second in a small shared-memory block, which the
+UI reads without a round-trip. Log records come back over a queue.
+
+If the child dies, or its event loop stops beating for ``hang_timeout``
+seconds, it is killed and reported as stopped; the window and tray keep
+running and the next start spawns a fresh child.
+"""
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+from logic import log_config
+from simulation.engine import SimulationEngine
+from simulation.governor import FACTORS
+from simulation.metrics import EngineMetrics
+
+STATES = ('stopped', 'running', 'paused')
+LEVELS = tuple(FACTORS)
+
+MAGIC = b"ANSH"
+VERSION = 1
+# Seqlock counter, odd while the child is writing the payload
+SEQ = struct.Struct('<I')
+# magic, version, pid, state, governor level, heartbeat (monotonic), actions, errors, rounds, budget stretch
+PAYLOAD = struct.Struct('<4sHIBBdQQQd')
+FIELDS = ('magic', 'version', 'pid', 'state', 'level', 'heartbeat', 'actions', 'errors', 'rounds', 'stretch')
+
+# How often the child publishes status and the parent checks on it
+PUBLISH_INTERVAL = 1.0
+MONITOR_INTERVAL = 0.5
+
+class SharedStatus:
+    """Status block in shared memory: one writer (the child), any number of readers.
+
+    close() may run while another thread reads: it marks the block closed
+    under ``lock`` before releasing the memory, and read() returns None once
+    the block is closed.
+    """
+    def __init__(self, name=None):
+        self.lock = threading.Lock()
+        self.closed = False
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=SEQ.size + PAYLOAD.size)
+            self.shm.buf[:SEQ.size + PAYLOAD.size] = bytes(SEQ.size + PAYLOAD.size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.seq = 0
+
+    def write(self, pid, state, level, heartbeat, actions, errors, rounds, stretch):
+        buf = self.shm.buf
+        self.seq += 1
+        SEQ.pack_into(buf, 0, self.seq)
+        PAYLOAD.pack_into(buf, SEQ.size, MAGIC, VERSION, pid, STATES.index(state), LEVELS.index(level),
+                          heartbeat, int(actions), int(errors), int(rounds), stretch)
+        self.seq += 1
+        SEQ.pack_into(buf, 0, self.seq)
+
+    def read(self):
+        """Consistent snapshot as a dict, or None before the child's first write or after close()"""
+        with self.lock:
+            if self.closed:
+                return None
+            return self._read(self.shm.buf)
+
+    @staticmethod
+    def _read(buf):
+        for _ in range(100):
+            before = SEQ.unpack_from(buf, 0)[0]
+            if before & 1:
+                time.sleep(0)
+                continue
+            values = PAYLOAD.unpack_from(buf, SEQ.size)
+            if SEQ.unpack_from(buf, 0)[0] == before:
+                break
+        else:
+            return None
+        snapshot = dict(zip(FIELDS, values))
+        if snapshot['magic'] != MAGIC:
+            return None
+        snapshot['state'] = STATES[snapshot['state']]
+        snapshot['level'] = LEVELS[snapshot['level']]
+        return snapshot
+
+    def close(self):
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+def _child_main(conn, log_queue, status_name, config_file, config):
+    """Child process entry point: serve commands until the parent says exit or goes away"""
+    from simulation.headless import HeadlessHost
+    logger = log_config.get_logger()
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    host = HeadlessHost(config_file, logger)
+    host.config = config
+    log_config.apply_config(config)  # filter in the child, before records cross the queue
+    # The log queue also carries the engine's live stats to the parent
+    engine = SimulationEngine(host, logger=logger, on_stats=lambda snapshot: log_queue.put(('stats', snapshot)))
+    status = SharedStatus(status_name)
+    beat = {'at': time.monotonic()}
+    stopping = threading.Event()
+    write_lock = threading.Lock()
+
+    def touch():
+        beat['at'] = time.monotonic()
+
+    def write_status():
+        totals = {}
+        for (name, _), value in list(engine.metrics.counters.items()):
+            totals[name] = totals.get(name, 0) + value
+        state = "paused" if engine.paused else "running" if engine.running else "stopped"
+        with write_lock:
+            status.write(os.getpid(), state, engine.governor.level, beat['at'], totals.get('anoid_actions', 0),
+                         totals.get('anoid_errors', 0), totals.get('anoid_rounds', 0), engine.budget.stretch)
+
+    def publish():
+        # The heartbeat only advances when the engine loop runs our callback, so a hung loop shows up
+        while not stopping.wait(PUBLISH_INTERVAL):
+            loop = engine.loop
+            if loop is not None and engine.running:
+                try:
+                    loop.call_soon_threadsafe(touch)
+                except RuntimeError:
+                    touch()
+            else:
+                touch()
+            write_status()
+
+    write_status()
+    publisher = threading.Thread(target=publish, name="status-publisher", daemon=True)
+    publisher.start()
+    commands = {
+        'start': engine.start,
+        'stop': engine.stop,
+        'pause': engine.pause,
+        'resume': engine.resume,
+        'status': engine.status,
+        'apply_config': engine.apply_config,
+        'display_changed': engine.display_changed,
+        'metrics_summary': engine.metrics.summary,
+        'metrics_openmetrics': engine.metrics.render_openmetrics,
+        'throttle_notes': engine.throttle_notes,
+    }
+    try:
+        while True:
+            try:
+                method, args = conn.recv()
+            except (EOFError, OSError):
+                break  # the parent is gone
+            if method == 'exit':
+                conn.send((True, None))
+                break
+            try:
+                result = commands[method](*args)
+            except Exception as e:
+                conn.send((False, f"{type(e).__name__}: {e}"))
+                continue
+            write_status()  # state changes are visible before the reply arrives
+            conn.send((True, result))
+    finally:
+        stopping.set()
+        engine.close()
+        status.close()
+        log_queue.put(None)
+
+class RemoteMetrics:
+    """EngineMetrics stand-in that asks the child process"""
+    def __init__(self, engine):
+        self.engine = engine
+
+    def summary(self):
+        return self.engine._call('metrics_summary') or EngineMetrics().summary()
+
+    def render_openmetrics(self):
+        return self.engine._call('metrics_openmetrics') or EngineMetrics().render_openmetrics()
+
+    def export(self, path):
+        """Write the OpenMetrics text to path"""
+        with open(path, 'w') as f:
+            f.write(self.render_openmetrics())
+
+class ProcessEngine:
+    """SimulationEngine interface backed by a child process.
+
+    ``host`` must expose ``config`` and ``config_file``. State properties read
+    the shared status block; commands are pipe round-trips.
+    """
+    def __init__(self, host, on_status=None, logger=None, hang_timeout=15.0, call_timeout=5.0, on_stats=None):
+        self.host = host
+        self.on_status = on_status
+        self.on_stats = on_stats
+        self.logger = logger or log_config.get_logger("engine")
+        self.hang_timeout = hang_timeout
+        self.call_timeout = call_timeout
+        self.metrics = RemoteMetrics(self)
+        self.process = None
+        self.conn = None
+        self.status_block = None
+        self.last_snapshot = None
+        self.log_queue = None
+        self.lock = threading.RLock()
+        self.state = "stopped"
+
+    @property
+    def thread(self):
+        return self.process
+
+    def alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def _snapshot(self):
+        """The child's status, or the last one read if the block is being discarded"""
+        # A local reference: _discard() may clear the attribute meanwhile. self.lock is
+        # not taken here, since _call() holds it across a pipe round-trip
+        block = self.status_block
+        if block is None or not self.alive():
+            return None
+        snapshot = block.read()
+        if snapshot is None:
+            return self.last_snapshot
+        self.last_snapshot = snapshot
+        return snapshot
+
+    @property
+    def running(self):
+        snapshot = self._snapshot()
+        return bool(snapshot) and snapshot['state'] != "stopped"
+
+    @property
+    def paused(self):
+        snapshot = self._snapshot()
+        return bool(snapshot) and snapshot['state'] == "paused"
+
+    def _set_status(self, status):
+        if status == self.state:
+            return
+        self.state = status
+        if self.on_status:
+            try:
+                self.on_status(status)
+            except Exception as e:
+                self.logger.error("Status callback failed: %s", e)
+
+    def _spawn(self):
+        ctx = multiprocessing.get_context('spawn')  # never fork a process that runs Tk and hooks
+        self.conn, child_conn = ctx.Pipe()
+        self.log_queue = ctx.Queue()
+        self.status_block = SharedStatus()
+        self.last_snapshot = None
+        self.process = ctx.Process(target=_child_main, name="engine", daemon=True,
+                                   args=(child_conn, self.log_queue, self.status_block.name,
+                                         self.host.config_file, self.host.config))
+        self.process.start()
+        child_conn.close()
+        threading.Thread(target=self._forward_logs, args=(self.log_queue,), name="engine-log", daemon=True).start()
+        threading.Thread(target=self._monitor, args=(self.process,), name="engine-monitor", daemon=True).start()
+        self.logger.info("Engine process started (pid %s).", self.process.pid)
+
+    def _forward_logs(self, log_queue):
+        while True:
+            try:
+                record = log_queue.get()
+            except (EOFError, OSError):
+                return
+            if record is None:
+                return
+            if isinstance(record, tuple):
+                if self.on_stats:
+                    try:
+                        self.on_stats(record[1])
+                    except Exception as e:
+                        self.logger.error("Stats callback failed: %s", e)
+                continue
+            self.logger.handle(record)
+
+    def _monitor(self, process):
+        """Report state changes, and reap a crashed or hung child"""
+        while process is self.process:
+            process.join(MONITOR_INTERVAL)
+            if process is not self.process:
+                return
+            if not process.is_alive():
+                self.logger.error("Engine process exited unexpectedly (code %s).", process.exitcode)
+                self._discard()
+                return
+            block = self.status_block
+            snapshot = block.read() if block is not None else None
+            if snapshot is None:
+                continue  # not written yet, or discarded meanwhile (the loop condition ends it)
+            if snapshot['state'] != "stopped" and time.monotonic() - snapshot['heartbeat'] > self.hang_timeout:
+                self.logger.error("Engine process unresponsive for %.0f s; killing it.", self.hang_timeout)
+                self._discard(kill=True)
+                return
+            self._set_status(snapshot['state'])
+
+    def _discard(self, kill=False):
+        """Forget the current child (killing it if asked); the next start spawns a new one"""
+        with self.lock:
+            process, self.process = self.process, None
+            if process is not None and kill:
+                process.kill()
+                process.join(2)
+            for resource in (self.conn, self.status_block):
+                if resource is not None:
+                    try:
+                        resource.close()
+                    except Exception:
+                        pass
+            self.conn = None
+            self.status_block = None
+        self._set_status("stopped")
+
+    def _call(self, method, *args, timeout=None):
+        """Run a command in the child and return its result (None if there is no child)"""
+        with self.lock:
+            if not self.alive():
+                return None
+            try:
+                self.conn.send((method, args))
+                if not self.conn.poll(timeout or self.call_timeout):
+                    raise TimeoutError(f"no reply to {method}")
+                ok, result = self.conn.recv()
+            except (EOFError, OSError, TimeoutError) as e:
+                self.logger.error("Engine process failed (%s); killing it.", e)
+                self._discard(kill=True)
+                return None
+        if not ok:
+            raise RuntimeError(result)
+        return result
+
+    def start(self, requested_at=None):
+        if not self.alive():
+            self._spawn()
+        # time.monotonic() is system-wide, so the child can time its first action from our request
+        started = self._call('start', time.monotonic() if requested_at is None else requested_at)
+        if started:
+            self._set_status("running")
+        return bool(started)
+
+    def stop(self, timeout=2):
+        stopped = self._call('stop', timeout, timeout=timeout + self.call_timeout)
+        self._set_status("stopped")
+        return bool(stopped)
+
+    def pause(self, reason=None):
+        paused = self._call('pause', reason)
+        if paused:
+            self._set_status("paused")
+        return bool(paused)
+
+    def resume(self):
+        resumed = self._call('resume')
+        if resumed:
+            self._set_status("running")
+        return bool(resumed)
+
+    def status(self):
+        status = self._call('status') or {'state': "stopped", 'running': False, 'paused': False}
+        status['process'] = {'pid': self.process.pid if self.alive() else None, 'shared': self._snapshot()}
+        return status
+
+    def apply_config(self, changes):
+        """Merge changes into the host config and forward them to the child"""
+        for section, values in changes.items():
+            self.host.config.setdefault(section, {}).update(values)
+        if 'logging' in changes:
+            log_config.apply_config(self.host.config)
+        return self._call('apply_config', changes) or []
+
+    def display_changed(self):
+        self._call('display_changed')
+
+    def throttle_notes(self):
+        snapshot = self._snapshot()
+        if not snapshot:
+            return []
+        notes = []
+        if snapshot['level'] != "normal":
+            notes.append(f"Throttled ({snapshot['level']})")
+        if snapshot['stretch'] > 1.0:
+            notes.append(f"Over budget: intervals x{snapshot['stretch']:.1f}")
+        return notes
+
+    def close(self):
+        """Stop the engine and shut the child process down"""
+        process = self.process
+        if process is None:
+            return
+        self._call('exit', timeout=3)
+        process.join(3)
+        self._discard(kill=process.is_alive())
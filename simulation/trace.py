@@ -0,0 +1,214 @@
+"""Compact binary action traces: record what the engine dispatched, replay it.
+
+File layout (little-endian):
+
+    header   b"ANTR", u16 version, u16 reserved, f64 wall-clock start time
+    records  28 bytes each: u8 op, u8 behavior, u16 arg, i32 a, i32 b,
+             f64 scheduled, f64 actual   (times are seconds since start)
+
+Text arguments (typed text, key names) are interned: the first use of a
+string emits an OP_STRING record (a = string id, b = byte length) followed
+by the UTF-8 bytes; later records refer to it by id in ``a``.
+
+    python -m simulation.trace dump trace.bin
+"""
+import struct
+import sys
+
+from simulation.clock import REAL_CLOCK
+
+MAGIC = b"ANTR"
+VERSION = 1
+HEADER = struct.Struct('<4sHHd')
+RECORD = struct.Struct('<BBHiidd')
+
+OP_STRING = 0
+OP_MOVE = 1
+OP_CLICK = 2
+OP_DOUBLE_CLICK = 3
+OP_RIGHT_CLICK = 4
+OP_SCROLL = 5
+OP_HSCROLL = 6
+OP_WRITE = 7
+OP_PRESS = 8
+OP_HOTKEY = 9
+
+OP_NAMES = {
+    OP_STRING: 'string', OP_MOVE: 'move_to', OP_CLICK: 'click', OP_DOUBLE_CLICK: 'double_click',
+    OP_RIGHT_CLICK: 'right_click', OP_SCROLL: 'scroll', OP_HSCROLL: 'hscroll', OP_WRITE: 'write',
+    OP_PRESS: 'press', OP_HOTKEY: 'hotkey',
+}
+
+BEHAVIORS = ['engine', 'mouse', 'keyboard', 'browser', 'replay']
+
+# Separates the keys of a hotkey chord inside one interned string
+KEY_SEPARATOR = "\x1f"
+
+class TraceRecorder:
+    """Backend wrapper that appends every dispatched action to a trace file.
+
+    ``scheduled`` is a callable returning the monotonic time the current
+    action was due; it defaults to the dispatch time.
+    """
+    def __init__(self, backend, path, scheduled=None, buffer_size=65536, clock=None):
+        self.backend = backend
+        self.clock = clock or REAL_CLOCK
+        self.path = path
+        self.scheduled = scheduled
+        self.behavior = "engine"
+        self.file = open(path, 'wb', buffering=buffer_size)
+        self.start = self.clock.monotonic()
+        self.strings = {}
+        self.records = 0
+        self.file.write(HEADER.pack(MAGIC, VERSION, 0, self.clock.time()))
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def _string_id(self, text):
+        string_id = self.strings.get(text)
+        if string_id is None:
+            string_id = self.strings[text] = len(self.strings)
+            data = text.encode('utf-8')
+            self.file.write(RECORD.pack(OP_STRING, 0, 0, string_id, len(data), 0.0, 0.0))
+            self.file.write(data)
+        return string_id
+
+    def _record(self, op, arg=0, a=0, b=0):
+        now = self.clock.monotonic()
+        scheduled = self.scheduled() if self.scheduled else now
+        behavior = BEHAVIORS.index(self.behavior) if self.behavior in BEHAVIORS else 0
+        self.file.write(RECORD.pack(op, behavior, arg & 0xFFFF, int(a), int(b),
+                                    scheduled - self.start, now - self.start))
+        self.records += 1
+
+    def size(self):
+        return self.backend.size()
+
+    def monitors(self):
+        return self.backend.monitors()
+
+    def position(self):
+        return self.backend.position()
+
+    def move_to(self, x, y, duration=0.0):
+        self._record(OP_MOVE, int(duration * 1000), x, y)
+        self.backend.move_to(x, y, duration=duration)
+
+    def click(self):
+        self._record(OP_CLICK)
+        self.backend.click()
+
+    def double_click(self):
+        self._record(OP_DOUBLE_CLICK)
+        self.backend.double_click()
+
+    def right_click(self):
+        self._record(OP_RIGHT_CLICK)
+        self.backend.right_click()
+
+    def scroll(self, amount):
+        self._record(OP_SCROLL, 0, amount)
+        self.backend.scroll(amount)
+
+    def hscroll(self, amount):
+        self._record(OP_HSCROLL, 0, amount)
+        self.backend.hscroll(amount)
+
+    def write(self, text, interval=0.0):
+        self._record(OP_WRITE, int(interval * 1000), self._string_id(text))
+        self.backend.write(text, interval=interval)
+
+    def press(self, key, presses=1):
+        self._record(OP_PRESS, presses, self._string_id(key))
+        self.backend.press(key, presses=presses)
+
+    def hotkey(self, *keys):
+        self._record(OP_HOTKEY, len(keys), self._string_id(KEY_SEPARATOR.join(keys)))
+        self.backend.hotkey(*keys)
+
+def read_trace(path):
+    """Yield (op, behavior, arg, a, b, scheduled, actual, text) for each action record"""
+    strings = {}
+    with open(path, 'rb') as f:
+        magic, version, _, _ = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} action trace")
+        while True:
+            chunk = f.read(RECORD.size)
+            if len(chunk) < RECORD.size:
+                break
+            op, behavior, arg, a, b, scheduled, actual = RECORD.unpack(chunk)
+            if op == OP_STRING:
+                strings[a] = f.read(b).decode('utf-8')
+                continue
+            text = strings.get(a) if op in (OP_WRITE, OP_PRESS, OP_HOTKEY) else None
+            yield op, BEHAVIORS[behavior], arg, a, b, scheduled, actual, text
+
+class TraceReplayer:
+    """Re-dispatch a recorded trace to a backend at the recorded times"""
+    def __init__(self, path, backend, clock=None):
+        self.path = path
+        self.backend = backend
+        self.clock = clock or REAL_CLOCK
+        self.running = False
+
+    def dispatch(self, op, arg, a, b, text):
+        backend = self.backend
+        if op == OP_MOVE:
+            backend.move_to(a, b, duration=arg / 1000)
+        elif op == OP_CLICK:
+            backend.click()
+        elif op == OP_DOUBLE_CLICK:
+            backend.double_click()
+        elif op == OP_RIGHT_CLICK:
+            backend.right_click()
+        elif op == OP_SCROLL:
+            backend.scroll(a)
+        elif op == OP_HSCROLL:
+            backend.hscroll(a)
+        elif op == OP_WRITE:
+            backend.write(text, interval=arg / 1000)
+        elif op == OP_PRESS:
+            backend.press(text, presses=arg)
+        elif op == OP_HOTKEY:
+            backend.hotkey(*text.split(KEY_SEPARATOR))
+
+    def run(self, speed=1.0, timed=True):
+        """Replay the whole trace; returns the number of actions dispatched.
+
+        With ``timed`` False actions are dispatched back to back, which is
+        what benchmarks want.
+        """
+        self.running = True
+        start = self.clock.monotonic()
+        count = 0
+        for op, _, arg, a, b, _, actual, text in read_trace(self.path):
+            if not self.running:
+                break
+            if timed:
+                delay = start + actual / speed - self.clock.monotonic()
+                if delay > 0:
+                    self.clock.sleep(delay)
+            self.dispatch(op, arg, a, b, text)
+            count += 1
+        self.running = False
+        return count
+
+    def stop(self):
+        self.running = False
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2 or argv[0] != 'dump':
+        print("usage: python -m simulation.trace dump TRACE", file=sys.stderr)
+        return 2
+    for op, behavior, arg, a, b, scheduled, actual, text in read_trace(argv[1]):
+        detail = repr(text) if text is not None else f"{a} {b}"
+        print(f"{actual:10.3f} late={max(0.0, actual - scheduled) * 1000:7.1f}ms "
+              f"{behavior:8s} {OP_NAMES[op]:12s} {detail} {arg}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""IdleDetector on a VirtualClock: run with ``python -m unittest discover tests``"""
+import unittest
+
+from logic.idle import FakeIdleSource, IdleDetector
+from logic.timers import TimerService
+from simulation.clock import VirtualClock
+
+class IdleDetectorTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.timers = TimerService(clock=self.clock)
+        self.source = FakeIdleSource(self.clock)
+        self.restarts = 0
+        self.detector = IdleDetector(self.source, threshold=60, timers=self.timers, hysteresis=5,
+                                     on_idle=self.restart, clock=self.clock)
+
+    def restart(self):
+        self.restarts += 1
+        self.detector.stop()  # as the UI does once the simulation runs again
+
+    def run_for(self, seconds, input_every=None):
+        """Advance the clock in 0.5 s steps, running due timer jobs; optionally note input periodically"""
+        end = self.clock.monotonic() + seconds
+        last_input = self.clock.monotonic()
+        while self.clock.monotonic() < end:
+            self.clock.advance(0.5)
+            if input_every is not None and self.clock.monotonic() - last_input >= input_every:
+                self.source.note_input()
+                last_input = self.clock.monotonic()
+            self.timers.run_due()
+
+    def test_idle_user_restarts_once(self):
+        self.detector.start()
+        self.run_for(59)
+        self.assertEqual(self.restarts, 0)
+        self.run_for(15)  # the wait may run up to a tenth late to share a wakeup
+        self.assertEqual(self.restarts, 1)
+        self.assertFalse(self.detector.running)
+        self.run_for(300)
+        self.assertEqual(self.restarts, 1)
+
+    def test_input_keeps_simulation_stopped(self):
+        self.detector.start()
+        self.run_for(600, input_every=30)
+        self.assertEqual(self.restarts, 0)
+        self.assertTrue(self.detector.running)
+        # Sleeping until the threshold could be reached, not polling every second
+        self.assertLess(self.detector.polls, 30)
+
+    def test_input_after_idle_needs_hysteresis(self):
+        self.detector.on_idle = None
+        self.detector.start()
+        self.run_for(75)
+        self.assertTrue(self.detector.idle)
+        self.source.note_input()
+        self.run_for(2)
+        self.assertTrue(self.detector.idle)  # one bumped mouse does not end the idle period
+        self.run_for(6, input_every=0.5)
+        self.assertFalse(self.detector.idle)
+
+if __name__ == '__main__':
+    unittest.main()
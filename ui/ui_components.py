@@ -1,8 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+from tkinter import font as tkfont
 import os
+import time
 from typing import Optional, Callable, Any
-from logic.resources import get_resource_usage
+from logic import log_config
+from logic.resources import ThreadSampler, UsageSampler
+from simulation.metrics import actions_per_minute
 
 class ModernTooltip:
     """Modern tooltip with better styling and positioning"""
@@ -148,6 +152,107 @@ class ModernCheckbox(tk.Frame):
         self.checkbox = ttk.Checkbutton(self, text=text, variable=variable, **kwargs)
         self.checkbox.pack(anchor='w', pady=2)
 
+class LogView(tk.Frame):
+    """Scrollable view of a LogIndex that only puts the visible lines in its Text widget.
+
+    ``rows`` are the line numbers shown: every line after ``first_line``, or
+    the matches of the current level/text filter. While following, the view
+    stays on the last row and picks up new lines on refresh().
+    """
+    def __init__(self, master, index, fg="#000000", bg="#FFFFFF", font=("Consolas", 11), **kwargs):
+        super().__init__(master, bg=bg, **kwargs)
+        self.index = index
+        self.font = tkfont.Font(font=font)
+        self.first_line = 0
+        self.min_level = 0
+        self.text_filter = ''
+        self.matches = None
+        self.top = 0
+        self.follow = True
+        self.refresh_job = None
+
+        self.text = tk.Text(self, height=20, wrap='none', state='disabled', bg=bg, fg=fg, font=self.font,
+                            relief=tk.FLAT, borderwidth=0, cursor='arrow')
+        self.scrollbar = ttk.Scrollbar(self, command=self.yview)
+        xscrollbar = ttk.Scrollbar(self, orient='horizontal', command=self.text.xview)
+        self.text['xscrollcommand'] = xscrollbar.set
+        self.scrollbar.pack(side=tk.RIGHT, fill='y')
+        xscrollbar.pack(side=tk.BOTTOM, fill='x')
+        self.text.pack(side=tk.LEFT, fill='both', expand=True)
+
+        self.text.bind('<Configure>', lambda e: self.render())
+        self.text.bind('<Map>', lambda e: self.refresh())
+        self.text.bind('<MouseWheel>', lambda e: self.yview('scroll', -1 if e.delta > 0 else 1, 'units'))
+        self.text.bind('<Button-4>', lambda e: self.yview('scroll', -1, 'units'))
+        self.text.bind('<Button-5>', lambda e: self.yview('scroll', 1, 'units'))
+        self.text.bind('<Prior>', lambda e: self.yview('scroll', -1, 'pages'))
+        self.text.bind('<Next>', lambda e: self.yview('scroll', 1, 'pages'))
+
+    def row_count(self):
+        return len(self.index) - self.first_line if self.matches is None else len(self.matches)
+
+    def visible_rows(self):
+        return max(1, self.text.winfo_height() // self.font.metrics('linespace'))
+
+    def refresh(self):
+        """Index what was appended to the file and show it; large files are indexed a chunk per call"""
+        if self.refresh_job is not None:
+            self.after_cancel(self.refresh_job)
+            self.refresh_job = None
+        indexed = len(self.index)
+        more = self.index.refresh()
+        if len(self.index) < indexed:
+            self.first_line = 0  # the file was cleared or rotated
+            self.matches = None if self.matches is None else self.index.select(self.min_level, self.text_filter)
+        elif self.matches is not None and len(self.index) > indexed:
+            self.matches.extend(self.index.select(self.min_level, self.text_filter, start=indexed))
+        if more:
+            self.refresh_job = self.after(1, self.refresh)
+        self.render()
+
+    def set_filter(self, min_level=0, text=''):
+        self.min_level, self.text_filter = min_level, text
+        if min_level or text:
+            self.matches = self.index.select(min_level, text, start=self.first_line)
+        else:
+            self.matches = None
+        self.follow = True
+        self.render()
+
+    def clear(self):
+        """Hide the lines logged so far (the file is left alone)"""
+        self.first_line = len(self.index)
+        self.set_filter(self.min_level, self.text_filter)
+
+    def yview(self, *args):
+        rows, visible = self.row_count(), self.visible_rows()
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * rows)
+        elif args[0] == 'scroll':
+            self.top += int(args[1]) * (visible if args[2] == 'pages' else 3)
+        self.top = max(0, min(self.top, rows - visible))
+        self.follow = self.top >= rows - visible
+        self.render()
+
+    def render(self):
+        rows, visible = self.row_count(), self.visible_rows()
+        if self.follow:
+            self.top = max(0, rows - visible)
+        self.top = max(0, min(self.top, rows - 1))
+        end = min(rows, self.top + visible)
+        if self.matches is None:
+            numbers = range(self.first_line + self.top, self.first_line + end)
+        else:
+            numbers = self.matches[self.top:end]
+        self.text.config(state='normal')
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', "\n".join(self.index.lines(numbers)))
+        self.text.config(state='disabled')
+        if rows:
+            self.scrollbar.set(self.top / rows, end / rows)
+        else:
+            self.scrollbar.set(0, 1)
+
 class UIComponents:
     def __init__(self, app):
         self.app = app
@@ -186,9 +291,14 @@ class UIComponents:
         self.hotkey_control_var = tk.BooleanVar(value=self.app.config.get('ui', {}).get('hotkey_control', True))
         self.notifications_enabled = tk.BooleanVar(value=self.app.config.get('ui', {}).get('notifications_enabled', False))
         self.minimize_on_start_var = tk.BooleanVar(value=self.app.config.get('ui', {}).get('minimize_on_start', True))
+        self.schedule_enabled = tk.BooleanVar(value=self.app.config.get('schedule', {}).get('enabled', False))
         # Add tray_enabled_var here so it's always available
         self.tray_enabled_var = tk.BooleanVar(value=getattr(self.app, 'tray_enabled', True))
         self.log_text = None
+        self.log_view = None
+        self.stats_label = None
+        self.live_stats = None
+        self.live_stats_job = None
         self.status_label = None
         
         self._tilde_down_time = 0
@@ -277,9 +387,7 @@ class UIComponents:
 
     def test_pause_settings(self):
         """Test pause settings without saving"""
-        if hasattr(self.app.simulation_controls, 'resume_timer') and self.app.simulation_controls.resume_timer:
-            self.app.root.after_cancel(self.app.simulation_controls.resume_timer)
-            self.app.simulation_controls.resume_timer = None
+        self.app.simulation_controls.cancel_resume()
         self.app.simulation_controls.pause_duration = self.pause_after_activity_var.get()
         self.app.notify_info("Test", f"Pause after activity set to {self.pause_after_activity_var.get()} seconds (not saved)")
 
@@ -297,9 +405,9 @@ class UIComponents:
         self.app.update_log_display()
 
     def clear_log(self):
-        """Clear all log messages"""
-        self.app.log_messages.clear()
-        self.app.update_log_display()
+        """Hide the messages logged so far"""
+        if self.log_view is not None:
+            self.log_view.clear()
 
     def show_config(self):
         """Show current configuration in a popup"""
@@ -327,6 +435,131 @@ class UIComponents:
         close_btn = ModernButton(top, "Close", top.destroy, "primary")
         close_btn.pack(pady=10)
 
+    def format_metrics_summary(self):
+        """Format the engine metrics summary for the Advanced tab"""
+        summary = self.app.simulation_controls.engine.metrics.summary()
+        if not summary['actions']:
+            return "No actions yet"
+        lines = [f"{action}: {count} ({summary['actions_per_minute'][action]:.1f}/min)"
+                 for action, count in sorted(summary['actions'].items())]
+        lines.append(f"Paused: {summary['paused_seconds']:.0f} s   Lateness p95: {summary['lateness_p95_ms']:.0f} ms")
+        if summary.get('start_to_first_action_ms') is not None:
+            lines.append(f"Start to first action: {summary['start_to_first_action_ms']:.0f} ms")
+        for primitive, latency in sorted(summary['injection_latency'].items()):
+            lines.append(f"{primitive}: mean {latency['mean_ms']:.1f} ms, p95 <= {latency['p95_ms']:.1f} ms")
+        return "\n".join(lines)
+
+    def show_live_stats(self, snapshot):
+        """Take a snapshot pushed by the engine (Tk thread); durations tick on from it locally"""
+        if self.live_stats is not None and snapshot['at'] < self.live_stats['at']:
+            return  # published on another thread before the one we already have
+        self.live_stats = snapshot
+        self.sync_live_stats_job()
+        self.render_live_stats()
+
+    def sync_live_stats_job(self, event=None):
+        """Tick the footer once a second only while the engine runs and the window is shown"""
+        if event is not None:
+            if event.widget is not self.app.root:
+                return  # <Map>/<Unmap> of a child, seen through the toplevel's bindtag
+            shown = event.type == tk.EventType.Map
+        else:
+            shown = self.stats_label is not None and self.stats_label.winfo_exists() and self.stats_label.winfo_viewable()
+        running = self.live_stats is not None and self.live_stats['state'] != "stopped"
+        if not (shown and running):
+            self.app.timers.cancel(self.live_stats_job)
+            self.live_stats_job = None
+        elif self.live_stats_job is None:
+            self.live_stats_job = self.app.timers.every(1.0, self.render_live_stats, tolerance=1.0, tk=True)
+        if event is not None and shown:
+            self.render_live_stats()  # catch up on what changed while hidden
+
+    def render_live_stats(self):
+        if self.stats_label is None or not self.stats_label.winfo_exists() or not self.stats_label.winfo_viewable():
+            return
+        if self.live_stats is not None:
+            self.stats_label.config(text=self.format_live_stats(self.live_stats, time.monotonic()))
+
+    @staticmethod
+    def _format_duration(seconds):
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+    def format_live_stats(self, snapshot, now):
+        """One footer line from a LiveStats snapshot, its running durations extended to ``now``"""
+        state = snapshot['state']
+        elapsed = now - snapshot['at'] if state != "stopped" else 0.0
+        active = snapshot['active_seconds'] + (elapsed if state == "running" else 0.0)
+        paused = snapshot['paused_seconds'] + (elapsed if state == "paused" else 0.0)
+        parts = [f"{'Last run' if state == 'stopped' else 'Up'} {self._format_duration(snapshot['uptime_seconds'] + elapsed)}",
+                 f"active {self._format_duration(active)}", f"paused {self._format_duration(paused)}"]
+        rates = actions_per_minute(snapshot, now if state == "running" else None)
+        parts += [f"{behavior} {rate:.0f}/min" for behavior, rate in sorted(rates.items())]
+        if snapshot['last_pause_reason']:
+            parts.append(f"last pause: {snapshot['last_pause_reason']}")
+        return " · ".join(parts)
+
+    def format_thread_usage(self, rows, process_wakeups=None):
+        """Format ThreadSampler rows (and the process-wide wakeups/s) for the Advanced tab"""
+        if not rows:
+            return "Per-thread usage needs /proc (Linux) or psutil"
+        lines = []
+        for row in rows:
+            wakeups = f"{row['wakeups_per_sec']:7.1f}/s" if row['wakeups_per_sec'] is not None else "    n/a  "
+            lines.append(f"{row['name'][:20]:20s} {row['cpu_percent']:5.1f}%  {row['cpu_seconds']:8.1f} s  {wakeups}")
+        timers = self.app.timers.status()
+        total = f"{process_wakeups:.1f} wakeups/s" if process_wakeups is not None else "wakeups n/a"
+        if all(row['wakeups_per_sec'] is None for row in rows):
+            total += " (per-thread wakeups need Linux /proc)"
+        lines.append(f"Process: {total}; timer thread {timers['wakeups_per_sec']:.1f}/s for {timers['jobs']} jobs")
+        return "\n".join(lines)
+
+    def export_metrics(self):
+        """Export engine metrics as an OpenMetrics text file"""
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".prom",
+            initialfile="anoid_metrics.prom",
+            filetypes=[("OpenMetrics text", "*.prom *.txt"), ("All files", "*.*")]
+        )
+        if file_path:
+            try:
+                self.app.simulation_controls.engine.metrics.export(file_path)
+                self.app.notify_info("Success", f"Metrics exported to {file_path}")
+            except Exception as e:
+                self.app.notify_error("Error", f"Failed to export metrics: {e}")
+
+    def start_profiling(self):
+        """Start a bounded sampling profile of all threads"""
+        try:
+            duration = self.profile_duration_var.get()
+        except tk.TclError:
+            duration = 30
+        self.app.profiler.start(duration=duration)
+        self.update_profile_status()
+
+    def stop_profiling(self):
+        """Stop the running profile early and write the result"""
+        self.app.profiler.stop()
+        self.update_profile_status()
+
+    def update_profile_status(self):
+        """Refresh the profiler label; polls only while a profile is running"""
+        status = self.app.profiler.status()
+        if status['running']:
+            text = f"Profiling... {status['elapsed_seconds']:.0f}/{status['duration_seconds']:.0f} s, {status['samples']} samples"
+            self.profile_status_label.after(1000, self.update_profile_status)
+        elif status['last_output']:
+            text = f"Saved: {status['last_output']}.collapsed / .pstats"
+        else:
+            text = "Profiler idle"
+        self.profile_status_label.config(text=text)
+
+    def update_schedule_status(self):
+        """Show the schedule's next transition"""
+        if getattr(self, 'schedule_status_label', None):
+            self.schedule_status_label.config(text=self.app.schedule_runner.describe())
+
     def save_config_as(self):
         """Save configuration to a file"""
         from tkinter import filedialog
@@ -793,21 +1026,20 @@ class UIComponents:
         # --- End Uninstall Button ---
 
         # Simplified tray hotkey logic: ~ once hides, ~ twice quickly restores
-        import keyboard
         import time
-        self._tilde_press_times = []
-        def tilde_press_handler(e):
-            now = time.time()
-            self._tilde_press_times = [t for t in self._tilde_press_times if now - t < 1]
-            self._tilde_press_times.append(now)
-            if len(self._tilde_press_times) == 1:
+        self._tilde_pressed_at = None
+        def tilde_press_handler():
+            now = time.monotonic()
+            if self._tilde_pressed_at is None or now - self._tilde_pressed_at >= 1:
+                self._tilde_pressed_at = now
                 # Hide tray icon
                 self.tray_enabled_var.set(False)
                 self.app.tray_enabled = False
                 if hasattr(self.app, 'system_tray'):
                     self.app.system_tray.tray_enabled = False
                     self.app.system_tray.hide_tray_icon()
-            elif len(self._tilde_press_times) == 2:
+            else:
+                self._tilde_pressed_at = None
                 # Restore tray icon
                 self.tray_enabled_var.set(True)
                 self.app.tray_enabled = True
@@ -815,8 +1047,7 @@ class UIComponents:
                     self.app.system_tray.tray_enabled = True
                     if not getattr(self.app.system_tray, 'icon', None):
                         self.app.system_tray.setup_system_tray()
-                self._tilde_press_times = []
-        keyboard.on_press_key('`', tilde_press_handler, suppress=False)
+        self.app.hotkeys.bind('`', tilde_press_handler, any_modifiers=True)
         
         # Reset to Defaults section
         reset_frame = tk.Frame(content_frame, bg=self.get_color('card_bg'), relief=tk.FLAT, bd=1)
@@ -854,15 +1085,77 @@ class UIComponents:
                 fg=fg, bg=bg).pack(anchor='w', pady=(0, 15))
         resource_label = tk.Label(resource_frame, text="Loading...", font=("Segoe UI", 12), fg=fg, bg=bg, justify='left')
         resource_label.pack(anchor='w', pady=(0, 10))
+        tk.Label(resource_frame, text="Per thread (CPU now, CPU total, wakeups)", font=("Segoe UI", 10, "bold"),
+                 fg=fg, bg=bg).pack(anchor='w', pady=(10, 5))
+        threads_label = tk.Label(resource_frame, text="", font=("Consolas", 10), fg=fg, bg=bg, justify='left')
+        threads_label.pack(anchor='w', pady=(0, 10))
+        thread_sampler = ThreadSampler()
+        usage_sampler = UsageSampler()  # its own CPU interval, not the tray tooltip's
         def update_resource_label():
-            usage = get_resource_usage()
-            text = f"CPU: {usage['cpu_percent']:.1f}%\nRAM: {usage['ram_mb']:.1f} MB"
-            if usage['gpu_percent'] is not None:
-                text += f"\nGPU: {usage['gpu_percent']:.1f}%"
+            if not resource_label.winfo_viewable():
+                return  # window hidden or another tab selected
+            try:
+                usage = usage_sampler.sample()
+            except Exception:
+                text = "CPU/RAM usage needs psutil"
+            else:
+                text = f"CPU: {usage['cpu_percent']:.1f}%\nRAM: {usage['ram_mb']:.1f} MB"
+                if usage['gpu_percent'] is not None:
+                    text += f"\nGPU: {usage['gpu_percent']:.1f}%"
             resource_label.config(text=text)
-            resource_label.after(2000, update_resource_label)
+            threads_label.config(text=self.format_thread_usage(thread_sampler.sample(),
+                                                               thread_sampler.process_wakeups_per_sec))
+        # Both labels refresh on one coalesced timer wakeup
+        self.app.timers.every(2.0, update_resource_label, tolerance=1.0, tk=True)
         update_resource_label()
 
+        # Engine metrics section
+        metrics_frame = tk.Frame(content_frame, bg=self.get_color('card_bg'), relief=tk.FLAT, bd=1)
+        metrics_frame.pack(fill='x', pady=25, ipady=20, ipadx=20)
+        fg, bg = self.get_fg_bg()
+        tk.Label(metrics_frame, text="Engine Metrics", 
+                font=("Segoe UI", 16, "bold"),
+                fg=fg, bg=bg).pack(anchor='w', pady=(0, 15))
+        metrics_label = tk.Label(metrics_frame, text="No actions yet", font=("Consolas", 10), fg=fg, bg=bg, justify='left')
+        metrics_label.pack(anchor='w', pady=(0, 10))
+        def update_metrics_label():
+            if metrics_label.winfo_viewable():
+                metrics_label.config(text=self.format_metrics_summary())
+        self.app.timers.every(2.0, update_metrics_label, tolerance=1.0, tk=True)
+        update_metrics_label()
+        ModernButton(metrics_frame, "Export OpenMetrics...", self.export_metrics, "primary").pack(anchor='w', pady=10)
+
+        # Profiling section
+        profiling_frame = tk.Frame(content_frame, bg=self.get_color('card_bg'), relief=tk.FLAT, bd=1)
+        profiling_frame.pack(fill='x', pady=25, ipady=20, ipadx=20)
+        fg, bg = self.get_fg_bg()
+        tk.Label(profiling_frame, text="Profiling", 
+                font=("Segoe UI", 16, "bold"),
+                fg=fg, bg=bg).pack(anchor='w', pady=(0, 15))
+        self.profile_duration_var = tk.IntVar(value=30)
+        ModernEntry(profiling_frame, "Profile Window (seconds)", self.profile_duration_var, width=12, fg=fg, bg=bg).pack(anchor='w', pady=10)
+        self.profile_status_label = tk.Label(profiling_frame, text="Profiler idle", font=("Segoe UI", 10), fg=fg, bg=bg, justify='left')
+        self.profile_status_label.pack(anchor='w', pady=(0, 10))
+        profile_btn_frame = tk.Frame(profiling_frame, bg=self.get_color('card_bg'))
+        profile_btn_frame.pack(fill='x', pady=10)
+        ModernButton(profile_btn_frame, "Start Profiling", self.start_profiling, "warning").pack(side=tk.LEFT, padx=(0, 15))
+        ModernButton(profile_btn_frame, "Stop", self.stop_profiling, "danger").pack(side=tk.LEFT)
+
+        # Schedule section
+        schedule_frame = tk.Frame(content_frame, bg=self.get_color('card_bg'), relief=tk.FLAT, bd=1)
+        schedule_frame.pack(fill='x', pady=25, ipady=20, ipadx=20)
+        tk.Label(schedule_frame, text="Schedule", 
+                font=("Segoe UI", 16, "bold"),
+                fg=fg, bg=bg).pack(anchor='w', pady=(0, 15))
+        ModernCheckbox(schedule_frame, "Run only inside activity windows", self.schedule_enabled).pack(anchor='w', pady=5)
+        windows = self.app.config.get('schedule', {}).get('windows', [])
+        windows_text = "\n".join(f"{w.get('days', 'daily')}  {w.get('start', '00:00')}-{w.get('end', '24:00')}" for w in windows)
+        tk.Label(schedule_frame, text=windows_text or "No windows configured (edit 'schedule' in anoid.json)",
+                font=("Segoe UI", 10), fg=fg, bg=bg, justify='left').pack(anchor='w', pady=(5, 10))
+        self.schedule_status_label = tk.Label(schedule_frame, text=self.app.schedule_runner.describe(),
+                                              font=("Segoe UI", 10, "bold"), fg=fg, bg=bg, justify='left')
+        self.schedule_status_label.pack(anchor='w')
+
         # Pack canvas and scrollbar
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -923,26 +1216,40 @@ class UIComponents:
         ModernButton(header_frame, "Refresh", self.refresh_log, "primary").pack(side=tk.RIGHT, padx=(15, 0))
         ModernButton(header_frame, "Clear", self.clear_log, "danger").pack(side=tk.RIGHT)
         
-        # Log text area with improved styling
+        # Level and text filters over the whole log file
+        filter_frame = tk.Frame(content_frame, bg=bg)
+        filter_frame.pack(fill='x')
+        tk.Label(filter_frame, text="Level", font=("Segoe UI", 10), fg=fg, bg=bg).pack(side=tk.LEFT, padx=(0, 8))
+        self.log_level_var = tk.StringVar(value="ALL")
+        level_box = ttk.Combobox(filter_frame, textvariable=self.log_level_var, state='readonly', width=10,
+                                 values=["ALL", "DEBUG", "INFO", "WARNING", "ERROR"])
+        level_box.pack(side=tk.LEFT, padx=(0, 25))
+        level_box.bind('<<ComboboxSelected>>', lambda e: self.apply_log_filter())
+        tk.Label(filter_frame, text="Search", font=("Segoe UI", 10), fg=fg, bg=bg).pack(side=tk.LEFT, padx=(0, 8))
+        self.log_search_var = tk.StringVar()
+        search_entry = tk.Entry(filter_frame, textvariable=self.log_search_var, width=30,
+                                font=("Segoe UI", 10), relief=tk.FLAT, bg=bg, fg=fg,
+                                insertbackground="#3182CE", highlightthickness=1,
+                                highlightcolor="#3182CE", highlightbackground="#E2E8F0")
+        search_entry.pack(side=tk.LEFT)
+        search_entry.bind('<Return>', lambda e: self.apply_log_filter())
+        
+        # Log view: only the visible lines of config/anoid.log are rendered
         log_container = tk.Frame(content_frame, bg=self.get_color('card_bg'), relief=tk.FLAT, bd=1)
         log_container.pack(fill='both', expand=True, pady=15)
         
-        fg, bg = self.get_fg_bg()
-        self.log_text = tk.Text(
-            log_container, height=20, state='normal', wrap='word',
-            bg=bg, fg=fg,
-            insertbackground=self.get_color('primary'),
-            font=("Consolas", 11), relief=tk.FLAT, borderwidth=0
-        )
-        
-        log_scrollbar = ttk.Scrollbar(log_container, command=self.log_text.yview)
-        self.log_text['yscrollcommand'] = log_scrollbar.set
-        
-        self.log_text.pack(side=tk.LEFT, fill='both', expand=True, padx=15, pady=15)
-        log_scrollbar.pack(side=tk.RIGHT, fill='y', pady=15)
+        self.log_view = LogView(log_container, self.app.log_index, fg=fg, bg=bg)
+        self.log_view.pack(fill='both', expand=True, padx=15, pady=15)
+        self.log_text = self.log_view.text
         
         self.app.update_log_display()
 
+    def apply_log_filter(self):
+        """Show only lines at or above the chosen level that contain the search text"""
+        level = self.log_level_var.get()
+        self.log_view.set_filter(0 if level == "ALL" else log_config.parse_level(level),
+                                 self.log_search_var.get().strip())
+
     def create_footer(self, parent):
         """Create the footer section"""
         footer_frame = tk.Frame(parent, bg=self.get_color('card_bg'), relief=tk.FLAT, bd=0)
@@ -970,12 +1277,16 @@ class UIComponents:
         ModernTooltip(apply_btn, "Apply all pending settings changes")
         # --- End Apply Button ---
         
-        # Quick stats with better typography
+        # Quick stats with better typography; live while the simulation runs
         fg, bg = self.get_fg_bg()
-        stats_label = tk.Label(
+        self.stats_label = tk.Label(
             footer_content, text="Ready", 
             font=("Segoe UI", 11),
             fg=fg, bg=bg
         )
-        stats_label.pack(side=tk.RIGHT)
+        self.stats_label.pack(side=tk.RIGHT)
+        # Hidden in the tray or minimized, the footer does not tick
+        self.app.root.bind('<Map>', self.sync_live_stats_job, add='+')
+        self.app.root.bind('<Unmap>', self.sync_live_stats_job, add='+')
+        self.render_live_stats()
 